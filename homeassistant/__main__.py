@@ -84,6 +84,11 @@ def get_arguments() -> argparse.Namespace:
         action="store_true",
         help="Skips pip install of required packages on startup",
     )
+    parser.add_argument(
+        "--preimport-integrations",
+        action="store_true",
+        help="Import integrations with installed requirements ahead of their setup",
+    )
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="Enable verbose logging to file."
     )
@@ -304,6 +309,7 @@ def main() -> int:
         log_file=args.log_file,
         log_no_color=args.log_no_color,
         skip_pip=args.skip_pip,
+        preimport_integrations=args.preimport_integrations,
         safe_mode=args.safe_mode,
         debug=args.debug,
         open_ui=args.open_ui,
@@ -2,6 +2,7 @@
 import asyncio
 import contextlib
 from datetime import datetime
+import importlib
 import logging
 import logging.handlers
 import os
@@ -26,7 +27,11 @@ from homeassistant.setup import (
 )
 from homeassistant.util.async_ import gather_with_concurrency
 from homeassistant.util.logging import async_activate_log_queue_handler
-from homeassistant.util.package import async_get_user_site, is_virtual_env
+from homeassistant.util.package import (
+    async_get_user_site,
+    is_installed,
+    is_virtual_env,
+)
 from homeassistant.util.yaml import clear_secret_cache
 
 if TYPE_CHECKING:
@@ -40,6 +45,7 @@ ERROR_LOG_FILENAME = "home-assistant.log"
 DATA_LOGGING = "logging"
 
 LOG_SLOW_STARTUP_INTERVAL = 60
+LOG_SLOWEST_IMPORTS = 10
 
 STAGE_1_TIMEOUT = 120
 STAGE_2_TIMEOUT = 300
@@ -89,6 +95,7 @@ async def async_setup_hass(
     )
 
     hass.config.skip_pip = runtime_config.skip_pip
+    hass.config.preimport_integrations = runtime_config.preimport_integrations
     if runtime_config.skip_pip:
         _LOGGER.warning(
             "Skipping pip installation of required modules. This may cause issues"
@@ -106,6 +113,7 @@ async def async_setup_hass(
 
     if not safe_mode:
         await hass.async_add_executor_job(conf_util.process_ha_config_upgrade, hass)
+        hass.data[conf_util.DATA_YAML_CACHE] = True
 
         try:
             config_dict = await conf_util.async_hass_config_yaml(hass)
@@ -198,6 +206,8 @@ async def async_from_config_dict(
     """
     start = monotonic()
 
+    await loader.async_load_manifest_cache(hass)
+
     hass.config_entries = config_entries.ConfigEntries(hass, config)
     await hass.config_entries.async_initialize()
 
@@ -423,6 +433,99 @@ async def async_setup_multi_components(
         )
 
 
+def _import_integration(integration: loader.Integration) -> bool:
+    """Import an integration if its requirements are installed.
+
+    Integrations with missing requirements are left to their setup, which
+    installs the requirements before importing them.
+    """
+    missing = [req for req in integration.requirements if not is_installed(req)]
+    if missing:
+        _LOGGER.info(
+            "Not importing %s ahead of setup, requirements not installed: %s",
+            integration.domain,
+            ", ".join(missing),
+        )
+        return False
+
+    try:
+        integration.get_component()
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.warning(
+            "Unable to import %s ahead of setup: %s", integration.domain, err
+        )
+        # Don't let the failed attempt hide modules added before setup retries
+        importlib.invalidate_caches()
+        return False
+    return True
+
+
+async def _async_import_integrations(
+    hass: core.HomeAssistant, integrations: Dict[str, loader.Integration]
+) -> None:
+    """Import integrations in the executor, dependencies first.
+
+    Integrations whose dependencies are imported are imported in parallel,
+    so the event loop doesn't block on importing them during setup.
+    Integrations that depend on one that wasn't imported are left to setup.
+    """
+    to_import = dict(integrations)
+    skipped: Set[str] = set()
+    while to_import:
+        ready = [
+            itg
+            for itg in to_import.values()
+            if not any(dep in to_import for dep in itg.dependencies)
+        ]
+        # Import the rest at once if the dependencies are circular
+        if not ready:
+            ready = list(to_import.values())
+
+        for itg in ready:
+            to_import.pop(itg.domain)
+
+        importable = []
+        for itg in ready:
+            if skipped.isdisjoint(itg.dependencies):
+                importable.append(itg)
+                continue
+            _LOGGER.info(
+                "Not importing %s ahead of setup, its dependencies were not imported",
+                itg.domain,
+            )
+            skipped.add(itg.domain)
+
+        imported = await gather_with_concurrency(
+            MAX_LOAD_CONCURRENTLY,
+            *(
+                hass.async_add_executor_job(_import_integration, itg)
+                for itg in importable
+            ),
+        )
+        skipped.update(
+            itg.domain for itg, success in zip(importable, imported) if not success
+        )
+
+
+@core.callback
+def _async_log_import_times(hass: core.HomeAssistant) -> None:
+    """Log the total import time and the integrations that took longest."""
+    import_times: Dict[str, float] = hass.data.get(loader.DATA_IMPORT_TIMES, {})
+    if not import_times:
+        return
+
+    slowest = sorted(import_times.items(), key=lambda item: item[1], reverse=True)
+    _LOGGER.info(
+        "Imported %s integrations in %.2fs, slowest: %s",
+        len(import_times),
+        sum(import_times.values()),
+        ", ".join(
+            f"{domain} ({import_time:.2f}s)"
+            for domain, import_time in slowest[:LOG_SLOWEST_IMPORTS]
+        ),
+    )
+
+
 async def _async_set_up_integrations(
     hass: core.HomeAssistant, config: Dict[str, Any]
 ) -> None:
@@ -430,6 +533,17 @@ async def _async_set_up_integrations(
     setup_started = hass.data[DATA_SETUP_STARTED] = {}
     domains_to_setup = _get_domains(hass, config)
 
+    # Look up the integrations that the manifest cache expects at once,
+    # the rounds below then only need to go to disk for what changed
+    await gather_with_concurrency(
+        loader.MAX_LOAD_CONCURRENTLY,
+        *(
+            loader.async_get_integration(hass, domain)
+            for domain in loader.cached_dependency_closure(hass, domains_to_setup)
+        ),
+        return_exceptions=True,
+    )
+
     # Resolve all dependencies so we know all integrations
     # that will have to be loaded and start rightaway
     integration_cache: Dict[str, loader.Integration] = {}
@@ -471,6 +585,13 @@ async def _async_set_up_integrations(
 
     _LOGGER.info("Domains to be set up: %s", domains_to_setup)
 
+    # Import the integrations in the executor while the first ones set up
+    import_task = None
+    if hass.config.preimport_integrations:
+        import_task = asyncio.create_task(
+            _async_import_integrations(hass, integration_cache)
+        )
+
     logging_domains = domains_to_setup & LOGGING_INTEGRATIONS
 
     # Load logging as soon as possible
@@ -543,6 +664,10 @@ async def _async_set_up_integrations(
         except asyncio.TimeoutError:
             _LOGGER.warning("Setup timed out for stage 2 - moving forward")
 
+    if import_task is not None:
+        await import_task
+    _async_log_import_times(hass)
+
     # Wrap up startup
     _LOGGER.debug("Waiting for startup to wrap up")
     try:
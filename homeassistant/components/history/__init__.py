@@ -1,24 +1,30 @@
 """Provide pre-made queries on top of the recorder component."""
 from collections import defaultdict
 from datetime import datetime as dt, timedelta
+from fnmatch import fnmatchcase
 from itertools import groupby
 import json
 import logging
 import time
-from typing import Iterable, Optional, cast
+from typing import Iterable, Optional
 
 from aiohttp import web
-from sqlalchemy import and_, bindparam, func, not_, or_
+from sqlalchemy import and_, bindparam, case, func, not_, or_
 from sqlalchemy.ext import baked
 import voluptuous as vol
 
 from homeassistant.components import recorder
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
+    StateAttributes,
     States,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
+from homeassistant.components.recorder.statistics import (
+    PERIODS,
+    statistics_during_period,
+)
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.const import (
     CONF_DOMAINS,
@@ -43,6 +49,9 @@ _LOGGER = logging.getLogger(__name__)
 DOMAIN = "history"
 CONF_ORDER = "use_include_order"
 
+# Number of states read from the database at a time when streaming
+STATES_YIELD_PER = 1000
+
 STATE_KEY = "state"
 LAST_CHANGED_KEY = "last_changed"
 
@@ -80,6 +89,7 @@ QUERY_STATES = [
     States.entity_id,
     States.state,
     States.attributes,
+    StateAttributes.shared_attrs,
     States.last_changed,
     States.last_updated,
 ]
@@ -87,6 +97,13 @@ QUERY_STATES = [
 HISTORY_BAKERY = "history_bakery"
 
 
+def _query_states(session):
+    """Query the states with their shared attributes."""
+    return session.query(*QUERY_STATES).outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
+
+
 def get_significant_states(hass, *args, **kwargs):
     """Wrap _get_significant_states with a sql session."""
     with session_scope(hass=hass) as session:
@@ -103,6 +120,7 @@ def _get_significant_states(
     include_start_time_state=True,
     significant_changes_only=True,
     minimal_response=False,
+    max_points=None,
 ):
     """
     Return states changes during UTC period start_time - end_time.
@@ -110,13 +128,95 @@ def _get_significant_states(
     Significant states are all states where there is a state change,
     as well as all states from certain domains (for instance
     thermostat so that we get current temperature in our graphs).
+
+    With max_points the states of each entity are downsampled to
+    about max_points states.
     """
     timer_start = time.perf_counter()
 
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
+    states = execute(
+        _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+        )
+    )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return _sorted_states_to_json(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
+        max_points,
+        end_time,
+    )
+
+
+def _iter_significant_states(
+    hass,
+    session,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+    minimal_response=False,
+    max_points=None,
+):
+    """Yield the significant states of each entity during the period.
+
+    Like _get_significant_states, but the states are read from the
+    database while they are yielded instead of all at once.
+    """
+    query = _significant_states_query(
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        significant_changes_only,
+    ).with_post_criteria(lambda q: q.yield_per(STATES_YIELD_PER))
+
+    yield from _iter_sorted_states(
+        hass,
+        session,
+        query,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
+        max_points,
+        end_time,
     )
 
+
+def _significant_states_query(
+    hass,
+    session,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    significant_changes_only,
+):
+    """Return the query of the significant states during the period."""
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
+
     if significant_changes_only:
         baked_query += lambda q: q.filter(
             (
@@ -140,36 +240,37 @@ def _get_significant_states(
     if end_time is not None:
         baked_query += lambda q: q.filter(States.last_updated < bindparam("end_time"))
 
-    baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
-
-    states = execute(
-        baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
+    order_params = {}
+    if entity_ids is not None:
+        # The entities are sorted in the requested order, so their states can
+        # be streamed in that order. The query is baked per number of entities.
+        order_params = {
+            f"order_{idx}": entity_id for idx, entity_id in enumerate(entity_ids)
+        }
+        baked_query.add_criteria(
+            lambda q: q.order_by(
+                case(
+                    [
+                        (States.entity_id == bindparam(param), idx)
+                        for idx, param in enumerate(order_params)
+                    ]
+                ),
+                States.last_updated,
+            ),
+            len(entity_ids),
         )
-    )
-
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
+    else:
+        baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
 
-    return _sorted_states_to_json(
-        hass,
-        session,
-        states,
-        start_time,
-        entity_ids,
-        filters,
-        include_start_time_state,
-        minimal_response,
+    return baked_query(session).params(
+        start_time=start_time, end_time=end_time, entity_ids=entity_ids, **order_params
     )
 
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
 
         baked_query += lambda q: q.filter(
             (States.last_changed == States.last_updated)
@@ -182,7 +283,9 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
             )
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
@@ -203,13 +306,13 @@ def get_last_state_changes(hass, number_of_states, entity_id):
     start_time = dt_util.utcnow()
 
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
         baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(
@@ -270,7 +373,7 @@ def _get_states_with_session(
     # We have more than one entity to look at (most commonly we want
     # all entities,) so we need to do a search on all states since the
     # last recorder run started.
-    query = session.query(*QUERY_STATES)
+    query = _query_states(session)
 
     most_recent_states_by_date = session.query(
         States.entity_id.label("max_entity_id"),
@@ -318,9 +421,7 @@ def _get_states_with_session(
 def _get_single_entity_states_with_session(hass, session, utc_point_in_time, entity_id):
     # Use an entirely different (and extremely fast) query if we only
     # have a single entity id
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
-    )
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
     baked_query += lambda q: q.filter(
         States.last_updated < bindparam("utc_point_in_time"),
         States.entity_id == bindparam("entity_id"),
@@ -344,6 +445,8 @@ def _sorted_states_to_json(
     filters=None,
     include_start_time_state=True,
     minimal_response=False,
+    max_points=None,
+    end_time=None,
 ):
     """Convert SQL results into JSON friendly data structure.
 
@@ -362,7 +465,47 @@ def _sorted_states_to_json(
         for ent_id in entity_ids:
             result[ent_id] = []
 
+    for ent_id, ent_results in _iter_sorted_states(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
+        max_points,
+        end_time,
+    ):
+        result[ent_id] = ent_results
+
+    # Filter out the empty lists if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
+
+
+def _iter_sorted_states(
+    hass,
+    session,
+    states,
+    start_time,
+    entity_ids,
+    filters=None,
+    include_start_time_state=True,
+    minimal_response=False,
+    max_points=None,
+    end_time=None,
+):
+    """Yield the entity_id and JSON friendly list of states of each entity.
+
+    The states of an entity are yielded as soon as all of them have been
+    read. With entity_ids the entities that only have a state at the start
+    time are yielded in their turn, otherwise they come last.
+
+    States must be sorted by entity_id, or in the order of entity_ids, and
+    by last_updated.
+    """
     # Get the states at the start time
+    start_time_states = {}
     timer_start = time.perf_counter()
     if include_start_time_state:
         run = recorder.run_information_from_instance(hass, start_time)
@@ -371,20 +514,47 @@ def _sorted_states_to_json(
         ):
             state.last_changed = start_time
             state.last_updated = start_time
-            result[state.entity_id].append(state)
+            start_time_states[state.entity_id] = state
 
     if _LOGGER.isEnabledFor(logging.DEBUG):
         elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("getting %d first datapoints took %fs", len(result), elapsed)
+        _LOGGER.debug(
+            "getting %d first datapoints took %fs", len(start_time_states), elapsed
+        )
 
     # Called in a tight loop so cache the function
     # here
     _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
 
+    downsample_end = end_time or dt_util.utcnow()
+
+    requested_ids = iter(dict.fromkeys(entity_ids or ()))
+
     # Append all changes to it
     for ent_id, group in groupby(states, lambda state: state.entity_id):
+        # The requested entities before this one without changes
+        for requested_id in requested_ids:
+            if requested_id == ent_id:
+                break
+            if requested_id in start_time_states:
+                yield requested_id, [start_time_states.pop(requested_id)]
+
+        start_time_state = start_time_states.pop(ent_id, None)
+        if max_points:
+            # The state at the start time counts as one of the points,
+            # unless it is the only point left
+            points = max_points if start_time_state is None else max_points - 1
+            if not points:
+                start_time_state = None
+            group = iter(
+                _downsample_states(
+                    group, start_time, downsample_end, points or max_points
+                )
+            )
         domain = split_entity_id(ent_id)[0]
-        ent_results = result[ent_id]
+        ent_results = []
+        if start_time_state is not None:
+            ent_results.append(start_time_state)
         if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
             ent_results.extend(LazyState(db_state) for db_state in group)
 
@@ -420,8 +590,56 @@ def _sorted_states_to_json(
             # a full state
             ent_results[-1] = LazyState(prev_state)
 
-    # Filter out the empty lists if some states had 0 results.
-    return {key: val for key, val in result.items() if val}
+        yield ent_id, ent_results
+
+    # Entities without changes during the period
+    for ent_id in requested_ids:
+        if ent_id in start_time_states:
+            yield ent_id, [start_time_states.pop(ent_id)]
+    for ent_id, state in start_time_states.items():
+        yield ent_id, [state]
+
+
+def _downsample_states(states, start_time, end_time, max_points):
+    """Reduce the states of an entity to at most max_points states.
+
+    The period is split into buckets of equal duration. Of each bucket only
+    the states with the lowest and highest value and the last state are
+    kept, so peaks survive while the number of states scales with the
+    width of the graph instead of with the number of recorded states.
+    With less than 3 points only the last states are kept.
+
+    States must be sorted by last_updated.
+    """
+    states = list(states)
+    if len(states) <= max_points:
+        return states
+
+    buckets = max_points // 3
+    start = start_time.timestamp()
+    bucket_duration = (end_time.timestamp() - start) / max(1, buckets)
+    if not buckets or bucket_duration <= 0:
+        return states[-max_points:]
+
+    def bucket_index(db_state):
+        last_updated = process_timestamp(db_state.last_updated).timestamp()
+        return min(int((last_updated - start) // bucket_duration), buckets - 1)
+
+    result = []
+    for _, bucket in groupby(states, bucket_index):
+        bucket = list(bucket)
+        keep = {len(bucket) - 1}
+        values = []
+        for idx, db_state in enumerate(bucket):
+            try:
+                values.append((float(db_state.state), idx))
+            except ValueError:
+                continue
+        if values:
+            keep.add(min(values)[1])
+            keep.add(max(values)[1])
+        result.extend(bucket[idx] for idx in sorted(keep))
+    return result
 
 
 def get_state(hass, utc_point_in_time, entity_id, run=None):
@@ -462,7 +680,7 @@ class HistoryPeriodView(HomeAssistantView):
 
     async def get(
         self, request: web.Request, datetime: Optional[str] = None
-    ) -> web.Response:
+    ) -> web.StreamResponse:
         """Return history over a period of time."""
         datetime_ = None
         if datetime:
@@ -502,8 +720,47 @@ class HistoryPeriodView(HomeAssistantView):
 
         minimal_response = "minimal_response" in request.query
 
+        max_points = None
+        max_points_str = request.query.get("max_points")
+        if max_points_str:
+            try:
+                max_points = int(max_points_str)
+            except ValueError:
+                max_points = 0
+            if max_points < 1:
+                return self.json_message("Invalid max_points", HTTP_BAD_REQUEST)
+
         hass = request.app["hass"]
 
+        # Long-term statistics instead of states, for graphs of long ranges
+        aggregate = request.query.get("aggregate")
+        if aggregate is not None:
+            if aggregate not in PERIODS:
+                return self.json_message("Invalid aggregate", HTTP_BAD_REQUEST)
+            statistics = await hass.async_add_executor_job(
+                statistics_during_period,
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                aggregate,
+            )
+            if self.filters:
+                statistics = {
+                    entity_id: rows
+                    for entity_id, rows in statistics.items()
+                    if self.filters.matches(entity_id)
+                }
+                if self.use_include_order:
+                    sorted_statistics = [
+                        statistics.pop(entity_id)
+                        for entity_id in self.filters.included_entities
+                        if entity_id in statistics
+                    ]
+                    sorted_statistics.extend(statistics.values())
+                    return self.json(sorted_statistics)
+            return self.json(list(statistics.values()))
+
         if (
             not include_start_time_state
             and entity_ids
@@ -511,10 +768,9 @@ class HistoryPeriodView(HomeAssistantView):
         ):
             return self.json([])
 
-        return cast(
-            web.Response,
-            await hass.async_add_executor_job(
-                self._sorted_significant_states_json,
+        return await self.json_stream(
+            request,
+            lambda: self._sorted_significant_states(
                 hass,
                 start_time,
                 end_time,
@@ -522,10 +778,11 @@ class HistoryPeriodView(HomeAssistantView):
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
+                max_points,
             ),
         )
 
-    def _sorted_significant_states_json(
+    def _sorted_significant_states(
         self,
         hass,
         start_time,
@@ -534,12 +791,14 @@ class HistoryPeriodView(HomeAssistantView):
         include_start_time_state,
         significant_changes_only,
         minimal_response,
+        max_points,
     ):
-        """Fetch significant stats from the database as json."""
+        """Fetch significant states from the database, one entity at a time."""
         timer_start = time.perf_counter()
+        state_count = 0
 
         with session_scope(hass=hass) as session:
-            result = _get_significant_states(
+            entity_states = _iter_significant_states(
                 hass,
                 session,
                 start_time,
@@ -549,27 +808,33 @@ class HistoryPeriodView(HomeAssistantView):
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
+                max_points,
             )
+            # Entities that are asked for are returned in that order
+            result = (state_list for _, state_list in entity_states)
+
+            # Optionally reorder the result to respect the ordering given
+            # by any entities explicitly included in the configuration.
+            # This needs all the states before the first can be returned.
+            if self.filters and self.use_include_order:
+                result = list(result)
+                sorted_result = []
+                for order_entity in self.filters.included_entities:
+                    for state_list in result:
+                        if state_list[0].entity_id == order_entity:
+                            sorted_result.append(state_list)
+                            result.remove(state_list)
+                            break
+                sorted_result.extend(result)
+                result = sorted_result
+
+            for state_list in result:
+                state_count += len(state_list)
+                yield state_list
 
-        result = list(result.values())
         if _LOGGER.isEnabledFor(logging.DEBUG):
             elapsed = time.perf_counter() - timer_start
-            _LOGGER.debug("Extracted %d states in %fs", sum(map(len, result)), elapsed)
-
-        # Optionally reorder the result to respect the ordering given
-        # by any entities explicitly included in the configuration.
-        if self.filters and self.use_include_order:
-            sorted_result = []
-            for order_entity in self.filters.included_entities:
-                for state_list in result:
-                    if state_list[0].entity_id == order_entity:
-                        sorted_result.append(state_list)
-                        result.remove(state_list)
-                        break
-            sorted_result.extend(result)
-            result = sorted_result
-
-        return self.json(result)
+            _LOGGER.debug("Extracted %d states in %fs", state_count, elapsed)
 
 
 def sqlalchemy_filter_from_include_exclude_conf(conf):
@@ -609,6 +874,32 @@ class Filters:
 
         return query.filter(self.entity_filter())
 
+    def matches(self, entity_id):
+        """Return if an entity passes the filter, the same way as in the database."""
+        domain = split_entity_id(entity_id)[0]
+
+        def _matches(entities, domains, globs):
+            return (
+                entity_id in entities
+                or domain in domains
+                or any(fnmatchcase(entity_id, glob) for glob in globs)
+            )
+
+        if (
+            self.included_entities
+            or self.included_domains
+            or self.included_entity_globs
+        ) and not _matches(
+            self.included_entities,
+            self.included_domains,
+            self.included_entity_globs,
+        ):
+            return False
+
+        return not _matches(
+            self.excluded_entities, self.excluded_domains, self.excluded_entity_globs
+        )
+
     @property
     def has_config(self):
         """Determine if there is any filter configuration."""
@@ -710,7 +1001,9 @@ class LazyState(State):
         """State attributes."""
         if not self._attributes:
             try:
-                self._attributes = json.loads(self._row.attributes)
+                self._attributes = json.loads(
+                    self._row.shared_attrs or self._row.attributes
+                )
             except ValueError:
                 # When json.loads fails
                 _LOGGER.exception("Error converting row to state: %s", self)
@@ -1,7 +1,9 @@
 """Component to make instant statistics about your history."""
+from collections import deque
 import datetime
 import logging
 import math
+from typing import Deque, Optional, Tuple
 
 import voluptuous as vol
 
@@ -16,7 +18,7 @@ from homeassistant.const import (
     PERCENTAGE,
     TIME_HOURS,
 )
-from homeassistant.core import CoreState, callback
+from homeassistant.core import CoreState, Event, callback
 from homeassistant.exceptions import TemplateError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity
@@ -121,6 +123,9 @@ class HistoryStatsSensor(Entity):
         self._period = (datetime.datetime.now(), datetime.datetime.now())
         self.value = None
         self.count = None
+        self._history: Optional[HistoryStatsData] = None
+        # Changes of the entity seen since the last update
+        self._new_changes: Deque[Tuple[float, bool]] = deque()
 
     async def async_added_to_hass(self):
         """Create listeners when the entity is added."""
@@ -128,16 +133,10 @@ class HistoryStatsSensor(Entity):
         @callback
         def start_refresh(*args):
             """Register state tracking."""
-
-            @callback
-            def force_refresh(*args):
-                """Force the component to refresh."""
-                self.async_schedule_update_ha_state(True)
-
-            force_refresh()
+            self.async_schedule_update_ha_state(True)
             self.async_on_remove(
                 async_track_state_change_event(
-                    self.hass, [self._entity_id], force_refresh
+                    self.hass, [self._entity_id], self._async_state_changed
                 )
             )
 
@@ -148,6 +147,19 @@ class HistoryStatsSensor(Entity):
         # Delay first refresh to keep startup fast
         self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START, start_refresh)
 
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Remember the change of the entity and refresh."""
+        new_state = event.data.get("new_state")
+        if new_state is not None:
+            self._new_changes.append(
+                (
+                    new_state.last_changed.timestamp(),
+                    new_state.state in self._entity_states,
+                )
+            )
+        self.async_schedule_update_ha_state(True)
+
     @property
     def name(self):
         """Return the name of the sensor."""
@@ -210,47 +222,31 @@ class HistoryStatsSensor(Entity):
         p_end_timestamp = math.floor(dt_util.as_timestamp(p_end))
         now_timestamp = math.floor(dt_util.as_timestamp(now))
 
-        # If period has not changed and current time after the period end...
+        # If period has not changed, current time after the period end and
+        # the entity didn't change...
         if (
             start_timestamp == p_start_timestamp
             and end_timestamp == p_end_timestamp
             and end_timestamp <= now_timestamp
+            and not self._new_changes
         ):
             # Don't compute anything as the value cannot have changed
             return
 
-        # Get history between start and end
-        history_list = history.state_changes_during_period(
-            self.hass, start, end, str(self._entity_id)
-        )
-
-        if self._entity_id not in history_list:
-            return
-
-        # Get the first state
-        last_state = history.get_state(self.hass, start, self._entity_id)
-        last_state = last_state is not None and last_state in self._entity_states
-        last_time = start_timestamp
-        elapsed = 0
-        count = 0
-
-        # Make calculations
-        for item in history_list.get(self._entity_id):
-            current_state = item.state in self._entity_states
-            current_time = item.last_changed.timestamp()
+        # The history is only read from the database when the period is
+        # first known or moved back, later changes are seen as they happen.
+        if self._history is None or start_timestamp < self._history.start:
+            self._history = self._load_history(start, start_timestamp)
 
-            if last_state:
-                elapsed += current_time - last_time
-            if current_state and not last_state:
-                count += 1
+        data = self._history
+        while self._new_changes:
+            data.add(*self._new_changes.popleft())
+        data.trim(start_timestamp)
 
-            last_state = current_state
-            last_time = current_time
+        if not data.has_data:
+            return
 
-        # Count time elapsed between last history state and end of measure
-        if last_state:
-            measure_end = min(end_timestamp, now_timestamp)
-            elapsed += measure_end - last_time
+        elapsed, count = data.measure(min(end_timestamp, now_timestamp))
 
         # Save value in hours
         self.value = elapsed / 3600
@@ -258,6 +254,22 @@ class HistoryStatsSensor(Entity):
         # Save counter
         self.count = count
 
+    def _load_history(self, start, start_timestamp):
+        """Read the changes of the entity since start from the database."""
+        first_state = history.get_state(self.hass, start, self._entity_id)
+        data = HistoryStatsData(
+            start_timestamp,
+            None if first_state is None else first_state.state in self._entity_states,
+        )
+
+        history_list = history.state_changes_during_period(
+            self.hass, start, entity_id=str(self._entity_id)
+        )
+        for item in history_list.get(self._entity_id, []):
+            data.add(item.last_changed.timestamp(), item.state in self._entity_states)
+
+        return data
+
     def update_period(self):
         """Parse the templates and store a datetime tuple in _period."""
         start = None
@@ -319,6 +331,89 @@ class HistoryStatsSensor(Entity):
         self._period = start, end
 
 
+class HistoryStatsData:
+    """Changes of the entity being in one of the measured states.
+
+    Only the changes since the start of the period are kept, with running
+    totals of the time spent in the states and of how often they were
+    entered. Changes before the start are trimmed as the period slides.
+    """
+
+    def __init__(self, start: float, initial: Optional[bool]) -> None:
+        """Initialize the data with the state at the start, None if unknown."""
+        self.start = start
+        self.has_data = initial is not None
+        self._initial = bool(initial)
+        self._changes: Deque[Tuple[float, bool]] = deque()
+        # Totals between start and the last change
+        self._elapsed = 0.0
+        self._count = 0
+
+    def add(self, timestamp: float, in_states: bool) -> None:
+        """Add a change, older ones and ones keeping the states are ignored."""
+        last_time, current = (
+            self._changes[-1] if self._changes else (self.start, self._initial)
+        )
+        if timestamp < last_time:
+            return
+        self.has_data = True
+        if in_states == current:
+            return
+
+        if current:
+            self._elapsed += max(0, timestamp - last_time)
+        else:
+            self._count += 1
+        self._changes.append((timestamp, in_states))
+
+    def trim(self, start: float) -> None:
+        """Move the start of the period forward, dropping older changes."""
+        if start <= self.start:
+            return
+
+        last_time, current = self.start, self._initial
+        while self._changes and self._changes[0][0] <= start:
+            timestamp, in_states = self._changes.popleft()
+            if current:
+                self._elapsed -= max(0, timestamp - last_time)
+            else:
+                self._count -= 1
+            last_time, current = timestamp, in_states
+
+        if not self._changes:
+            self._elapsed = 0.0
+            self._count = 0
+        elif current:
+            self._elapsed -= max(0, start - last_time)
+
+        self.start = start
+        self._initial = current
+
+    def measure(self, end: float) -> Tuple[float, int]:
+        """Return the seconds spent in the states and how often they were entered."""
+        if not self._changes or self._changes[-1][0] <= end:
+            elapsed, count = self._elapsed, self._count
+            last_time, current = (
+                self._changes[-1] if self._changes else (self.start, self._initial)
+            )
+        else:
+            # The period ends before the last change, sum the changes until end
+            elapsed, count = 0.0, 0
+            last_time, current = self.start, self._initial
+            for timestamp, in_states in self._changes:
+                if timestamp > end:
+                    break
+                if current:
+                    elapsed += max(0, timestamp - last_time)
+                else:
+                    count += 1
+                last_time, current = timestamp, in_states
+
+        if current:
+            elapsed += max(0, end - last_time)
+        return elapsed, count
+
+
 class HistoryStatsHelper:
     """Static methods to make the HistoryStatsSensor code lighter."""
 
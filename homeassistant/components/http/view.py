@@ -2,7 +2,8 @@
 import asyncio
 import json
 import logging
-from typing import Any, Callable, List, Optional
+import threading
+from typing import Any, Callable, Iterable, List, Optional
 
 from aiohttp import web
 from aiohttp.typedefs import LooseHeaders
@@ -11,6 +12,7 @@ from aiohttp.web_exceptions import (
     HTTPInternalServerError,
     HTTPUnauthorized,
 )
+import async_timeout
 import voluptuous as vol
 
 from homeassistant import exceptions
@@ -22,6 +24,13 @@ from .const import KEY_AUTHENTICATED, KEY_HASS
 
 _LOGGER = logging.getLogger(__name__)
 
+# Size in characters of the chunks a JSON stream is written in
+JSON_STREAM_CHUNK_SIZE = 64 * 1024
+# Number of encoded chunks that may wait to be written
+JSON_STREAM_MAX_PENDING_CHUNKS = 4
+# Seconds a client may take to receive a chunk of a JSON stream
+JSON_STREAM_WRITE_TIMEOUT = 30
+
 
 class HomeAssistantView:
     """Base view for all views."""
@@ -62,6 +71,103 @@ class HomeAssistantView:
         response.enable_compression()
         return response
 
+    @staticmethod
+    async def json_stream(
+        request: web.Request,
+        items: Callable[[], Iterable[Any]],
+        status_code: int = HTTP_OK,
+        headers: Optional[LooseHeaders] = None,
+    ) -> web.StreamResponse:
+        """Return a JSON list response, streaming the items as they are generated.
+
+        The items are generated and encoded in the executor, so they can
+        come from a database cursor. Only a few chunks of encoded items are
+        held in memory at any time. A client that doesn't receive a chunk
+        within JSON_STREAM_WRITE_TIMEOUT is disconnected, so a slow client
+        doesn't hold the executor and the source of the items for long.
+        """
+        hass = request.app[KEY_HASS]
+        chunks: asyncio.Queue = asyncio.Queue()
+        room = threading.Semaphore(JSON_STREAM_MAX_PENDING_CHUNKS)
+        stopped = threading.Event()
+
+        def put(chunk: List[str]) -> bool:
+            """Hand a chunk to the event loop, waiting for room."""
+            room.acquire()
+            if stopped.is_set():
+                return False
+            hass.loop.call_soon_threadsafe(
+                chunks.put_nowait, ",".join(chunk).encode("UTF-8")
+            )
+            return True
+
+        def produce() -> None:
+            """Encode the items in chunks."""
+            error = None
+            try:
+                chunk: List[str] = []
+                size = 0
+                for item in items():
+                    encoded = json.dumps(item, cls=JSONEncoder, allow_nan=False)
+                    chunk.append(encoded)
+                    size += len(encoded)
+                    if size >= JSON_STREAM_CHUNK_SIZE:
+                        if not put(chunk):
+                            return
+                        chunk = []
+                        size = 0
+                if chunk:
+                    put(chunk)
+            except Exception as err:  # pylint: disable=broad-except
+                error = err
+            # The result of the stream, None when all items were encoded
+            hass.loop.call_soon_threadsafe(chunks.put_nowait, error)
+
+        producer = hass.async_add_executor_job(produce)
+        response = web.StreamResponse(status=status_code, headers=headers)
+        response.content_type = CONTENT_TYPE_JSON
+        response.enable_compression()
+        response.enable_chunked_encoding()
+
+        try:
+            chunk = await chunks.get()
+            if isinstance(chunk, Exception):
+                _LOGGER.error("Unable to serialize to JSON: %s", chunk)
+                raise HTTPInternalServerError from chunk
+
+            await response.prepare(request)
+            try:
+                async with async_timeout.timeout(JSON_STREAM_WRITE_TIMEOUT):
+                    await response.write(b"[")
+                separator = b""
+                while isinstance(chunk, bytes):
+                    room.release()
+                    async with async_timeout.timeout(JSON_STREAM_WRITE_TIMEOUT):
+                        await response.write(separator + chunk)
+                    separator = b","
+                    chunk = await chunks.get()
+            except asyncio.TimeoutError:
+                _LOGGER.warning(
+                    "Timed out writing a JSON response to %s", request.remote
+                )
+                response.force_close()
+                return response
+
+            if chunk is not None:
+                # The status has been sent, close the connection
+                # so the client notices the response is incomplete
+                _LOGGER.error("Unable to serialize to JSON: %s", chunk)
+                response.force_close()
+                return response
+
+            await response.write(b"]")
+            await response.write_eof()
+            return response
+        finally:
+            stopped.set()
+            room.release()
+            await producer
+
     def json_message(
         self,
         message: str,
@@ -13,7 +13,10 @@ from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.history import sqlalchemy_filter_from_include_exclude_conf
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
+    EventData,
     Events,
+    EventTypes,
+    StateAttributes,
     States,
     process_timestamp_to_utc_isoformat,
 )
@@ -89,7 +92,9 @@ ALL_EVENT_TYPES = [
 
 EVENT_COLUMNS = [
     Events.event_type,
+    EventTypes.event_type.label("shared_event_type"),
     Events.event_data,
+    EventData.shared_data,
     Events.time_fired,
     Events.context_id,
     Events.context_user_id,
@@ -234,21 +239,18 @@ class LogbookView(HomeAssistantView):
 
         entity_matches_only = "entity_matches_only" in request.query
 
-        def json_events():
-            """Fetch events and generate JSON."""
-            return self.json(
-                _get_events(
-                    hass,
-                    start_day,
-                    end_day,
-                    entity_ids,
-                    self.filters,
-                    self.entities_filter,
-                    entity_matches_only,
-                )
-            )
-
-        return await hass.async_add_executor_job(json_events)
+        return await self.json_stream(
+            request,
+            lambda: _iter_events(
+                hass,
+                start_day,
+                end_day,
+                entity_ids,
+                self.filters,
+                self.entities_filter,
+                entity_matches_only,
+            ),
+        )
 
 
 def humanify(hass, events, entity_attr_cache, context_lookup):
@@ -417,6 +419,29 @@ def _get_events(
     entity_matches_only=False,
 ):
     """Get events for a period of time."""
+    return list(
+        _iter_events(
+            hass,
+            start_day,
+            end_day,
+            entity_ids,
+            filters,
+            entities_filter,
+            entity_matches_only,
+        )
+    )
+
+
+def _iter_events(
+    hass,
+    start_day,
+    end_day,
+    entity_ids=None,
+    filters=None,
+    entities_filter=None,
+    entity_matches_only=False,
+):
+    """Yield the events of a period of time while reading them."""
 
     entity_attr_cache = EntityAttributeCache(hass)
     context_lookup = {None: None}
@@ -438,6 +463,9 @@ def _get_events(
 
     with session_scope(hass=hass) as session:
         old_state = aliased(States, name="old_state")
+        not_state_changed = Events.event_type_id.notin_(
+            _event_type_ids(session, [EVENT_STATE_CHANGED])
+        )
 
         if entity_ids is not None:
             query = _generate_events_query_without_states(session)
@@ -459,20 +487,15 @@ def _get_events(
             query = _generate_events_query(session)
             query = _apply_event_time_filter(query, start_day, end_day)
             query = _apply_events_types_and_states_filter(
-                hass, query, old_state
-            ).filter(
-                (States.last_updated == States.last_changed)
-                | (Events.event_type != EVENT_STATE_CHANGED)
-            )
+                hass, query, old_state, not_state_changed
+            ).filter((States.last_updated == States.last_changed) | not_state_changed)
             if filters:
-                query = query.filter(
-                    filters.entity_filter() | (Events.event_type != EVENT_STATE_CHANGED)
-                )
+                query = query.filter(filters.entity_filter() | not_state_changed)
 
         query = query.order_by(Events.time_fired)
 
-        return list(
-            humanify(hass, yield_events(query), entity_attr_cache, context_lookup)
+        yield from humanify(
+            hass, yield_events(query), entity_attr_cache, context_lookup
         )
 
 
@@ -483,23 +506,38 @@ def _generate_events_query(session):
         States.entity_id,
         States.domain,
         States.attributes,
+        StateAttributes.shared_attrs,
     )
 
 
 def _generate_events_query_without_states(session):
-    return session.query(
-        *EVENT_COLUMNS,
-        literal(None).label("state"),
-        literal(None).label("entity_id"),
-        literal(None).label("domain"),
-        literal(None).label("attributes"),
+    return _outerjoin_shared_event_rows(
+        session.query(
+            *EVENT_COLUMNS,
+            literal(None).label("state"),
+            literal(None).label("entity_id"),
+            literal(None).label("domain"),
+            literal(None).label("attributes"),
+            literal(None).label("shared_attrs"),
+        )
     )
 
 
+def _outerjoin_shared_event_rows(query):
+    return query.outerjoin(
+        EventTypes, (Events.event_type_id == EventTypes.event_type_id)
+    ).outerjoin(EventData, (Events.data_id == EventData.data_id))
+
+
 def _generate_states_query(session, start_day, end_day, old_state, entity_ids):
+    query = _generate_events_query(session).outerjoin(
+        Events, (States.event_id == Events.event_id)
+    )
     return (
-        _generate_events_query(session)
-        .outerjoin(Events, (States.event_id == Events.event_id))
+        _outerjoin_shared_event_rows(query)
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
         .filter(_missing_state_matcher(old_state))
         .filter(_continuous_entity_matcher())
@@ -511,17 +549,16 @@ def _generate_states_query(session, start_day, end_day, old_state, entity_ids):
     )
 
 
-def _apply_events_types_and_states_filter(hass, query, old_state):
+def _apply_events_types_and_states_filter(hass, query, old_state, not_state_changed):
     events_query = (
-        query.outerjoin(States, (Events.event_id == States.event_id))
-        .outerjoin(old_state, (States.old_state_id == old_state.state_id))
-        .filter(
-            (Events.event_type != EVENT_STATE_CHANGED)
-            | _missing_state_matcher(old_state)
-        )
-        .filter(
-            (Events.event_type != EVENT_STATE_CHANGED) | _continuous_entity_matcher()
+        _outerjoin_shared_event_rows(query)
+        .outerjoin(States, (Events.event_id == States.event_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
         )
+        .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .filter(not_state_changed | _missing_state_matcher(old_state))
+        .filter(not_state_changed | _continuous_entity_matcher())
     )
     return _apply_event_types_filter(hass, events_query, ALL_EVENT_TYPES)
 
@@ -544,7 +581,11 @@ def _continuous_entity_matcher():
     #
     return sqlalchemy.or_(
         sqlalchemy.not_(States.domain.in_(CONTINUOUS_DOMAINS)),
-        sqlalchemy.not_(States.attributes.contains(UNIT_OF_MEASUREMENT_JSON)),
+        sqlalchemy.not_(
+            sqlalchemy.func.coalesce(
+                StateAttributes.shared_attrs, States.attributes
+            ).contains(UNIT_OF_MEASUREMENT_JSON)
+        ),
     )
 
 
@@ -556,15 +597,31 @@ def _apply_event_time_filter(events_query, start_day, end_day):
 
 def _apply_event_types_filter(hass, query, event_types):
     return query.filter(
-        Events.event_type.in_(event_types + list(hass.data.get(DOMAIN, {})))
+        Events.event_type_id.in_(
+            _event_type_ids(
+                query.session, event_types + list(hass.data.get(DOMAIN, {}))
+            )
+        )
     )
 
 
+def _event_type_ids(session, event_types):
+    """Look up the ids of the event types, so events are filtered on integers."""
+    return [
+        event_type_id
+        for event_type_id, in session.query(EventTypes.event_type_id).filter(
+            EventTypes.event_type.in_(event_types)
+        )
+    ]
+
+
 def _apply_event_entity_id_matchers(events_query, entity_ids):
     return events_query.filter(
         sqlalchemy.or_(
             *[
-                Events.event_data.contains(ENTITY_ID_JSON_TEMPLATE.format(entity_id))
+                sqlalchemy.func.coalesce(
+                    EventData.shared_data, Events.event_data
+                ).contains(ENTITY_ID_JSON_TEMPLATE.format(entity_id))
                 for entity_id in entity_ids
             ]
         )
@@ -670,6 +727,7 @@ class LazyEventPartialState:
 
     __slots__ = [
         "_row",
+        "_shared_data",
         "_event_data",
         "_time_fired_isoformat",
         "_attributes",
@@ -686,10 +744,13 @@ class LazyEventPartialState:
     def __init__(self, row):
         """Init the lazy event."""
         self._row = row
+        self._shared_data = (
+            self._row.shared_data or self._row.event_data or EMPTY_JSON_OBJECT
+        )
         self._event_data = None
         self._time_fired_isoformat = None
         self._attributes = None
-        self.event_type = self._row.event_type
+        self.event_type = self._row.shared_event_type or self._row.event_type
         self.entity_id = self._row.entity_id
         self.state = self._row.state
         self.domain = self._row.domain
@@ -704,7 +765,9 @@ class LazyEventPartialState:
         if self._attributes:
             return self._attributes.get(ATTR_ICON)
 
-        result = ICON_JSON_EXTRACT.search(self._row.attributes)
+        result = ICON_JSON_EXTRACT.search(
+            self._row.shared_attrs or self._row.attributes
+        )
         return result and result.group(1)
 
     @property
@@ -713,7 +776,7 @@ class LazyEventPartialState:
         if self._event_data:
             return self._event_data.get(ATTR_ENTITY_ID)
 
-        result = ENTITY_ID_JSON_EXTRACT.search(self._row.event_data)
+        result = ENTITY_ID_JSON_EXTRACT.search(self._shared_data)
         return result and result.group(1)
 
     @property
@@ -722,30 +785,28 @@ class LazyEventPartialState:
         if self._event_data:
             return self._event_data.get(ATTR_DOMAIN)
 
-        result = DOMAIN_JSON_EXTRACT.search(self._row.event_data)
+        result = DOMAIN_JSON_EXTRACT.search(self._shared_data)
         return result and result.group(1)
 
     @property
     def attributes(self):
         """State attributes."""
         if not self._attributes:
-            if (
-                self._row.attributes is None
-                or self._row.attributes == EMPTY_JSON_OBJECT
-            ):
+            shared_attrs = self._row.shared_attrs or self._row.attributes
+            if shared_attrs is None or shared_attrs == EMPTY_JSON_OBJECT:
                 self._attributes = {}
             else:
-                self._attributes = json.loads(self._row.attributes)
+                self._attributes = json.loads(shared_attrs)
         return self._attributes
 
     @property
     def data(self):
         """Event data."""
         if not self._event_data:
-            if self._row.event_data == EMPTY_JSON_OBJECT:
+            if self._shared_data == EMPTY_JSON_OBJECT:
                 self._event_data = {}
             else:
-                self._event_data = json.loads(self._row.event_data)
+                self._event_data = json.loads(self._shared_data)
         return self._event_data
 
     @property
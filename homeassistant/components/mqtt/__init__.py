@@ -1,14 +1,24 @@
 """Support for MQTT message handling."""
 import asyncio
-from functools import lru_cache, partial, wraps
+from collections import deque
+from functools import partial, wraps
 import inspect
-from itertools import groupby
 import logging
-from operator import attrgetter
 import os
 import ssl
 import time
-from typing import Any, Callable, List, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 import uuid
 
 import attr
@@ -67,6 +77,7 @@ from .const import (
     PROTOCOL_311,
 )
 from .discovery import LAST_DISCOVERY
+from .matcher import SubscriptionMatcher
 from .models import Message, MessageCallbackType, PublishPayloadType
 from .util import _VALID_QOS_SCHEMA, valid_publish_topic, valid_subscribe_topic
 
@@ -105,6 +116,10 @@ CONNECTION_FAILED_RECOVERABLE = "connection_failed_recoverable"
 
 DISCOVERY_COOLDOWN = 2
 TIMEOUT_ACK = 10
+MAX_MESSAGE_BATCH = 500  # messages handled per event loop iteration
+MAX_TOPICS_PER_REQUEST = 100  # topics per SUBSCRIBE or UNSUBSCRIBE packet
+
+_UNDECODABLE = object()
 
 PLATFORMS = [
     "alarm_control_panel",
@@ -531,12 +546,24 @@ class Subscription:
     """Class to hold data about an active subscription."""
 
     topic: str = attr.ib()
-    matcher: Any = attr.ib()
     job: HassJob = attr.ib()
     qos: int = attr.ib(default=0)
     encoding: str = attr.ib(default="utf-8")
 
 
+@attr.s(slots=True)
+class SubscriptionStats:
+    """Statistics of the subscribe and unsubscribe requests sent to the broker."""
+
+    subscribe_packets: int = attr.ib(default=0)
+    unsubscribe_packets: int = attr.ib(default=0)
+    subscribed_topics: int = attr.ib(default=0)
+    # Seconds spent waiting for the broker to acknowledge the requests
+    ack_duration: float = attr.ib(default=0.0)
+    # Seconds from connecting until discovery and subscriptions settled
+    startup_duration: Optional[float] = attr.ib(default=None)
+
+
 class MQTT:
     """Home Assistant MQTT client."""
 
@@ -555,6 +582,20 @@ class MQTT:
         self.config_entry = config_entry
         self.conf = conf
         self.subscriptions: List[Subscription] = []
+        self._matcher = SubscriptionMatcher()
+        # Messages received by the paho thread, handled in the event loop
+        self._messages: Deque[Any] = deque()
+        self._messages_scheduled = False
+        # Number of subscriptions on each topic
+        self._topic_refs: Dict[str, int] = {}
+        # Requests waiting to be sent together, the callers waiting for them
+        # to be sent and the task sending them
+        self._pending_subscribes: Dict[str, int] = {}
+        self._pending_unsubscribes: Set[str] = set()
+        self._pending_waiters: List[asyncio.Future] = []
+        self._pending_task: Optional[asyncio.Task] = None
+        self._connected_at: Optional[float] = None
+        self.subscription_stats = SubscriptionStats()
         self.connected = False
         self._ha_started = asyncio.Event()
         self._last_subscribe = time.time()
@@ -719,6 +760,9 @@ class MQTT:
 
     async def async_disconnect(self):
         """Stop the MQTT client."""
+        if self._pending_task is not None:
+            self._pending_task.cancel()
+        self._async_drop_pending(HomeAssistantError("MQTT client stopped"))
 
         def stop():
             """Stop the MQTT client."""
@@ -741,16 +785,15 @@ class MQTT:
         if not isinstance(topic, str):
             raise HomeAssistantError("Topic needs to be a string!")
 
-        subscription = Subscription(
-            topic, _matcher_for_topic(topic), HassJob(msg_callback), qos, encoding
-        )
+        subscription = Subscription(topic, HassJob(msg_callback), qos, encoding)
         self.subscriptions.append(subscription)
-        self._matching_subscriptions.cache_clear()
+        self._matcher.add(topic, subscription)
+        self._topic_refs[topic] = self._topic_refs.get(topic, 0) + 1
 
         # Only subscribe if currently connected.
         if self.connected:
             self._last_subscribe = time.time()
-            await self._async_perform_subscription(topic, qos)
+            await self._async_queue_subscriptions([(topic, qos)])
 
         @callback
         def async_remove() -> None:
@@ -758,42 +801,161 @@ class MQTT:
             if subscription not in self.subscriptions:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
-            self._matching_subscriptions.cache_clear()
+            self._matcher.remove(topic, subscription)
 
-            if any(other.topic == topic for other in self.subscriptions):
+            refs = self._topic_refs.pop(topic) - 1
+            if refs:
                 # Other subscriptions on topic remaining - don't unsubscribe.
+                self._topic_refs[topic] = refs
                 return
 
             # Only unsubscribe if currently connected.
             if self.connected:
-                self.hass.async_create_task(self._async_unsubscribe(topic))
+                self._async_queue_unsubscribe(topic)
 
         return async_remove
 
-    async def _async_unsubscribe(self, topic: str) -> None:
-        """Unsubscribe from a topic.
+    @callback
+    def _async_queue_subscriptions(
+        self, subscriptions: Iterable[Tuple[str, int]]
+    ) -> asyncio.Future:
+        """Queue topics to subscribe to, return a future done once sent.
+
+        Topics queued more than once are subscribed with the highest qos.
+        The future raises HomeAssistantError if the topics could not be
+        subscribed to.
+        """
+        for topic, qos in subscriptions:
+            self._pending_unsubscribes.discard(topic)
+            self._pending_subscribes[topic] = max(
+                qos, self._pending_subscribes.get(topic, qos)
+            )
+        waiter = self.hass.loop.create_future()
+        self._pending_waiters.append(waiter)
+        self._async_schedule_pending()
+        return waiter
+
+    async def _async_resubscribe(self) -> None:
+        """Re-subscribe to all topics at once, with the highest requested qos."""
+        try:
+            await self._async_queue_subscriptions(
+                (subscription.topic, subscription.qos)
+                for subscription in self.subscriptions
+            )
+        except HomeAssistantError:
+            # Already logged, the topics are subscribed again on the next connect
+            pass
+
+    @callback
+    def _async_queue_unsubscribe(self, topic: str) -> None:
+        """Queue a topic to unsubscribe from."""
+        self._pending_subscribes.pop(topic, None)
+        self._pending_unsubscribes.add(topic)
+        self._async_schedule_pending()
+
+    @callback
+    def _async_schedule_pending(self) -> None:
+        """Schedule sending the queued requests."""
+        if self._pending_task is None:
+            self._pending_task = self.hass.async_create_task(self._async_send_pending())
+
+    @callback
+    def _async_drop_pending(self, error: Optional[HomeAssistantError] = None) -> None:
+        """Drop the queued requests and release the callers waiting for them.
+
+        When disconnected the topics are subscribed again on the next connect,
+        so the waiting callers are done. When stopping they get the error.
+        """
+        self._pending_subscribes = {}
+        self._pending_unsubscribes = set()
+        waiters, self._pending_waiters = self._pending_waiters, []
+        _async_release_waiters(waiters, error)
+
+    async def _async_send_pending(self) -> None:
+        """Send the queued subscribe and unsubscribe requests in bulk.
+
+        The requests queued until the lock is acquired, in the same event loop
+        iteration or while earlier requests are being sent, are combined in
+        multi-topic packets.
+        """
+        try:
+            await self._paho_lock.acquire()
+        except asyncio.CancelledError:
+            self._pending_task = None
+            self._async_drop_pending(HomeAssistantError("MQTT client stopped"))
+            raise
+        self._pending_task = None
+
+        waiters, self._pending_waiters = self._pending_waiters, []
+        subscribes, self._pending_subscribes = self._pending_subscribes, {}
+        unsubscribes, self._pending_unsubscribes = self._pending_unsubscribes, set()
+        error: Optional[HomeAssistantError] = None
+        try:
+            mids = []
+            try:
+                mids.extend(await self._async_unsubscribe(sorted(unsubscribes)))
+                mids.extend(
+                    await self._async_perform_subscriptions(list(subscribes.items()))
+                )
+            except HomeAssistantError as err:
+                _LOGGER.error("Unable to update the MQTT subscriptions: %s", err)
+                error = err
+            finally:
+                self._paho_lock.release()
+
+            start = time.monotonic()
+            await asyncio.gather(*(self._wait_for_mid(mid) for mid in mids))
+            self.subscription_stats.ack_duration += time.monotonic() - start
+        except asyncio.CancelledError:
+            _async_release_waiters(waiters, HomeAssistantError("MQTT client stopped"))
+            raise
+
+        _async_release_waiters(waiters, error)
+
+    async def _async_unsubscribe(self, topics: List[str]) -> List[int]:
+        """Unsubscribe from topics, return the mids of the requests.
 
         This method is a coroutine.
         """
-        async with self._paho_lock:
+        mids = []
+        for idx in range(0, len(topics), MAX_TOPICS_PER_REQUEST):
+            chunk = topics[idx : idx + MAX_TOPICS_PER_REQUEST]
             result: int = None
             result, mid = await self.hass.async_add_executor_job(
-                self._mqttc.unsubscribe, topic
+                self._mqttc.unsubscribe, chunk[0] if len(chunk) == 1 else chunk
             )
-            _LOGGER.debug("Unsubscribing from %s, mid: %s", topic, mid)
+            _LOGGER.debug("Unsubscribing from %s, mid: %s", ", ".join(chunk), mid)
             _raise_on_error(result)
-        await self._wait_for_mid(mid)
-
-    async def _async_perform_subscription(self, topic: str, qos: int) -> None:
-        """Perform a paho-mqtt subscription."""
-        async with self._paho_lock:
+            self.subscription_stats.unsubscribe_packets += 1
+            mids.append(mid)
+        return mids
+
+    async def _async_perform_subscriptions(
+        self, subscriptions: List[Tuple[str, int]]
+    ) -> List[int]:
+        """Perform paho-mqtt subscriptions, return the mids of the requests."""
+        mids = []
+        for idx in range(0, len(subscriptions), MAX_TOPICS_PER_REQUEST):
+            chunk = subscriptions[idx : idx + MAX_TOPICS_PER_REQUEST]
             result: int = None
-            result, mid = await self.hass.async_add_executor_job(
-                self._mqttc.subscribe, topic, qos
+            if len(chunk) == 1:
+                result, mid = await self.hass.async_add_executor_job(
+                    self._mqttc.subscribe, *chunk[0]
+                )
+            else:
+                result, mid = await self.hass.async_add_executor_job(
+                    self._mqttc.subscribe, chunk
+                )
+            _LOGGER.debug(
+                "Subscribing to %s, mid: %s",
+                ", ".join(topic for topic, _ in chunk),
+                mid,
             )
-            _LOGGER.debug("Subscribing to %s, mid: %s", topic, mid)
             _raise_on_error(result)
-        await self._wait_for_mid(mid)
+            self.subscription_stats.subscribe_packets += 1
+            self.subscription_stats.subscribed_topics += len(chunk)
+            mids.append(mid)
+        return mids
 
     def _mqtt_on_connect(self, _mqttc, _userdata, _flags, result_code: int) -> None:
         """On connect callback.
@@ -812,6 +974,7 @@ class MQTT:
             return
 
         self.connected = True
+        self._connected_at = time.time()
         dispatcher_send(self.hass, MQTT_CONNECTED)
         _LOGGER.info(
             "Connected to MQTT server %s:%s (%s)",
@@ -820,12 +983,7 @@ class MQTT:
             result_code,
         )
 
-        # Group subscriptions to only re-subscribe once for each topic.
-        keyfunc = attrgetter("topic")
-        for topic, subs in groupby(sorted(self.subscriptions, key=keyfunc), keyfunc):
-            # Re-subscribe with the highest requested qos
-            max_qos = max(subscription.qos for subscription in subs)
-            self.hass.add_job(self._async_perform_subscription, topic, max_qos)
+        self.hass.add_job(self._async_resubscribe)
 
         if (
             CONF_BIRTH_MESSAGE in self.conf
@@ -848,56 +1006,83 @@ class MQTT:
             )
 
     def _mqtt_on_message(self, _mqttc, _userdata, msg) -> None:
-        """Message received callback."""
-        self.hass.add_job(self._mqtt_handle_message, msg)
+        """Message received callback.
+
+        Messages are queued and the event loop is only woken up when the
+        queue was empty, so a flood of messages is handled in batches.
+        """
+        self._messages.append(msg)
+        if not self._messages_scheduled:
+            self._messages_scheduled = True
+            self.hass.loop.call_soon_threadsafe(self._mqtt_handle_queued_messages)
 
-    @lru_cache(2048)
-    def _matching_subscriptions(self, topic):
-        subscriptions = []
-        for subscription in self.subscriptions:
-            if subscription.matcher(topic):
-                subscriptions.append(subscription)
-        return subscriptions
+    @callback
+    def _mqtt_handle_queued_messages(self) -> None:
+        """Handle a batch of the queued messages."""
+        self._messages_scheduled = False
+        messages = self._messages
+        batch = [
+            messages.popleft() for _ in range(min(len(messages), MAX_MESSAGE_BATCH))
+        ]
+        if messages:
+            # Let other jobs run before handling the next batch
+            self._messages_scheduled = True
+            self.hass.loop.call_soon(self._mqtt_handle_queued_messages)
+        self._mqtt_handle_messages(batch)
 
     @callback
     def _mqtt_handle_message(self, msg) -> None:
-        _LOGGER.debug(
-            "Received message on %s%s: %s",
-            msg.topic,
-            " (retained)" if msg.retain else "",
-            msg.payload,
-        )
-        timestamp = dt_util.utcnow()
+        self._mqtt_handle_messages([msg])
+
+    @callback
+    def _mqtt_handle_messages(self, messages: List[Any]) -> None:
+        """Hand messages to the subscriptions matching their topic.
 
-        subscriptions = self._matching_subscriptions(msg.topic)
+        The payload of a message is decoded once per encoding and the same
+        Message is passed to all subscriptions on the same topic filter.
+        """
+        timestamp = dt_util.utcnow()
 
-        for subscription in subscriptions:
+        for msg in messages:
+            _LOGGER.debug(
+                "Received message on %s%s: %s",
+                msg.topic,
+                " (retained)" if msg.retain else "",
+                msg.payload,
+            )
 
-            payload: SubscribePayloadType = msg.payload
-            if subscription.encoding is not None:
-                try:
-                    payload = msg.payload.decode(subscription.encoding)
-                except (AttributeError, UnicodeDecodeError):
-                    _LOGGER.warning(
-                        "Can't decode payload %s on %s with encoding %s (for %s)",
-                        msg.payload,
+            payloads: Dict[Optional[str], Any] = {}
+            shared: Dict[Tuple[str, Optional[str]], Message] = {}
+
+            for subscription in self._matcher.match(msg.topic):
+                encoding = subscription.encoding
+                message = shared.get((subscription.topic, encoding))
+
+                if message is None:
+                    if encoding not in payloads:
+                        payloads[encoding] = _decode_payload(msg.payload, encoding)
+                    payload = payloads[encoding]
+
+                    if payload is _UNDECODABLE:
+                        _LOGGER.warning(
+                            "Can't decode payload %s on %s with encoding %s (for %s)",
+                            msg.payload,
+                            msg.topic,
+                            encoding,
+                            subscription.job,
+                        )
+                        continue
+
+                    message = shared[(subscription.topic, encoding)] = Message(
                         msg.topic,
-                        subscription.encoding,
-                        subscription.job,
+                        payload,
+                        msg.qos,
+                        msg.retain,
+                        subscription.topic,
+                        timestamp,
                     )
-                    continue
-
-            self.hass.async_run_hass_job(
-                subscription.job,
-                Message(
-                    msg.topic,
-                    payload,
-                    msg.qos,
-                    msg.retain,
-                    subscription.topic,
-                    timestamp,
-                ),
-            )
+
+                self.hass.async_run_hass_job(subscription.job, message)
 
     def _mqtt_on_callback(self, _mqttc, _userdata, mid, _granted_qos=None) -> None:
         """Publish / Subscribe / Unsubscribe callback."""
@@ -914,6 +1099,7 @@ class MQTT:
     def _mqtt_on_disconnect(self, _mqttc, _userdata, result_code: int) -> None:
         """Disconnected callback."""
         self.connected = False
+        self.hass.add_job(self._async_drop_pending)
         dispatcher_send(self.hass, MQTT_DISCONNECTED)
         _LOGGER.warning(
             "Disconnected from MQTT server %s:%s (%s)",
@@ -955,6 +1141,43 @@ class MQTT:
                 last_discovery + DISCOVERY_COOLDOWN, last_subscribe + DISCOVERY_COOLDOWN
             )
 
+        stats = self.subscription_stats
+        if stats.startup_duration is None and self._connected_at is not None:
+            stats.startup_duration = max(
+                0, max(last_discovery, last_subscribe) - self._connected_at
+            )
+            _LOGGER.info(
+                "MQTT discovery and subscriptions settled %.2fs after connecting, "
+                "subscribed to %s topics in %s packets in %.2fs",
+                stats.startup_duration,
+                stats.subscribed_topics,
+                stats.subscribe_packets,
+                stats.ack_duration,
+            )
+
+
+def _decode_payload(payload: bytes, encoding: Optional[str]) -> Any:
+    """Return the decoded payload or _UNDECODABLE if it can't be decoded."""
+    if encoding is None:
+        return payload
+    try:
+        return payload.decode(encoding)
+    except (AttributeError, UnicodeDecodeError):
+        return _UNDECODABLE
+
+
+def _async_release_waiters(
+    waiters: List[asyncio.Future], error: Optional[HomeAssistantError]
+) -> None:
+    """Release the callers waiting for queued requests, with the error if any."""
+    for waiter in waiters:
+        if waiter.done():
+            continue
+        if error is not None:
+            waiter.set_exception(error)
+        else:
+            waiter.set_result(None)
+
 
 def _raise_on_error(result_code: int) -> None:
     """Raise error if error result."""
@@ -967,16 +1190,6 @@ def _raise_on_error(result_code: int) -> None:
         )
 
 
-def _matcher_for_topic(subscription: str) -> Any:
-    # pylint: disable=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-
-    return lambda topic: next(matcher.iter_match(topic), False)
-
-
 @websocket_api.websocket_command(
     {vol.Required("type"): "mqtt/device/debug_info", vol.Required("device_id"): str}
 )
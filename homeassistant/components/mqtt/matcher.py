@@ -0,0 +1,99 @@
+"""Match MQTT topics against the topic filters of subscriptions."""
+from itertools import count
+from typing import Any, Dict, List, Optional
+
+
+class _TopicNode:
+    """Level of a topic filter in the subscription trie."""
+
+    __slots__ = ("children", "subscriptions")
+
+    def __init__(self) -> None:
+        """Initialize the node."""
+        self.children: Dict[str, "_TopicNode"] = {}
+        # Subscriptions on the filter ending at this level, with their order
+        self.subscriptions: Dict[Any, int] = {}
+
+
+class SubscriptionMatcher:
+    """Trie of the topic filters of all subscriptions.
+
+    Subscriptions are added and removed incrementally and a topic is matched
+    by walking its levels, so matching doesn't depend on the number of
+    subscriptions. The wildcards follow paho-mqtt: `+` matches one level,
+    `#` matches the parent level and everything below it, and wildcards on
+    the first level don't match topics starting with `$`.
+
+    Matching subscriptions are returned in the order they were added.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the matcher."""
+        self._root = _TopicNode()
+        self._order = count()
+
+    def add(self, topic: str, subscription: Any) -> None:
+        """Add a subscription on a topic filter."""
+        node = self._root
+        for level in topic.split("/"):
+            child = node.children.get(level)
+            if child is None:
+                child = node.children[level] = _TopicNode()
+            node = child
+        node.subscriptions[subscription] = next(self._order)
+
+    def remove(self, topic: str, subscription: Any) -> None:
+        """Remove a subscription, pruning the levels that are no longer used."""
+        levels = topic.split("/")
+        path = [self._root]
+        for level in levels:
+            node: Optional[_TopicNode] = path[-1].children.get(level)
+            if node is None:
+                raise KeyError(subscription)
+            path.append(node)
+
+        del path[-1].subscriptions[subscription]
+
+        for idx in range(len(levels) - 1, -1, -1):
+            node = path[idx + 1]
+            if node.subscriptions or node.children:
+                break
+            del path[idx].children[levels[idx]]
+
+    def match(self, topic: str) -> List[Any]:
+        """Return the subscriptions with a filter matching the topic."""
+        levels = topic.split("/")
+        depth = len(levels)
+        wildcards_first = not topic.startswith("$")
+        found: List[Dict[Any, int]] = []
+        stack = [(self._root, 0)]
+
+        while stack:
+            node, idx = stack.pop()
+            children = node.children
+            wildcards = wildcards_first or idx > 0
+
+            if wildcards:
+                multi = children.get("#")
+                if multi is not None and multi.subscriptions:
+                    found.append(multi.subscriptions)
+
+            if idx == depth:
+                if node.subscriptions:
+                    found.append(node.subscriptions)
+                continue
+
+            child = children.get(levels[idx])
+            if child is not None:
+                stack.append((child, idx + 1))
+            if wildcards:
+                single = children.get("+")
+                if single is not None:
+                    stack.append((single, idx + 1))
+
+        if not found:
+            return []
+        if len(found) == 1:
+            return list(found[0])
+        merged = {sub: order for subs in found for sub, order in subs.items()}
+        return sorted(merged, key=merged.__getitem__)
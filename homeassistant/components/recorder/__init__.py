@@ -7,7 +7,7 @@ import logging
 import queue
 import threading
 import time
-from typing import Any, Callable, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from sqlalchemy import create_engine, event as sqlalchemy_event, exc, select
 from sqlalchemy.orm import scoped_session, sessionmaker
@@ -34,9 +34,24 @@ from homeassistant.helpers.entityfilter import (
 from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 
-from . import migration, purge
-from .const import CONF_DB_INTEGRITY_CHECK, DATA_INSTANCE, DOMAIN, SQLITE_URL_PREFIX
-from .models import Base, Events, RecorderRuns, States
+from . import migration, purge, statistics
+from .const import (
+    CONF_DB_INTEGRITY_CHECK,
+    DATA_INSTANCE,
+    DOMAIN,
+    SQLITE_MAX_BIND_VARS,
+    SQLITE_URL_PREFIX,
+)
+from .models import (
+    Base,
+    EventData,
+    Events,
+    EventTypes,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
+from .shared import RowIds, SharedRows
 from .util import session_scope, validate_or_move_away_sqlite_database
 
 _LOGGER = logging.getLogger(__name__)
@@ -61,9 +76,10 @@ DEFAULT_DB_RETRY_WAIT = 3
 DEFAULT_COMMIT_INTERVAL = 1
 KEEPALIVE_TIME = 30
 
-# Controls how often we clean up
-# States and Events objects
-EXPIRE_AFTER_COMMITS = 120
+# Number of shared row ids to remember in the recorder thread
+STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
+EVENT_DATA_ID_CACHE_SIZE = 2048
+EVENT_TYPE_ID_CACHE_SIZE = 1024
 
 CONF_AUTO_PURGE = "auto_purge"
 CONF_DB_URL = "db_url"
@@ -196,7 +212,11 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     return await instance.async_db_ready
 
 
-PurgeTask = namedtuple("PurgeTask", ["keep_days", "repack"])
+PurgeTask = namedtuple(
+    "PurgeTask", ["keep_days", "repack", "progress"], defaults=[None]
+)
+
+StatisticsTask = namedtuple("StatisticsTask", ["start"])
 
 
 class WaitTask:
@@ -241,10 +261,37 @@ class Recorder(threading.Thread):
         self.exclude_t = exclude_t
 
         self._timechanges_seen = 0
-        self._commits_without_expire = 0
         self._keepalive_count = 0
-        self._old_states = {}
-        self._pending_expunge = []
+        self._old_states: Dict[str, dict] = {}
+        # The attributes of the last state of each entity and their JSON
+        self._old_attributes: Dict[str, Tuple[Any, str]] = {}
+        self._pending_events: List[Tuple[dict, Optional[dict], Optional[dict]]] = []
+        self._pending_states: List[
+            Tuple[dict, dict, Optional[dict], Optional[dict]]
+        ] = []
+        self._event_ids = RowIds(Events.__table__.c.event_id)
+        self._state_ids = RowIds(States.__table__.c.state_id)
+        self._event_types = SharedRows(
+            EventTypes.__table__.c.event_type_id,
+            EventTypes.__table__.c.event_type,
+            EventTypes.__table__.c.event_type,
+            EventTypes.row_from_event_type,
+            EVENT_TYPE_ID_CACHE_SIZE,
+        )
+        self._event_data = SharedRows(
+            EventData.__table__.c.data_id,
+            EventData.__table__.c.shared_data,
+            EventData.__table__.c.hash,
+            EventData.row_from_shared_data,
+            EVENT_DATA_ID_CACHE_SIZE,
+        )
+        self._state_attributes = SharedRows(
+            StateAttributes.__table__.c.attributes_id,
+            StateAttributes.__table__.c.shared_attrs,
+            StateAttributes.__table__.c.hash,
+            StateAttributes.row_from_shared_attrs,
+            STATE_ATTRIBUTES_ID_CACHE_SIZE,
+        )
         self.event_session = None
         self.get_session = None
         self._completed_database_setup = False
@@ -348,6 +395,28 @@ class Recorder(threading.Thread):
                 async_purge, hour=4, minute=12, second=0
             )
 
+        # Compile the statistics of the previous hour every hour
+        @callback
+        def async_compile_statistics(now):
+            """Trigger compiling the statistics."""
+            start = (
+                statistics.hour_start(now) - statistics.PERIODS[statistics.PERIOD_HOUR]
+            )
+            self.queue.put(StatisticsTask(start))
+
+        self.hass.helpers.event.track_time_change(
+            async_compile_statistics, minute=5, second=0
+        )
+
+        # Catch up on the hours that were missed while not running
+        try:
+            for start in statistics.uncompiled_hours(
+                self, dt_util.utcnow(), self.keep_days
+            ):
+                self.queue.put(StatisticsTask(start))
+        except exc.SQLAlchemyError as err:
+            _LOGGER.warning("Error finding uncompiled statistics: %s", err)
+
         self.event_session = self.get_session()
         self.event_session.expire_on_commit = False
         # Use a session for the event read loop
@@ -360,9 +429,29 @@ class Recorder(threading.Thread):
                 self._close_connection()
                 return
             if isinstance(event, PurgeTask):
-                # Schedule a new purge task if this one didn't finish
-                if not purge.purge_old_data(self, event.keep_days, event.repack):
-                    self.queue.put(PurgeTask(event.keep_days, event.repack))
+                # Pending rows may point to shared rows
+                # that are only kept because they are still in use
+                self._commit_event_session_or_retry()
+                # Schedule a new purge task if this one didn't finish,
+                # the queued events are recorded before the next batch
+                progress = event.progress or purge.PurgeProgress()
+                if not purge.purge_old_data(
+                    self, event.keep_days, event.repack, progress
+                ):
+                    self.queue.put(PurgeTask(event.keep_days, event.repack, progress))
+                # Unused shared rows may have been purged
+                self._event_data.clear()
+                self._state_attributes.clear()
+                self._forget_purged_states()
+                continue
+            if isinstance(event, StatisticsTask):
+                # The states of the period may still be pending
+                self._commit_event_session_or_retry()
+                try:
+                    statistics.compile_statistics(self, event.start)
+                except Exception as err:  # pylint: disable=broad-except
+                    # Must catch the exception to prevent the loop from collapsing
+                    _LOGGER.exception("Error compiling statistics: %s", err)
                 continue
             if isinstance(event, WaitTask):
                 self._queue_watch.set()
@@ -388,35 +477,63 @@ class Recorder(threading.Thread):
 
             try:
                 if event.event_type == EVENT_STATE_CHANGED:
-                    dbevent = Events.from_event(event, event_data="{}")
+                    # The data of state_changed events is in the states table
+                    event_row = Events.row_from_event(event, event_data="{}")
+                    del event_row["event_data"]
+                    data_id, event_data_row = None, None
                 else:
-                    dbevent = Events.from_event(event)
-                dbevent.created = event.time_fired
-                self.event_session.add(dbevent)
+                    event_row = Events.row_from_event(event)
+                    data_id, event_data_row = self._event_data.lookup(
+                        event_row.pop("event_data")
+                    )
+                event_type_id, event_type_row = self._event_types.lookup(
+                    event_row.pop("event_type")
+                )
+                event_row["event_type_id"] = event_type_id
+                event_row["data_id"] = data_id
+                event_row["created"] = event.time_fired
             except (TypeError, ValueError):
                 _LOGGER.warning("Event is not JSON serializable: %s", event)
+                continue
             except Exception as err:  # pylint: disable=broad-except
                 # Must catch the exception to prevent the loop from collapsing
                 _LOGGER.exception("Error adding event: %s", err)
+                continue
 
-            if dbevent and event.event_type == EVENT_STATE_CHANGED:
+            self._pending_events.append((event_row, event_type_row, event_data_row))
+
+            if event.event_type == EVENT_STATE_CHANGED:
                 try:
-                    dbstate = States.from_event(event)
                     has_new_state = event.data.get("new_state")
-                    if dbstate.entity_id in self._old_states:
-                        old_state = self._old_states.pop(dbstate.entity_id)
-                        if old_state.state_id:
-                            dbstate.old_state_id = old_state.state_id
-                        else:
-                            dbstate.old_state = old_state
+                    # Unchanged attributes are shared with the old state, so
+                    # they don't need to be serialized again
+                    old_attributes = self._old_attributes.pop(entity_id, None)
+                    if (
+                        has_new_state
+                        and old_attributes is not None
+                        and old_attributes[0] is has_new_state.attributes
+                    ):
+                        state_row = States.row_from_event(event, old_attributes[1])
+                    else:
+                        state_row = States.row_from_event(event)
                     if not has_new_state:
-                        dbstate.state = None
-                    dbstate.event = dbevent
-                    dbstate.created = event.time_fired
-                    self.event_session.add(dbstate)
+                        state_row["state"] = None
+                    state_row["created"] = event.time_fired
+                    shared_attrs = state_row.pop("attributes")
+                    attributes_id, attributes_row = self._state_attributes.lookup(
+                        shared_attrs
+                    )
+                    state_row["attributes_id"] = attributes_id
+                    old_state_row = self._old_states.pop(state_row["entity_id"], None)
+                    self._pending_states.append(
+                        (state_row, event_row, old_state_row, attributes_row)
+                    )
                     if has_new_state:
-                        self._old_states[dbstate.entity_id] = dbstate
-                        self._pending_expunge.append(dbstate)
+                        self._old_states[state_row["entity_id"]] = state_row
+                        self._old_attributes[entity_id] = (
+                            has_new_state.attributes,
+                            shared_attrs,
+                        )
                 except (TypeError, ValueError):
                     _LOGGER.warning(
                         "State is not JSON serializable: %s",
@@ -473,6 +590,7 @@ class Recorder(threading.Thread):
             except Exception as err:  # pylint: disable=broad-except
                 # Must catch the exception to prevent the loop from collapsing
                 _LOGGER.exception("Error saving events: %s", err)
+                self._discard_pending_rows()
                 return
 
         _LOGGER.error(
@@ -482,6 +600,8 @@ class Recorder(threading.Thread):
         self._reopen_event_session()
 
     def _reopen_event_session(self):
+        self._discard_pending_rows()
+
         try:
             self.event_session.rollback()
         except Exception as err:  # pylint: disable=broad-except
@@ -502,17 +622,8 @@ class Recorder(threading.Thread):
             _LOGGER.exception("Error while creating new event session: %s", err)
 
     def _commit_event_session(self):
-        self._commits_without_expire += 1
-
         try:
-            if self._pending_expunge:
-                self.event_session.flush()
-                for dbstate in self._pending_expunge:
-                    # Expunge the state so its not expired
-                    # until we use it later for dbstate.old_state
-                    if dbstate in self.event_session:
-                        self.event_session.expunge(dbstate)
-                self._pending_expunge = []
+            self._insert_pending_rows()
             self.event_session.commit()
         except exc.IntegrityError as err:
             _LOGGER.error(
@@ -520,19 +631,105 @@ class Recorder(threading.Thread):
                 err,
             )
             self.event_session.rollback()
-            self._old_states = {}
+            self._discard_pending_rows()
             raise
         except Exception as err:
             _LOGGER.error("Error executing query: %s", err)
             self.event_session.rollback()
             raise
 
-        # Expire is an expensive operation (frequently more expensive
-        # than the flush and commit itself) so we only
-        # do it after EXPIRE_AFTER_COMMITS commits
-        if self._commits_without_expire == EXPIRE_AFTER_COMMITS:
-            self._commits_without_expire = 0
-            self.event_session.expire_all()
+        self._event_types.commit_pending()
+        self._event_data.commit_pending()
+        self._state_attributes.commit_pending()
+        self._pending_events = []
+        self._pending_states = []
+
+    def _insert_pending_rows(self):
+        """Bulk insert the rows collected since the last commit.
+
+        The rows are written with one executemany per table instead of
+        going through the ORM unit of work. Primary keys are assigned here,
+        right before the insert, so states can reference their event and
+        the previous state of the entity without a flush in between.
+        """
+        if not self._pending_events:
+            return
+
+        session = self.event_session
+        self._event_types.insert_pending(session)
+        self._event_data.insert_pending(session)
+        event_ids = self._event_ids.reserve(session, len(self._pending_events))
+        event_rows = []
+        for event_id, (event_row, event_type_row, event_data_row) in zip(
+            event_ids, self._pending_events
+        ):
+            event_row["event_id"] = event_id
+            if event_type_row is not None:
+                event_row["event_type_id"] = event_type_row["event_type_id"]
+            if event_data_row is not None:
+                event_row["data_id"] = event_data_row["data_id"]
+            event_rows.append(event_row)
+        session.execute(Events.__table__.insert(), event_rows)
+
+        if not self._pending_states:
+            return
+
+        self._state_attributes.insert_pending(session)
+        state_ids = self._state_ids.reserve(session, len(self._pending_states))
+        state_rows = []
+        for state_id, (
+            state_row,
+            event_row,
+            old_state_row,
+            attributes_row,
+        ) in zip(state_ids, self._pending_states):
+            state_row["state_id"] = state_id
+            state_row["event_id"] = event_row["event_id"]
+            state_row["old_state_id"] = old_state_row and old_state_row["state_id"]
+            if attributes_row is not None:
+                state_row["attributes_id"] = attributes_row["attributes_id"]
+            state_rows.append(state_row)
+        session.execute(States.__table__.insert(), state_rows)
+
+    def _forget_purged_states(self):
+        """Forget the last states of entities that were purged.
+
+        The next state of those entities has no old state.
+        """
+        state_ids = [row["state_id"] for row in self._old_states.values()]
+        if not state_ids:
+            return
+
+        existing_ids = set()
+        try:
+            with session_scope(session=self.get_session()) as session:
+                for idx in range(0, len(state_ids), SQLITE_MAX_BIND_VARS):
+                    existing_ids.update(
+                        state_id
+                        for state_id, in session.query(States.state_id).filter(
+                            States.state_id.in_(
+                                state_ids[idx : idx + SQLITE_MAX_BIND_VARS]
+                            )
+                        )
+                    )
+        except exc.SQLAlchemyError as err:
+            _LOGGER.warning("Error finding the purged states: %s", err)
+            existing_ids = set()
+
+        self._old_states = {
+            entity_id: row
+            for entity_id, row in self._old_states.items()
+            if row["state_id"] in existing_ids
+        }
+
+    def _discard_pending_rows(self):
+        """Drop the rows that could not be saved."""
+        self._pending_events = []
+        self._pending_states = []
+        self._old_states = {}
+        self._event_types.clear()
+        self._event_data.clear()
+        self._state_attributes.clear()
 
     @callback
     def event_listener(self, event):
@@ -2,6 +2,8 @@
 
 DATA_INSTANCE = "recorder_instance"
 SQLITE_URL_PREFIX = "sqlite://"
+# The maximum number of host parameters in a single SQLite statement
+SQLITE_MAX_BIND_VARS = 999
 DOMAIN = "recorder"
 
 CONF_DB_INTEGRITY_CHECK = "db_integrity_check"
@@ -1,17 +1,32 @@
 """Schema migration helpers."""
 import logging
 
-from sqlalchemy import ForeignKeyConstraint, MetaData, Table, text
+from sqlalchemy import ForeignKeyConstraint, MetaData, Table, bindparam, select, text
 from sqlalchemy.engine import reflection
 from sqlalchemy.exc import InternalError, OperationalError, SQLAlchemyError
 from sqlalchemy.schema import AddConstraint, DropConstraint
 
 from .const import DOMAIN
-from .models import SCHEMA_VERSION, TABLE_STATES, Base, SchemaChanges
+from homeassistant.const import EVENT_STATE_CHANGED
+
+from .models import (
+    SCHEMA_VERSION,
+    TABLE_STATES,
+    Base,
+    EventData,
+    Events,
+    EventTypes,
+    SchemaChanges,
+    StateAttributes,
+    States,
+)
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Number of rows moved to shared rows per transaction
+SHARED_ROWS_MIGRATION_BATCH_SIZE = 10000
+
 
 def migrate_schema(instance):
     """Check if the schema needs to be upgraded."""
@@ -245,6 +260,154 @@ def _update_states_table_with_foreign_key_options(engine):
             )
 
 
+def _shared_row_id(connection, shared_ids, id_column, key_column, row):
+    """Return the id of a shared row, inserting it if it does not exist yet."""
+    key = row[key_column.key]
+    shared_id = shared_ids.get(key)
+    if shared_id is not None:
+        return shared_id
+
+    if len(shared_ids) > SHARED_ROWS_MIGRATION_BATCH_SIZE:
+        shared_ids.clear()
+
+    table = id_column.table
+    query = select([id_column, key_column])
+    if "hash" in table.c:
+        query = query.where(table.c.hash == row["hash"])
+    else:
+        query = query.where(key_column == key)
+    for shared_id, shared_key in connection.execute(query):
+        if shared_key == key:
+            break
+    else:
+        shared_id = connection.execute(table.insert().values(row)).inserted_primary_key[
+            0
+        ]
+
+    shared_ids[key] = shared_id
+    return shared_id
+
+
+def _move_to_shared_rows(engine, table, id_column, columns, move_rows):
+    """Move the data of existing rows to shared rows, one batch at a time.
+
+    move_rows receives the connection and the selected rows, and returns
+    the values to update, keyed by the name of the id column.
+    """
+    _LOGGER.warning(
+        "Moving data of the %s table to shared rows. Note: this can take "
+        "several minutes on large databases and slow computers. Please "
+        "be patient!",
+        table.name,
+    )
+    last_id = 0
+
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(
+                select([id_column, *columns])
+                .where(id_column > last_id)
+                .order_by(id_column)
+                .limit(SHARED_ROWS_MIGRATION_BATCH_SIZE)
+            ).fetchall()
+            if not rows:
+                return
+
+            last_id = rows[-1][0]
+            updates = move_rows(connection, rows)
+            if not updates:
+                continue
+
+            values = {key: bindparam(f"b_{key}") for key in updates[0]}
+            del values[id_column.key]
+            connection.execute(
+                table.update()
+                .where(id_column == bindparam(f"b_{id_column.key}"))
+                .values(values),
+                [
+                    {f"b_{key}": value for key, value in update.items()}
+                    for update in updates
+                ],
+            )
+
+
+def _move_state_attributes(engine):
+    """Move the attributes of existing states to the state_attributes table."""
+    states = States.__table__
+    state_attributes = StateAttributes.__table__
+    attributes_ids = {}
+
+    def move_rows(connection, rows):
+        return [
+            {
+                "state_id": state_id,
+                "attributes_id": _shared_row_id(
+                    connection,
+                    attributes_ids,
+                    state_attributes.c.attributes_id,
+                    state_attributes.c.shared_attrs,
+                    StateAttributes.row_from_shared_attrs(attributes),
+                ),
+                "attributes": None,
+            }
+            for state_id, attributes in rows
+            if attributes is not None
+        ]
+
+    _move_to_shared_rows(
+        engine, states, states.c.state_id, [states.c.attributes], move_rows
+    )
+
+
+def _move_event_types_and_data(engine):
+    """Move the types and data of existing events to shared rows."""
+    events = Events.__table__
+    event_types = EventTypes.__table__
+    event_data = EventData.__table__
+    event_type_ids = {}
+    data_ids = {}
+
+    def move_rows(connection, rows):
+        updates = []
+        for event_id, event_type, shared_data in rows:
+            if event_type is None:
+                continue
+            if event_type == EVENT_STATE_CHANGED or shared_data is None:
+                data_id = None
+            else:
+                data_id = _shared_row_id(
+                    connection,
+                    data_ids,
+                    event_data.c.data_id,
+                    event_data.c.shared_data,
+                    EventData.row_from_shared_data(shared_data),
+                )
+            updates.append(
+                {
+                    "event_id": event_id,
+                    "event_type_id": _shared_row_id(
+                        connection,
+                        event_type_ids,
+                        event_types.c.event_type_id,
+                        event_types.c.event_type,
+                        EventTypes.row_from_event_type(event_type),
+                    ),
+                    "data_id": data_id,
+                    "event_type": None,
+                    "event_data": None,
+                }
+            )
+        return updates
+
+    _move_to_shared_rows(
+        engine,
+        events,
+        events.c.event_id,
+        [events.c.event_type, events.c.event_data],
+        move_rows,
+    )
+
+
 def _apply_update(engine, new_version, old_version):
     """Perform operations to bring schema up to date."""
     if new_version == 1:
@@ -323,6 +486,22 @@ def _apply_update(engine, new_version, old_version):
     elif new_version == 11:
         _create_index(engine, "states", "ix_states_old_state_id")
         _update_states_table_with_foreign_key_options(engine)
+    elif new_version == 12:
+        # The state_attributes table is created by create_all
+        _add_columns(engine, "states", ["attributes_id INTEGER"])
+        _create_index(engine, "states", "ix_states_attributes_id")
+        _move_state_attributes(engine)
+    elif new_version == 13:
+        # The event_types and event_data tables are created by create_all
+        _add_columns(engine, "events", ["event_type_id INTEGER", "data_id INTEGER"])
+        _create_index(engine, "events", "ix_events_event_type_id_time_fired")
+        _create_index(engine, "events", "ix_events_data_id")
+        _move_event_types_and_data(engine)
+        # Event types are now filtered by id
+        _drop_index(engine, "events", "ix_events_event_type_time_fired")
+    elif new_version == 14:
+        # The statistics table is created by create_all
+        pass
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
@@ -1,11 +1,14 @@
 """Models for SQLAlchemy."""
 import json
 import logging
+import zlib
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
@@ -25,18 +28,31 @@ import homeassistant.util.dt as dt_util
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 11
+SCHEMA_VERSION = 14
 
 _LOGGER = logging.getLogger(__name__)
 
 DB_TIMEZONE = "+00:00"
 
 TABLE_EVENTS = "events"
+TABLE_EVENT_TYPES = "event_types"
+TABLE_EVENT_DATA = "event_data"
 TABLE_STATES = "states"
+TABLE_STATE_ATTRIBUTES = "state_attributes"
+TABLE_STATISTICS = "statistics"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
 
-ALL_TABLES = [TABLE_STATES, TABLE_EVENTS, TABLE_RECORDER_RUNS, TABLE_SCHEMA_CHANGES]
+ALL_TABLES = [
+    TABLE_STATES,
+    TABLE_STATE_ATTRIBUTES,
+    TABLE_STATISTICS,
+    TABLE_EVENTS,
+    TABLE_EVENT_TYPES,
+    TABLE_EVENT_DATA,
+    TABLE_RECORDER_RUNS,
+    TABLE_SCHEMA_CHANGES,
+]
 
 
 class Events(Base):  # type: ignore
@@ -56,25 +72,34 @@ class Events(Base):  # type: ignore
     context_id = Column(String(36), index=True)
     context_user_id = Column(String(36), index=True)
     context_parent_id = Column(String(36), index=True)
+    event_type_id = Column(Integer, ForeignKey("event_types.event_type_id"))
+    data_id = Column(Integer, ForeignKey("event_data.data_id"), index=True)
+    event_types = relationship("EventTypes", lazy="joined")
+    shared_event_data = relationship("EventData", lazy="joined")
 
     __table_args__ = (
         # Used for fetching events at a specific time
         # see logbook
-        Index("ix_events_event_type_time_fired", "event_type", "time_fired"),
+        Index("ix_events_event_type_id_time_fired", "event_type_id", "time_fired"),
     )
 
     @staticmethod
     def from_event(event, event_data=None):
         """Create an event database object from a native event."""
-        return Events(
-            event_type=event.event_type,
-            event_data=event_data or json.dumps(event.data, cls=JSONEncoder),
-            origin=str(event.origin.value),
-            time_fired=event.time_fired,
-            context_id=event.context.id,
-            context_user_id=event.context.user_id,
-            context_parent_id=event.context.parent_id,
-        )
+        return Events(**Events.row_from_event(event, event_data))
+
+    @staticmethod
+    def row_from_event(event, event_data=None):
+        """Create the column values of an event row from a native event."""
+        return {
+            "event_type": event.event_type,
+            "event_data": event_data or json.dumps(event.data, cls=JSONEncoder),
+            "origin": str(event.origin.value),
+            "time_fired": event.time_fired,
+            "context_id": event.context.id,
+            "context_user_id": event.context.user_id,
+            "context_parent_id": event.context.parent_id,
+        }
 
     def to_native(self, validate_entity_id=True):
         """Convert to a natve HA Event."""
@@ -83,10 +108,18 @@ class Events(Base):  # type: ignore
             user_id=self.context_user_id,
             parent_id=self.context_parent_id,
         )
+        if self.event_types is not None:
+            event_type = self.event_types.event_type
+        else:
+            event_type = self.event_type
+        if self.shared_event_data is not None:
+            shared_data = self.shared_event_data.shared_data
+        else:
+            shared_data = self.event_data
         try:
             return Event(
-                self.event_type,
-                json.loads(self.event_data),
+                event_type,
+                json.loads(shared_data or "{}"),
                 EventOrigin(self.origin),
                 process_timestamp(self.time_fired),
                 context=context,
@@ -97,6 +130,37 @@ class Events(Base):  # type: ignore
             return None
 
 
+class EventTypes(Base):  # type: ignore
+    """Event type names, stored once for all events of that type."""
+
+    __tablename__ = TABLE_EVENT_TYPES
+    event_type_id = Column(Integer, primary_key=True)
+    event_type = Column(String(64), index=True, unique=True)
+
+    @staticmethod
+    def row_from_event_type(event_type):
+        """Create the column values of an event type row."""
+        return {"event_type": event_type}
+
+
+class EventData(Base):  # type: ignore
+    """Event data, stored once for all events with the same data."""
+
+    __table_args__ = {
+        "mysql_default_charset": "utf8mb4",
+        "mysql_collate": "utf8mb4_unicode_ci",
+    }
+    __tablename__ = TABLE_EVENT_DATA
+    data_id = Column(Integer, primary_key=True)
+    hash = Column(BigInteger, index=True)
+    shared_data = Column(Text)
+
+    @staticmethod
+    def row_from_shared_data(shared_data):
+        """Create the column values of an event data row."""
+        return {"hash": hash_shared_json(shared_data), "shared_data": shared_data}
+
+
 class States(Base):  # type: ignore
     """State change history."""
 
@@ -119,8 +183,12 @@ class States(Base):  # type: ignore
     old_state_id = Column(
         Integer, ForeignKey("states.state_id", ondelete="SET NULL"), index=True
     )
+    attributes_id = Column(
+        Integer, ForeignKey("state_attributes.attributes_id"), index=True
+    )
     event = relationship("Events", uselist=False)
     old_state = relationship("States", remote_side=[state_id])
+    state_attributes = relationship("StateAttributes", lazy="joined")
 
     __table_args__ = (
         # Used for fetching the state of entities at a specific time
@@ -131,34 +199,51 @@ class States(Base):  # type: ignore
     @staticmethod
     def from_event(event):
         """Create object from a state_changed event."""
+        return States(**States.row_from_event(event))
+
+    @staticmethod
+    def row_from_event(event, attributes=None):
+        """Create the column values of a state row from a state_changed event.
+
+        The attributes JSON of the new state can be passed in if it is known.
+        """
         entity_id = event.data["entity_id"]
         state = event.data.get("new_state")
 
-        dbstate = States(entity_id=entity_id)
-
         # State got deleted
         if state is None:
-            dbstate.state = ""
-            dbstate.domain = split_entity_id(entity_id)[0]
-            dbstate.attributes = "{}"
-            dbstate.last_changed = event.time_fired
-            dbstate.last_updated = event.time_fired
-        else:
-            dbstate.domain = state.domain
-            dbstate.state = state.state
-            dbstate.attributes = json.dumps(dict(state.attributes), cls=JSONEncoder)
-            dbstate.last_changed = state.last_changed
-            dbstate.last_updated = state.last_updated
-
-        return dbstate
+            return {
+                "entity_id": entity_id,
+                "domain": split_entity_id(entity_id)[0],
+                "state": "",
+                "attributes": "{}",
+                "last_changed": event.time_fired,
+                "last_updated": event.time_fired,
+            }
+
+        if attributes is None:
+            attributes = json.dumps(dict(state.attributes), cls=JSONEncoder)
+
+        return {
+            "entity_id": entity_id,
+            "domain": state.domain,
+            "state": state.state,
+            "attributes": attributes,
+            "last_changed": state.last_changed,
+            "last_updated": state.last_updated,
+        }
 
     def to_native(self, validate_entity_id=True):
         """Convert to an HA state object."""
+        if self.state_attributes is not None:
+            shared_attrs = self.state_attributes.shared_attrs
+        else:
+            shared_attrs = self.attributes
         try:
             return State(
                 self.entity_id,
                 self.state,
-                json.loads(self.attributes),
+                json.loads(shared_attrs),
                 process_timestamp(self.last_changed),
                 process_timestamp(self.last_updated),
                 # Join the events table on event_id to get the context instead
@@ -172,6 +257,69 @@ class States(Base):  # type: ignore
             return None
 
 
+class StateAttributes(Base):  # type: ignore
+    """State attribute change history.
+
+    Attribute dicts rarely change between two states of an entity, so
+    each distinct dict is only stored once and shared by all the states
+    that have it.
+    """
+
+    __table_args__ = {
+        "mysql_default_charset": "utf8mb4",
+        "mysql_collate": "utf8mb4_unicode_ci",
+    }
+    __tablename__ = TABLE_STATE_ATTRIBUTES
+    attributes_id = Column(Integer, primary_key=True)
+    hash = Column(BigInteger, index=True)
+    shared_attrs = Column(Text)
+
+    @staticmethod
+    def row_from_shared_attrs(shared_attrs):
+        """Create the column values of a state attributes row."""
+        return {"hash": hash_shared_json(shared_attrs), "shared_attrs": shared_attrs}
+
+
+class Statistics(Base):  # type: ignore
+    """Long-term statistics of a numeric sensor.
+
+    Each row holds the minimum, maximum and time weighted mean of the state
+    of a sensor during one period, so trends are kept after the states
+    themselves are purged.
+    """
+
+    __tablename__ = TABLE_STATISTICS
+    id = Column(Integer, primary_key=True)
+    created = Column(DateTime(timezone=True), default=dt_util.utcnow)
+    entity_id = Column(String(255))
+    period = Column(String(16))
+    start = Column(DateTime(timezone=True))
+    mean = Column(Float)
+    min = Column(Float)
+    max = Column(Float)
+    # The numeric state at the end of the period, None if it wasn't numeric
+    state = Column(Float)
+    # The seconds the state was numeric during the period, the mean covers them
+    duration = Column(Float)
+
+    __table_args__ = (
+        # Used for fetching the statistics of entities over a time range
+        Index("ix_statistics_entity_id_period_start", "entity_id", "period", "start"),
+        # Used for finding which periods have been compiled
+        Index("ix_statistics_period_start", "period", "start"),
+    )
+
+    def to_dict(self):
+        """Return the statistics as a dict."""
+        return {
+            "entity_id": self.entity_id,
+            "start": process_timestamp_to_utc_isoformat(self.start),
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+        }
+
+
 class RecorderRuns(Base):  # type: ignore
     """Representation of recorder run."""
 
@@ -219,6 +367,11 @@ class SchemaChanges(Base):  # type: ignore
     changed = Column(DateTime(timezone=True), default=dt_util.utcnow)
 
 
+def hash_shared_json(shared_json):
+    """Return the hash used to look up shared JSON data."""
+    return zlib.crc32(shared_json.encode("utf-8"))
+
+
 def process_timestamp(ts):
     """Process a timestamp into datetime object."""
     if ts is None:
@@ -2,68 +2,130 @@
 from datetime import timedelta
 import logging
 import time
+from typing import Iterator, List, Optional
 
+from sqlalchemy import exists
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
 import homeassistant.util.dt as dt_util
 
-from .models import Events, RecorderRuns, States
-from .util import execute, session_scope
+from .const import SQLITE_MAX_BIND_VARS
+from .models import EventData, Events, RecorderRuns, StateAttributes, States
+from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
-
-def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
+# Number of rows of each table deleted per purge batch
+MAX_ROWS_TO_PURGE = 4000
+
+
+class PurgeProgress:
+    """Track the rows deleted by the batches of one purge."""
+
+    def __init__(self) -> None:
+        """Initialize the purge progress."""
+        self.started = time.monotonic()
+        self.batches = 0
+        self.states = 0
+        self.events = 0
+        self.elapsed = 0.0
+
+    def add_batch(self, states: int, events: int, elapsed: float) -> None:
+        """Add the rows deleted by a batch."""
+        self.batches += 1
+        self.states += states
+        self.events += events
+        self.elapsed += elapsed
+        _LOGGER.debug(
+            "Purge batch %s deleted %s states and %s events in %.3fs",
+            self.batches,
+            states,
+            events,
+            elapsed,
+        )
+
+    @property
+    def rows_per_second(self) -> float:
+        """Return the number of rows deleted per second spent purging."""
+        return (self.states + self.events) / self.elapsed if self.elapsed else 0.0
+
+
+def purge_old_data(
+    instance,
+    purge_days: int,
+    repack: bool,
+    progress: Optional[PurgeProgress] = None,
+) -> bool:
     """Purge events and states older than purge_days ago.
 
-    Cleans up an timeframe of an hour, based on the oldest record.
+    Deletes at most MAX_ROWS_TO_PURGE states and events, and then as many
+    unused shared attributes and event data, per call, so the database is
+    not locked for long. Returns False when there are rows left to purge
+    and it should be called again.
     """
     purge_before = dt_util.utcnow() - timedelta(days=purge_days)
-    _LOGGER.debug("Purging states and events before target %s", purge_before)
+    if progress is None:
+        progress = PurgeProgress()
 
     try:
         with session_scope(session=instance.get_session()) as session:
-            # Purge a max of 1 hour, based on the oldest states or events record
-            batch_purge_before = purge_before
-
-            query = session.query(States).order_by(States.last_updated.asc()).limit(1)
-            states = execute(query, to_native=True, validate_entity_ids=False)
-            if states:
-                batch_purge_before = min(
-                    batch_purge_before,
-                    states[0].last_updated + timedelta(hours=1),
-                )
+            batch_start = time.monotonic()
+            state_ids = [
+                state_id
+                for state_id, in session.query(States.state_id)
+                .filter(States.last_updated < purge_before)
+                .limit(MAX_ROWS_TO_PURGE)
+            ]
+            event_ids = [
+                event_id
+                for event_id, in session.query(Events.event_id)
+                .filter(Events.time_fired < purge_before)
+                .limit(MAX_ROWS_TO_PURGE)
+            ]
+            finished = (
+                len(state_ids) < MAX_ROWS_TO_PURGE
+                and len(event_ids) < MAX_ROWS_TO_PURGE
+            )
 
-            query = session.query(Events).order_by(Events.time_fired.asc()).limit(1)
-            events = execute(query, to_native=True)
-            if events:
-                batch_purge_before = min(
-                    batch_purge_before,
-                    events[0].time_fired + timedelta(hours=1),
+            # States of the purged events can't outlive them
+            for ids in _chunked(event_ids):
+                state_ids.extend(
+                    state_id
+                    for state_id, in session.query(States.state_id).filter(
+                        States.event_id.in_(ids)
+                    )
+                )
+            state_ids = list(set(state_ids))
+
+            deleted_states = _purge_state_ids(session, state_ids)
+            deleted_events = 0
+            for ids in _chunked(event_ids):
+                deleted_events += (
+                    session.query(Events)
+                    .filter(Events.event_id.in_(ids))
+                    .delete(synchronize_session=False)
                 )
 
-            _LOGGER.debug("Purging states and events before %s", batch_purge_before)
-
-            deleted_rows = (
-                session.query(States)
-                .filter(States.last_updated < batch_purge_before)
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s states", deleted_rows)
+        progress.add_batch(
+            deleted_states, deleted_events, time.monotonic() - batch_start
+        )
 
-            deleted_rows = (
-                session.query(Events)
-                .filter(Events.time_fired < batch_purge_before)
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s events", deleted_rows)
+        if not finished:
+            _LOGGER.debug("Purging hasn't fully completed yet")
+            return False
 
-            # If states or events purging isn't processing the purge_before yet,
-            # return false, as we are not done yet.
-            if batch_purge_before != purge_before:
-                _LOGGER.debug("Purging hasn't fully completed yet")
-                return False
+        _LOGGER.debug(
+            "Purged %s states and %s events before %s in %s batches "
+            "over %.1fs (%.0f rows/s)",
+            progress.states,
+            progress.events,
+            purge_before,
+            progress.batches,
+            time.monotonic() - progress.started,
+            progress.rows_per_second,
+        )
 
+        with session_scope(session=instance.get_session()) as session:
             # Recorder runs is small, no need to batch run it
             deleted_rows = (
                 session.query(RecorderRuns)
@@ -73,6 +135,49 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
             )
             _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
 
+            # Shared attributes that are no longer used by any state
+            attributes_ids = [
+                attributes_id
+                for attributes_id, in session.query(StateAttributes.attributes_id)
+                .filter(
+                    ~exists().where(
+                        States.attributes_id == StateAttributes.attributes_id
+                    )
+                )
+                .limit(MAX_ROWS_TO_PURGE)
+            ]
+            deleted_rows = 0
+            for ids in _chunked(attributes_ids):
+                deleted_rows += (
+                    session.query(StateAttributes)
+                    .filter(StateAttributes.attributes_id.in_(ids))
+                    .delete(synchronize_session=False)
+                )
+            _LOGGER.debug("Deleted %s state_attributes", deleted_rows)
+
+            # Shared event data that is no longer used by any event
+            data_ids = [
+                data_id
+                for data_id, in session.query(EventData.data_id)
+                .filter(~exists().where(Events.data_id == EventData.data_id))
+                .limit(MAX_ROWS_TO_PURGE)
+            ]
+            deleted_rows = 0
+            for ids in _chunked(data_ids):
+                deleted_rows += (
+                    session.query(EventData)
+                    .filter(EventData.data_id.in_(ids))
+                    .delete(synchronize_session=False)
+                )
+            _LOGGER.debug("Deleted %s event_data", deleted_rows)
+
+        if (
+            len(attributes_ids) == MAX_ROWS_TO_PURGE
+            or len(data_ids) == MAX_ROWS_TO_PURGE
+        ):
+            _LOGGER.debug("Purging unused shared rows hasn't fully completed yet")
+            return False
+
         if repack:
             # Execute sqlite or postgresql vacuum command to free up space on disk
             if instance.engine.driver in ("pysqlite", "postgresql"):
@@ -81,7 +186,10 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
             # Optimize mysql / mariadb tables to free up space on disk
             elif instance.engine.driver in ("mysqldb", "pymysql"):
                 _LOGGER.debug("Optimizing SQL DB to free space")
-                instance.engine.execute("OPTIMIZE TABLE states, events, recorder_runs")
+                instance.engine.execute(
+                    "OPTIMIZE TABLE states, state_attributes, events, event_data, "
+                    "recorder_runs"
+                )
 
     except OperationalError as err:
         # Retry when one of the following MySQL errors occurred:
@@ -101,3 +209,25 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
     except SQLAlchemyError as err:
         _LOGGER.warning("Error purging history: %s", err)
     return True
+
+
+def _purge_state_ids(session, state_ids: List[int]) -> int:
+    """Delete states by id, after clearing the references to them."""
+    deleted_rows = 0
+    for ids in _chunked(state_ids):
+        session.query(States).filter(States.old_state_id.in_(ids)).update(
+            {States.old_state_id: None}, synchronize_session=False
+        )
+    for ids in _chunked(state_ids):
+        deleted_rows += (
+            session.query(States)
+            .filter(States.state_id.in_(ids))
+            .delete(synchronize_session=False)
+        )
+    return deleted_rows
+
+
+def _chunked(ids: List[int]) -> Iterator[List[int]]:
+    """Split ids so each IN clause stays below the bind variable limit."""
+    for idx in range(0, len(ids), SQLITE_MAX_BIND_VARS):
+        yield ids[idx : idx + SQLITE_MAX_BIND_VARS]
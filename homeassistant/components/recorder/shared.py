@@ -0,0 +1,141 @@
+"""Rows that are shared by many recorded rows."""
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Column, func, text
+
+from .const import SQLITE_MAX_BIND_VARS
+
+
+class RowIds:
+    """Reserve the primary keys of rows that are inserted with explicit ids.
+
+    Rows are inserted in bulk with their ids already set, so rows inserted
+    in the same batch can point to each other. On PostgreSQL the ids are
+    taken from the sequence of the column, so rows inserted without an id
+    don't collide with them. Other databases continue after the highest id
+    in the table. The ids handed out before are never handed out again,
+    even when those rows were purged, because the recorder may still
+    remember them.
+
+    Only to be used from the recorder thread.
+    """
+
+    def __init__(self, id_column: Column) -> None:
+        """Initialize the row ids."""
+        self._id_column = id_column
+        self._next_id = 1
+
+    def reserve(self, session: Any, count: int) -> List[int]:
+        """Return count new ids in increasing order."""
+        if session.bind.dialect.name == "postgresql":
+            ids = [
+                row_id
+                for row_id, in session.execute(
+                    text(
+                        "SELECT nextval(pg_get_serial_sequence(:table, :column)) "
+                        "FROM generate_series(1, :count)"
+                    ),
+                    {
+                        "table": self._id_column.table.name,
+                        "column": self._id_column.name,
+                        "count": count,
+                    },
+                )
+            ]
+            ids.sort()
+            return ids
+
+        max_id = session.query(func.max(self._id_column)).scalar() or 0
+        first_id = max(max_id + 1, self._next_id)
+        self._next_id = first_id + count
+        return list(range(first_id, self._next_id))
+
+
+class SharedRows:
+    """Find or insert rows that many recorded rows point to.
+
+    Only one row is stored for each distinct key, for example the JSON of
+    an attribute dict. The ids of recently used keys are kept in an LRU so
+    most lookups don't need a round trip to the database. Keys that are not
+    known yet are collected as pending rows and looked up or inserted in
+    bulk by insert_pending.
+
+    Only to be used from the recorder thread.
+    """
+
+    def __init__(
+        self,
+        id_column: Column,
+        key_column: Column,
+        lookup_column: Column,
+        row_from_key: Callable[[Any], dict],
+        max_size: int,
+    ) -> None:
+        """Initialize the shared rows."""
+        self._id_column = id_column
+        self._key_column = key_column
+        self._lookup_column = lookup_column
+        self._row_from_key = row_from_key
+        self._max_size = max_size
+        self._ids: OrderedDict = OrderedDict()
+        self._pending: Dict[Any, dict] = {}
+        self._row_ids = RowIds(id_column)
+
+    def lookup(self, key: Any) -> Tuple[Optional[int], Optional[dict]]:
+        """Return the id of the shared row or the pending row to insert."""
+        shared_id = self._ids.get(key)
+        if shared_id is not None:
+            self._ids.move_to_end(key)
+            return shared_id, None
+
+        pending_row = self._pending.get(key)
+        if pending_row is None:
+            pending_row = self._pending[key] = self._row_from_key(key)
+        return None, pending_row
+
+    def insert_pending(self, session: Any) -> None:
+        """Assign ids to the pending rows, inserting the unknown ones."""
+        if not self._pending:
+            return
+
+        id_key = self._id_column.key
+        lookup_key = self._lookup_column.key
+        pending = self._pending
+        lookups = list({row[lookup_key] for row in pending.values()})
+        for row in pending.values():
+            row[id_key] = None
+
+        for idx in range(0, len(lookups), SQLITE_MAX_BIND_VARS):
+            query = session.query(self._id_column, self._key_column).filter(
+                self._lookup_column.in_(lookups[idx : idx + SQLITE_MAX_BIND_VARS])
+            )
+            for shared_id, key in query:
+                row = pending.get(key)
+                if row is not None:
+                    row[id_key] = shared_id
+
+        new_rows = [row for row in pending.values() if row[id_key] is None]
+        if not new_rows:
+            return
+
+        for shared_id, row in zip(
+            self._row_ids.reserve(session, len(new_rows)), new_rows
+        ):
+            row[id_key] = shared_id
+        session.execute(self._id_column.table.insert(), new_rows)
+
+    def commit_pending(self) -> None:
+        """Remember the ids of the pending rows once they are committed."""
+        id_key = self._id_column.key
+        for key, row in self._pending.items():
+            self._ids[key] = row[id_key]
+            self._ids.move_to_end(key)
+        while len(self._ids) > self._max_size:
+            self._ids.popitem(last=False)
+        self._pending = {}
+
+    def clear(self) -> None:
+        """Forget all known and pending rows."""
+        self._ids.clear()
+        self._pending = {}
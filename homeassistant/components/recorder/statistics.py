@@ -0,0 +1,280 @@
+"""Long-term statistics of numeric sensors."""
+from datetime import datetime, timedelta
+from itertools import groupby
+import logging
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+
+import homeassistant.util.dt as dt_util
+
+from .models import States, Statistics, process_timestamp
+from .util import session_scope
+
+_LOGGER = logging.getLogger(__name__)
+
+PERIOD_HOUR = "hour"
+PERIOD_DAY = "day"
+
+PERIODS = {PERIOD_HOUR: timedelta(hours=1), PERIOD_DAY: timedelta(days=1)}
+
+SENSOR_DOMAIN = "sensor"
+
+
+def hour_start(point_in_time: datetime) -> datetime:
+    """Return the start of the UTC hour point_in_time is in."""
+    return dt_util.as_utc(point_in_time).replace(minute=0, second=0, microsecond=0)
+
+
+def uncompiled_hours(instance, now: datetime, keep_days: int) -> List[datetime]:
+    """Return the start of the finished hours that have not been compiled yet.
+
+    Hours older than keep_days are not returned, their states may have been
+    purged already.
+    """
+    end = hour_start(now)
+    with session_scope(session=instance.get_session()) as session:
+        last_start = (
+            session.query(func.max(Statistics.start))
+            .filter(Statistics.period == PERIOD_HOUR)
+            .scalar()
+        )
+        if last_start is not None:
+            start = process_timestamp(last_start) + PERIODS[PERIOD_HOUR]
+        else:
+            first_updated = (
+                session.query(func.min(States.last_updated))
+                .filter(States.domain == SENSOR_DOMAIN)
+                .scalar()
+            )
+            if first_updated is None:
+                return []
+            start = hour_start(process_timestamp(first_updated))
+
+    start = max(start, end - timedelta(days=keep_days))
+    hours = []
+    while start < end:
+        hours.append(start)
+        start += PERIODS[PERIOD_HOUR]
+    return hours
+
+
+def compile_statistics(instance, start: datetime) -> None:
+    """Compile the statistics of the hour starting at start.
+
+    The daily statistics are compiled from the hourly ones once the last
+    hour of a UTC day has been compiled. Periods that already have
+    statistics are not compiled again.
+    """
+    end = start + PERIODS[PERIOD_HOUR]
+    try:
+        with session_scope(session=instance.get_session()) as session:
+            if not _period_compiled(session, PERIOD_HOUR, start):
+                _compile_hourly_statistics(session, start, end)
+
+            day_start = end - PERIODS[PERIOD_DAY]
+            if end.hour == 0 and not _period_compiled(session, PERIOD_DAY, day_start):
+                _compile_daily_statistics(session, day_start, end)
+    except SQLAlchemyError as err:
+        _LOGGER.warning("Error compiling statistics: %s", err)
+
+
+def _period_compiled(session, period: str, start: datetime) -> bool:
+    """Return if statistics have been compiled for the period."""
+    query = session.query(Statistics.id).filter(Statistics.period == period)
+    return query.filter(Statistics.start == start).first() is not None
+
+
+def _initial_states(session, start: datetime) -> Dict[str, Optional[float]]:
+    """Return the numeric state of each sensor when the hour started.
+
+    The states are taken from the statistics of the previous hour, so the
+    history of the sensors before it isn't read. Only when the previous hour
+    wasn't compiled, like the first time, the last state before the hour is
+    looked up in the states.
+    """
+    previous_start = start - PERIODS[PERIOD_HOUR]
+    if _period_compiled(session, PERIOD_HOUR, previous_start):
+        return dict(
+            session.query(Statistics.entity_id, Statistics.state)
+            .filter(Statistics.period == PERIOD_HOUR)
+            .filter(Statistics.start == previous_start)
+        )
+
+    last_state_ids = (
+        session.query(func.max(States.state_id))
+        .filter(States.domain == SENSOR_DOMAIN)
+        .filter(States.last_updated < start)
+        .group_by(States.entity_id)
+    )
+    return {
+        entity_id: _float_or_none(state)
+        for entity_id, state in session.query(States.entity_id, States.state).filter(
+            States.state_id.in_(last_state_ids.subquery())
+        )
+    }
+
+
+def _compile_hourly_statistics(session, start: datetime, end: datetime) -> None:
+    """Compile the statistics of each numeric sensor during the hour."""
+    initial_states = _initial_states(session, start)
+
+    query = (
+        session.query(States.entity_id, States.state, States.last_updated)
+        .filter(States.domain == SENSOR_DOMAIN)
+        .filter(States.last_updated >= start)
+        .filter(States.last_updated < end)
+        .order_by(States.entity_id, States.last_updated)
+    )
+    changes = {
+        entity_id: [(state, last_updated) for _, state, last_updated in rows]
+        for entity_id, rows in groupby(query, lambda row: row.entity_id)
+    }
+
+    rows = []
+    for entity_id in sorted(initial_states.keys() | changes.keys()):
+        statistics = _time_weighted_statistics(
+            initial_states.get(entity_id), changes.get(entity_id, []), start, end
+        )
+        if statistics is None:
+            continue
+        mean, min_, max_, state, duration = statistics
+        rows.append(
+            {
+                "entity_id": entity_id,
+                "period": PERIOD_HOUR,
+                "start": start,
+                "mean": mean,
+                "min": min_,
+                "max": max_,
+                "state": state,
+                "duration": duration,
+            }
+        )
+
+    if rows:
+        session.execute(Statistics.__table__.insert(), rows)
+    _LOGGER.debug("Compiled hourly statistics of %s sensors at %s", len(rows), start)
+
+
+def _compile_daily_statistics(session, start: datetime, end: datetime) -> None:
+    """Compile the statistics of each sensor during the day from the hourly ones.
+
+    The mean of each hour is weighted by how long the sensor had a numeric
+    state during it.
+    """
+    query = (
+        session.query(
+            Statistics.entity_id,
+            Statistics.mean,
+            Statistics.min,
+            Statistics.max,
+            Statistics.state,
+            Statistics.duration,
+        )
+        .filter(Statistics.period == PERIOD_HOUR)
+        .filter(Statistics.start >= start)
+        .filter(Statistics.start < end)
+        .order_by(Statistics.entity_id, Statistics.start)
+    )
+    rows = []
+    for entity_id, group in groupby(query, lambda row: row.entity_id):
+        hours = list(group)
+        duration = sum(hour.duration for hour in hours)
+        if duration:
+            mean = sum(hour.mean * hour.duration for hour in hours) / duration
+        else:
+            mean = sum(hour.mean for hour in hours) / len(hours)
+        rows.append(
+            {
+                "entity_id": entity_id,
+                "period": PERIOD_DAY,
+                "start": start,
+                "mean": mean,
+                "min": min(hour.min for hour in hours),
+                "max": max(hour.max for hour in hours),
+                "state": hours[-1].state,
+                "duration": duration,
+            }
+        )
+
+    if rows:
+        session.execute(Statistics.__table__.insert(), rows)
+    _LOGGER.debug("Compiled daily statistics of %s sensors at %s", len(rows), start)
+
+
+def _time_weighted_statistics(
+    initial_state: Optional[float],
+    changes: Iterable[Tuple[Optional[str], datetime]],
+    start: datetime,
+    end: datetime,
+) -> Optional[Tuple[float, float, float, Optional[float], float]]:
+    """Return the statistics of the numeric states during a period.
+
+    Returns the mean, min and max, the numeric state at the end of the period
+    and how many seconds the state was numeric. The mean is weighted by how
+    long each state lasted. Non numeric states, like unavailable, and the
+    periods an entity was removed don't count towards the statistics.
+    """
+    points = []
+    if initial_state is not None:
+        points.append((start, initial_state))
+    for state, last_updated in changes:
+        points.append((process_timestamp(last_updated), _float_or_none(state)))
+
+    values = [value for _, value in points if value is not None]
+    if not values:
+        return None
+
+    weighted_sum = 0.0
+    duration = 0.0
+    for idx, (point_start, value) in enumerate(points):
+        if value is None:
+            continue
+        point_end = points[idx + 1][0] if idx + 1 < len(points) else end
+        seconds = (point_end - point_start).total_seconds()
+        weighted_sum += value * seconds
+        duration += seconds
+
+    mean = weighted_sum / duration if duration else sum(values) / len(values)
+    return mean, min(values), max(values), points[-1][1], duration
+
+
+def _float_or_none(state: Optional[str]) -> Optional[float]:
+    """Return the state as a float or None if it is not numeric.
+
+    The state of a removed entity is None.
+    """
+    try:
+        value = float(state)  # type: ignore
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def statistics_during_period(
+    hass,
+    start_time: datetime,
+    end_time: Optional[datetime] = None,
+    entity_ids: Optional[List[str]] = None,
+    period: str = PERIOD_HOUR,
+) -> Dict[str, List[dict]]:
+    """Return the statistics of the entities during a period of time."""
+    with session_scope(hass=hass) as session:
+        query = (
+            session.query(Statistics).filter(Statistics.period == period)
+            # Include the period that start_time is in
+            .filter(Statistics.start > start_time - PERIODS[period])
+        )
+        if end_time is not None:
+            query = query.filter(Statistics.start < end_time)
+        if entity_ids is not None:
+            query = query.filter(Statistics.entity_id.in_(entity_ids))
+        query = query.order_by(Statistics.entity_id, Statistics.start)
+
+        return {
+            entity_id: [statistics.to_dict() for statistics in rows]
+            for entity_id, rows in groupby(query, lambda row: row.entity_id)
+        }
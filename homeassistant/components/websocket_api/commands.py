@@ -14,7 +14,12 @@ from homeassistant.exceptions import (
     Unauthorized,
 )
 from homeassistant.helpers import config_validation as cv, entity
-from homeassistant.helpers.event import TrackTemplate, async_track_template_result
+from homeassistant.helpers.event import (
+    TrackStates,
+    TrackTemplate,
+    async_track_state_change_filtered,
+    async_track_template_result,
+)
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.helpers.template import Template
 from homeassistant.loader import IntegrationNotFound, async_get_integration
@@ -29,6 +34,7 @@ def async_register_commands(hass, async_reg):
     """Register commands."""
     async_reg(hass, handle_subscribe_events)
     async_reg(hass, handle_unsubscribe_events)
+    async_reg(hass, handle_subscribe_entities)
     async_reg(hass, handle_call_service)
     async_reg(hass, handle_get_states)
     async_reg(hass, handle_get_services)
@@ -116,6 +122,78 @@ def handle_unsubscribe_events(hass, connection, msg):
         )
 
 
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "subscribe_entities",
+        vol.Optional("entity_ids"): cv.entity_ids,
+        vol.Optional("domains"): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+def handle_subscribe_entities(hass, connection, msg):
+    """Handle subscribe entities command.
+
+    Sends the compressed states of the entities once, after that only
+    what changed in each state. Without entity_ids and domains all
+    entities are subscribed to.
+    """
+    entity_ids = msg.get("entity_ids")
+    domains = msg.get("domains")
+    last_event = None
+
+    @callback
+    def forward_entity_changes(event):
+        """Forward the state changes of entities to websocket."""
+        nonlocal last_event
+        # A new entity may be matched by both its entity_id and its domain
+        if event is last_event:
+            return
+        last_event = event
+
+        if not connection.user.permissions.check_entity(
+            event.data["entity_id"], POLICY_READ
+        ):
+            return
+
+        connection.send_message(messages.cached_state_diff_message(msg["id"], event))
+
+    states = _async_get_allowed_states(hass, connection)
+
+    if entity_ids is None and domains is None:
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, forward_entity_changes
+        )
+    else:
+        tracked_domains = set(domains or ())
+        tracked_entities = set(entity_ids or ())
+        if tracked_domains:
+            tracked_entities.update(hass.states.async_entity_ids(tracked_domains))
+
+        @callback
+        def forward_tracked_entity_changes(event):
+            """Forward the changes and track entities added to the domains."""
+            entity_id = event.data["entity_id"]
+            if entity_id not in tracked_entities:
+                tracked_entities.add(entity_id)
+                tracker.async_update_listeners(
+                    TrackStates(False, set(tracked_entities), tracked_domains)
+                )
+            forward_entity_changes(event)
+
+        tracker = async_track_state_change_filtered(
+            hass,
+            TrackStates(False, set(tracked_entities), tracked_domains),
+            forward_tracked_entity_changes,
+        )
+        connection.subscriptions[msg["id"]] = tracker.async_remove
+        states = [state for state in states if state.entity_id in tracked_entities]
+
+    connection.send_message(messages.result_message(msg["id"]))
+    connection.send_message(
+        messages.message_to_json(messages.entities_snapshot_message(msg["id"], states))
+    )
+
+
 @decorators.websocket_command(
     {
         vol.Required("type"): "call_service",
@@ -172,17 +250,23 @@ async def handle_call_service(hass, connection, msg):
 @decorators.websocket_command({vol.Required("type"): "get_states"})
 def handle_get_states(hass, connection, msg):
     """Handle get states command."""
+    connection.send_message(
+        messages.result_message(msg["id"], _async_get_allowed_states(hass, connection))
+    )
+
+
+@callback
+def _async_get_allowed_states(hass, connection):
+    """Return the states the user of the connection may read."""
     if connection.user.permissions.access_all_entities("read"):
-        states = hass.states.async_all()
-    else:
-        entity_perm = connection.user.permissions.check_entity
-        states = [
-            state
-            for state in hass.states.async_all()
-            if entity_perm(state.entity_id, "read")
-        ]
+        return hass.states.async_all()
 
-    connection.send_message(messages.result_message(msg["id"], states))
+    entity_perm = connection.user.permissions.check_entity
+    return [
+        state
+        for state in hass.states.async_all()
+        if entity_perm(state.entity_id, "read")
+    ]
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -2,11 +2,11 @@
 
 from functools import lru_cache
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import voluptuous as vol
 
-from homeassistant.core import Event
+from homeassistant.core import Event, State
 from homeassistant.helpers import config_validation as cv
 from homeassistant.util.json import (
     find_paths_unserializable_data,
@@ -31,6 +31,20 @@ BASE_COMMAND_MESSAGE_SCHEMA = vol.Schema({vol.Required("id"): cv.positive_int})
 IDEN_TEMPLATE = "__IDEN__"
 IDEN_JSON_TEMPLATE = '"__IDEN__"'
 
+# Keys of the entity messages of subscribe_entities
+ENTITY_EVENT_ADD = "a"
+ENTITY_EVENT_REMOVE = "r"
+ENTITY_EVENT_CHANGE = "c"
+ENTITY_DIFF_ADDITIONS = "+"
+ENTITY_DIFF_REMOVALS = "-"
+
+# Keys of compressed states
+COMPRESSED_STATE_STATE = "s"
+COMPRESSED_STATE_ATTRIBUTES = "a"
+COMPRESSED_STATE_CONTEXT = "c"
+COMPRESSED_STATE_LAST_CHANGED = "lc"
+COMPRESSED_STATE_LAST_UPDATED = "lu"
+
 
 def result_message(iden: int, result: Any = None) -> Dict:
     """Return a success result message."""
@@ -74,6 +88,106 @@ def _cached_event_message(event: Event) -> str:
     return message_to_json(event_message(IDEN_TEMPLATE, event))
 
 
+def compressed_state_dict(state: State) -> Dict[str, Any]:
+    """Return a compact dict of a state.
+
+    The last updated time is left out when it is the same as
+    the last changed time.
+    """
+    compressed = {
+        COMPRESSED_STATE_STATE: state.state,
+        COMPRESSED_STATE_ATTRIBUTES: dict(state.attributes),
+        COMPRESSED_STATE_CONTEXT: state.context.id,
+        COMPRESSED_STATE_LAST_CHANGED: state.last_changed.timestamp(),
+    }
+    if state.last_updated != state.last_changed:
+        compressed[COMPRESSED_STATE_LAST_UPDATED] = state.last_updated.timestamp()
+    return compressed
+
+
+def entities_snapshot_message(iden: int, states: Any) -> Dict:
+    """Return an entity message adding the states of all entities."""
+    return event_message(
+        iden,
+        {
+            ENTITY_EVENT_ADD: {
+                state.entity_id: compressed_state_dict(state) for state in states
+            }
+        },
+    )
+
+
+def cached_state_diff_message(iden: int, event: Event) -> str:
+    """Return an entity message with the changes of a state_changed event.
+
+    Serialize to json once per message.
+
+    The diff is computed once per event, no matter how many
+    connections are subscribed to the entities.
+    """
+    return _cached_state_diff_message(event).replace(IDEN_JSON_TEMPLATE, str(iden), 1)
+
+
+@lru_cache(maxsize=128)
+def _cached_state_diff_message(event: Event) -> str:
+    """Cache and serialize the state diff of the event to json.
+
+    The IDEN_TEMPLATE is used which will be replaced
+    with the actual iden in cached_state_diff_message
+    """
+    return message_to_json(event_message(IDEN_TEMPLATE, _state_diff_event(event)))
+
+
+def _state_diff_event(event: Event) -> Dict:
+    """Return the entity message data of a state_changed event."""
+    entity_id = event.data["entity_id"]
+    new_state: Optional[State] = event.data["new_state"]
+    old_state: Optional[State] = event.data["old_state"]
+    if new_state is None:
+        return {ENTITY_EVENT_REMOVE: [entity_id]}
+    if old_state is None:
+        return {ENTITY_EVENT_ADD: {entity_id: compressed_state_dict(new_state)}}
+    return {
+        ENTITY_EVENT_CHANGE: {entity_id: _state_diff(old_state, new_state)}
+    }
+
+
+def _state_diff(old_state: State, new_state: State) -> Dict[str, Any]:
+    """Return the changes between two states of an entity.
+
+    A changed last changed time also means the last updated
+    time is the same as the last changed time. The attributes
+    are only compared when they aren't shared by both states.
+    """
+    additions: Dict[str, Any] = {}
+    diff = {ENTITY_DIFF_ADDITIONS: additions}
+    if old_state.state != new_state.state:
+        additions[COMPRESSED_STATE_STATE] = new_state.state
+    if old_state.last_changed != new_state.last_changed:
+        additions[COMPRESSED_STATE_LAST_CHANGED] = new_state.last_changed.timestamp()
+    elif old_state.last_updated != new_state.last_updated:
+        additions[COMPRESSED_STATE_LAST_UPDATED] = new_state.last_updated.timestamp()
+    if old_state.context.id != new_state.context.id:
+        additions[COMPRESSED_STATE_CONTEXT] = new_state.context.id
+
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+    if old_attributes is new_attributes:
+        return diff
+
+    changed_attributes = {
+        key: value
+        for key, value in new_attributes.items()
+        if key not in old_attributes or old_attributes[key] != value
+    }
+    if changed_attributes:
+        additions[COMPRESSED_STATE_ATTRIBUTES] = changed_attributes
+    removed_attributes = [key for key in old_attributes if key not in new_attributes]
+    if removed_attributes:
+        diff[ENTITY_DIFF_REMOVALS] = {COMPRESSED_STATE_ATTRIBUTES: removed_attributes}
+    return diff
+
+
 def message_to_json(message: Any) -> str:
     """Serialize a websocket message to json."""
     try:
@@ -1,4 +1,5 @@
 """Module to help with parsing and generating configuration files."""
+import asyncio
 from collections import OrderedDict
 from distutils.version import LooseVersion  # pylint: disable=import-error
 import logging
@@ -6,7 +7,7 @@ import os
 import re
 import shutil
 from types import ModuleType
-from typing import Any, Callable, Dict, Optional, Sequence, Set, Tuple, Union
+from typing import Any, Callable, Dict, Optional, Sequence, Set, Tuple, Union, cast
 
 import voluptuous as vol
 from voluptuous.humanize import humanize_error
@@ -58,7 +59,7 @@ from homeassistant.requirements import (
 )
 from homeassistant.util.package import is_docker_env
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM
-from homeassistant.util.yaml import SECRET_YAML, load_yaml
+from homeassistant.util.yaml import SECRET_YAML, load_yaml, load_yaml_cached
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -69,6 +70,9 @@ YAML_CONFIG_FILE = "configuration.yaml"
 VERSION_FILE = ".HA_VERSION"
 CONFIG_DIR_NAME = ".homeassistant"
 DATA_CUSTOMIZE = "hass_customize"
+# If set, configuration.yaml is loaded through a cache of the parsed YAML
+DATA_YAML_CACHE = "yaml_config_cache"
+YAML_CACHE_FILE = ".storage/core.yaml_cache"
 
 GROUP_CONFIG_PATH = "groups.yaml"
 AUTOMATION_CONFIG_PATH = "automations.yaml"
@@ -310,23 +314,34 @@ async def async_hass_config_yaml(hass: HomeAssistant) -> Dict:
     This function allow a component inside the asyncio loop to reload its
     configuration by itself. Include package merge.
     """
+    cache_path = (
+        hass.config.path(YAML_CACHE_FILE) if hass.data.get(DATA_YAML_CACHE) else None
+    )
     # Not using async_add_executor_job because this is an internal method.
     config = await hass.loop.run_in_executor(
-        None, load_yaml_config_file, hass.config.path(YAML_CONFIG_FILE)
+        None, load_yaml_config_file, hass.config.path(YAML_CONFIG_FILE), cache_path
     )
     core_config = config.get(CONF_CORE, {})
     await merge_packages_config(hass, config, core_config.get(CONF_PACKAGES, {}))
     return config
 
 
-def load_yaml_config_file(config_path: str) -> Dict[Any, Any]:
+def load_yaml_config_file(
+    config_path: str, cache_path: Optional[str] = None
+) -> Dict[Any, Any]:
     """Parse a YAML configuration file.
 
+    If cache_path is passed, the parsed YAML is cached there until one of
+    the files it was loaded from changes.
+
     Raises FileNotFoundError or HomeAssistantError.
 
     This method needs to run in an executor.
     """
-    conf_dict = load_yaml(config_path)
+    if cache_path is None:
+        conf_dict = load_yaml(config_path)
+    else:
+        conf_dict = load_yaml_cached(config_path, cache_path)
 
     if not isinstance(conf_dict, dict):
         msg = (
@@ -775,10 +790,13 @@ async def async_process_component_config(
             _LOGGER.exception("Unknown error calling %s config validator", domain)
             return None
 
-    # No custom config validator, proceed with schema validation
+    # No custom config validator, proceed with schema validation. Schemas
+    # don't need the event loop so they are run in the executor.
     if hasattr(component, "CONFIG_SCHEMA"):
         try:
-            return component.CONFIG_SCHEMA(config)  # type: ignore
+            return await hass.async_add_executor_job(
+                component.CONFIG_SCHEMA, config  # type: ignore
+            )
         except vol.Invalid as ex:
             async_log_exception(ex, domain, config, hass, integration.documentation)
             return None
@@ -793,45 +811,50 @@ async def async_process_component_config(
     if component_platform_schema is None:
         return config
 
-    platforms = []
-    for p_name, p_config in config_per_platform(config, domain):
+    async def _async_validate_platform(
+        p_name: Optional[str], p_config: Dict
+    ) -> Optional[Dict]:
+        """Validate the config of a platform, None if it is invalid."""
         # Validate component specific platform schema
         try:
-            p_validated = component_platform_schema(p_config)
+            p_validated = await hass.async_add_executor_job(
+                component_platform_schema, p_config
+            )
         except vol.Invalid as ex:
             async_log_exception(ex, domain, p_config, hass, integration.documentation)
-            continue
+            return None
         except Exception:  # pylint: disable=broad-except
             _LOGGER.exception(
                 "Unknown error validating %s platform config with %s component platform schema",
                 p_name,
                 domain,
             )
-            continue
+            return None
 
         # Not all platform components follow same pattern for platforms
         # So if p_name is None we are not going to validate platform
         # (the automation component is one of them)
         if p_name is None:
-            platforms.append(p_validated)
-            continue
+            return cast(Dict, p_validated)
 
         try:
             p_integration = await async_get_integration_with_requirements(hass, p_name)
         except (RequirementsNotFound, IntegrationNotFound) as ex:
             _LOGGER.error("Platform error: %s - %s", domain, ex)
-            continue
+            return None
 
         try:
             platform = p_integration.get_platform(domain)
         except ImportError:
             _LOGGER.exception("Platform error: %s", domain)
-            continue
+            return None
 
         # Validate platform specific schema
         if hasattr(platform, "PLATFORM_SCHEMA"):
             try:
-                p_validated = platform.PLATFORM_SCHEMA(p_config)  # type: ignore
+                p_validated = await hass.async_add_executor_job(
+                    platform.PLATFORM_SCHEMA, p_config  # type: ignore
+                )
             except vol.Invalid as ex:
                 async_log_exception(
                     ex,
@@ -840,16 +863,25 @@ async def async_process_component_config(
                     hass,
                     p_integration.documentation,
                 )
-                continue
+                return None
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception(
                     "Unknown error validating config for %s platform for %s component with PLATFORM_SCHEMA",
                     p_name,
                     domain,
                 )
-                continue
+                return None
+
+        return cast(Dict, p_validated)
 
-        platforms.append(p_validated)
+    # The platforms are independent of each other, validate them concurrently
+    results = await asyncio.gather(
+        *(
+            _async_validate_platform(p_name, p_config)
+            for p_name, p_config in config_per_platform(config, domain)
+        )
+    )
+    platforms = [p_validated for p_validated in results if p_validated is not None]
 
     # Create a copy of the configuration with all config for current
     # component removed and add validated config back in.
@@ -5,6 +5,7 @@ Home Assistant is a Home Automation framework for observing the state
 of entities and react to changes.
 """
 import asyncio
+from contextlib import contextmanager
 import datetime
 import enum
 import functools
@@ -24,11 +25,13 @@ from typing import (
     Collection,
     Coroutine,
     Dict,
+    Generator,
     Iterable,
     List,
     Mapping,
     Optional,
     Set,
+    Tuple,
     TypeVar,
     Union,
     cast,
@@ -41,6 +44,7 @@ import yarl
 from homeassistant import block_async_io, loader, util
 from homeassistant.const import (
     ATTR_DOMAIN,
+    ATTR_ENTITY_ID,
     ATTR_FRIENDLY_NAME,
     ATTR_NOW,
     ATTR_SECONDS,
@@ -645,12 +649,56 @@ class Event:
         )
 
 
+_FilterableJob = Tuple[HassJob, Optional[Callable[[Event], bool]]]
+
+
+class _IndexedListeners:
+    """Listeners of an event type indexed by the entity_id in the event data."""
+
+    __slots__ = ("entity_ids", "domains", "count")
+
+    def __init__(self) -> None:
+        """Initialize the indexed listeners."""
+        self.entity_ids: Dict[str, List[_FilterableJob]] = {}
+        self.domains: Dict[str, List[_FilterableJob]] = {}
+        self.count = 0
+
+    def add(
+        self, filterable_job: _FilterableJob, entity_ids: Set[str], domains: Set[str]
+    ) -> None:
+        """Add a listener for events of the entity_ids and domains."""
+        for key, index in ((entity_ids, self.entity_ids), (domains, self.domains)):
+            for item in key:
+                index.setdefault(item, []).append(filterable_job)
+        self.count += 1
+
+    def remove(
+        self, filterable_job: _FilterableJob, entity_ids: Set[str], domains: Set[str]
+    ) -> None:
+        """Remove a listener for events of the entity_ids and domains."""
+        for key, index in ((entity_ids, self.entity_ids), (domains, self.domains)):
+            for item in key:
+                index[item].remove(filterable_job)
+                if not index[item]:
+                    del index[item]
+        self.count -= 1
+
+    def match(self, entity_id: str) -> List[_FilterableJob]:
+        """Return the listeners for events of an entity_id."""
+        matches = self.entity_ids.get(entity_id, [])
+        domain_matches = self.domains.get(entity_id.partition(".")[0])
+        if domain_matches is not None:
+            matches = matches + domain_matches
+        return matches
+
+
 class EventBus:
     """Allow the firing of and listening for events."""
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
-        self._listeners: Dict[str, List[HassJob]] = {}
+        self._listeners: Dict[str, List[_FilterableJob]] = {}
+        self._indexed_listeners: Dict[str, _IndexedListeners] = {}
         self._hass = hass
 
     @callback
@@ -659,7 +707,10 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(self._listeners[key]) for key in self._listeners}
+        listeners = {key: len(self._listeners[key]) for key in self._listeners}
+        for key, indexed in self._indexed_listeners.items():
+            listeners[key] = listeners.get(key, 0) + indexed.count
+        return listeners
 
     @property
     def listeners(self) -> Dict[str, int]:
@@ -691,14 +742,63 @@ class EventBus:
 
         This method must be run in the event loop.
         """
+        self._async_dispatch(
+            Event(event_type, event_data, origin, time_fired, context),
+            self._async_type_listeners(event_type),
+        )
+
+    @callback
+    def _async_fire_batch(self, event_type: str, events: List[Event]) -> None:
+        """Fire events of the same type, looking up their listeners once.
+
+        Callback listeners are scheduled once with all the events they match,
+        each listener still receives the events one by one and in order.
+
+        This method must be run in the event loop.
+        """
+        listeners = self._async_type_listeners(event_type)
+        batched: Dict[HassJob, List[Event]] = {}
+        for event in events:
+            self._async_dispatch(event, listeners, batched)
+
+        for job, job_events in batched.items():
+            self._hass.loop.call_soon(_run_callback_batch, job, job_events)
+
+    @callback
+    def _async_type_listeners(self, event_type: str) -> List[_FilterableJob]:
+        """Return the listeners of an event type that are not indexed."""
         listeners = self._listeners.get(event_type, [])
 
         # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
         match_all_listeners = self._listeners.get(MATCH_ALL)
         if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
             listeners = match_all_listeners + listeners
+        return listeners
+
+    @callback
+    def _async_dispatch(
+        self,
+        event: Event,
+        listeners: List[_FilterableJob],
+        batched: Optional[Dict[HassJob, List[Event]]] = None,
+    ) -> None:
+        """Schedule the listeners that match the event.
 
-        event = Event(event_type, event_data, origin, time_fired, context)
+        Listeners filtered by entity_ids or domains are scheduled after the
+        unfiltered ones, see async_listen.
+
+        If batched is passed, callback listeners are collected in it instead.
+        """
+        event_type = event.event_type
+        if self._indexed_listeners:
+            entity_id = event.data.get(ATTR_ENTITY_ID)
+            if isinstance(entity_id, str):
+                for key in (MATCH_ALL, event_type):
+                    if key == MATCH_ALL and event_type == EVENT_HOMEASSISTANT_CLOSE:
+                        continue
+                    indexed = self._indexed_listeners.get(key)
+                    if indexed is not None:
+                        listeners = listeners + indexed.match(entity_id)
 
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.debug("Bus:Handling %s", event)
@@ -706,17 +806,43 @@ class EventBus:
         if not listeners:
             return
 
-        for job in listeners:
-            self._hass.async_add_hass_job(job, event)
+        for job, event_filter in listeners:
+            if event_filter is not None:
+                try:
+                    if not event_filter(event):
+                        continue
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error in event filter")
+                    continue
+            if batched is not None and job.job_type == HassJobType.Callback:
+                batched.setdefault(job, []).append(event)
+            else:
+                self._hass.async_add_hass_job(job, event)
 
-    def listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
+    def listen(
+        self,
+        event_type: str,
+        listener: Callable,
+        event_filter: Optional[Callable[[Event], bool]] = None,
+        *,
+        entity_ids: Optional[Iterable[str]] = None,
+        domains: Optional[Iterable[str]] = None,
+    ) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
         To listen to all events specify the constant ``MATCH_ALL``
         as event_type.
         """
         async_remove_listener = run_callback_threadsafe(
-            self._hass.loop, self.async_listen, event_type, listener
+            self._hass.loop,
+            functools.partial(
+                self.async_listen,
+                event_type,
+                listener,
+                event_filter,
+                entity_ids=entity_ids,
+                domains=domains,
+            ),
         ).result()
 
         def remove_listener() -> None:
@@ -726,23 +852,70 @@ class EventBus:
         return remove_listener
 
     @callback
-    def async_listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
+    def async_listen(
+        self,
+        event_type: str,
+        listener: Callable,
+        event_filter: Optional[Callable[[Event], bool]] = None,
+        *,
+        entity_ids: Optional[Iterable[str]] = None,
+        domains: Optional[Iterable[str]] = None,
+    ) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
         To listen to all events specify the constant ``MATCH_ALL``
         as event_type.
 
+        The listener is only scheduled for events that pass the filters.
+        Events can be filtered on the entity_id in their data by passing
+        entity_ids or domains. These listeners are indexed, so events of
+        other entities don't need to look at them. The event_filter is a
+        callback that is called with the event before the listener is
+        scheduled, it should be fast and must not do I/O.
+
+        Listeners are scheduled in the order they were registered, except
+        that listeners filtered by entity_ids or domains are scheduled after
+        all unfiltered listeners of the event. Among those, listeners matched
+        by entity_id come before the ones matched by domain.
+
         This method must be run in the event loop.
         """
-        return self._async_listen_job(event_type, HassJob(listener))
+        filterable_job = (HassJob(listener), event_filter)
+        if entity_ids is None and domains is None:
+            return self._async_listen_filterable_job(event_type, filterable_job)
+
+        domain_set = {domain.lower() for domain in domains or ()}
+        # Entities of a filtered domain are matched by the domain index
+        entity_id_set = {
+            entity_id.lower()
+            for entity_id in entity_ids or ()
+            if entity_id.lower().partition(".")[0] not in domain_set
+        }
+        indexed = self._indexed_listeners.setdefault(event_type, _IndexedListeners())
+        indexed.add(filterable_job, entity_id_set, domain_set)
+
+        def remove_listener() -> None:
+            """Remove the listener."""
+            nonlocal indexed
+            if indexed is None:
+                _LOGGER.error("Unable to remove unknown job listener %s", listener)
+                return
+            indexed.remove(filterable_job, entity_id_set, domain_set)
+            if not indexed.count:
+                self._indexed_listeners.pop(event_type)
+            indexed = None
+
+        return remove_listener
 
     @callback
-    def _async_listen_job(self, event_type: str, hassjob: HassJob) -> CALLBACK_TYPE:
-        self._listeners.setdefault(event_type, []).append(hassjob)
+    def _async_listen_filterable_job(
+        self, event_type: str, filterable_job: _FilterableJob
+    ) -> CALLBACK_TYPE:
+        self._listeners.setdefault(event_type, []).append(filterable_job)
 
         def remove_listener() -> None:
             """Remove the listener."""
-            self._async_remove_listener(event_type, hassjob)
+            self._async_remove_listener(event_type, filterable_job)
 
         return remove_listener
 
@@ -775,12 +948,12 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        job: Optional[HassJob] = None
+        filterable_job: Optional[_FilterableJob] = None
 
         @callback
         def _onetime_listener(event: Event) -> None:
             """Remove listener from event bus and then fire listener."""
-            nonlocal job
+            nonlocal filterable_job
             if hasattr(_onetime_listener, "run"):
                 return
             # Set variable so that we will never run twice.
@@ -789,22 +962,24 @@ class EventBus:
             # multiple times as well.
             # This will make sure the second time it does nothing.
             setattr(_onetime_listener, "run", True)
-            assert job is not None
-            self._async_remove_listener(event_type, job)
+            assert filterable_job is not None
+            self._async_remove_listener(event_type, filterable_job)
             self._hass.async_run_job(listener, event)
 
-        job = HassJob(_onetime_listener)
+        filterable_job = (HassJob(_onetime_listener), None)
 
-        return self._async_listen_job(event_type, job)
+        return self._async_listen_filterable_job(event_type, filterable_job)
 
     @callback
-    def _async_remove_listener(self, event_type: str, hassjob: HassJob) -> None:
+    def _async_remove_listener(
+        self, event_type: str, filterable_job: _FilterableJob
+    ) -> None:
         """Remove a listener of a specific event_type.
 
         This method must be run in the event loop.
         """
         try:
-            self._listeners[event_type].remove(hassjob)
+            self._listeners[event_type].remove(filterable_job)
 
             # delete event_type list if empty
             if not self._listeners[event_type]:
@@ -812,7 +987,9 @@ class EventBus:
         except (KeyError, ValueError):
             # KeyError is key event_type listener did not exist
             # ValueError if listener did not exist within event_type
-            _LOGGER.exception("Unable to remove unknown job listener %s", hassjob)
+            _LOGGER.exception(
+                "Unable to remove unknown job listener %s", filterable_job
+            )
 
 
 class State:
@@ -874,6 +1051,41 @@ class State:
         self.domain, self.object_id = split_entity_id(self.entity_id)
         self._as_dict: Optional[Dict[str, Collection[Any]]] = None
 
+    def _evolve(
+        self,
+        state: str,
+        attributes: Mapping[str, Any],
+        last_changed: Optional[datetime.datetime],
+        last_updated: datetime.datetime,
+        context: Context,
+    ) -> "State":
+        """Return a new state of the same entity.
+
+        The entity_id, domain and object_id are taken from this state without
+        validating or splitting them again. The attributes are reused when
+        they are the attributes of this state.
+        """
+        if not valid_state(state):
+            raise InvalidStateError(
+                f"Invalid state encountered for entity ID: {self.entity_id}. "
+                "State max length is 255 characters."
+            )
+
+        new = State.__new__(State)
+        new.entity_id = self.entity_id
+        new.state = state
+        if attributes is self.attributes:
+            new.attributes = self.attributes
+        else:
+            new.attributes = MappingProxyType(attributes)
+        new.last_updated = last_updated
+        new.last_changed = last_changed or last_updated
+        new.context = context
+        new.domain = self.domain
+        new.object_id = self.object_id
+        new._as_dict = None  # pylint: disable=protected-access
+        return new
+
     @property
     def name(self) -> str:
         """Name of this state."""
@@ -966,6 +1178,7 @@ class StateMachine:
         """Initialize state machine."""
         self._states: Dict[str, State] = {}
         self._reservations: Set[str] = set()
+        self._batch: Optional[List[Event]] = None
         self._bus = bus
         self._loop = loop
 
@@ -1079,11 +1292,13 @@ class StateMachine:
         if old_state is None:
             return False
 
-        self._bus.async_fire(
-            EVENT_STATE_CHANGED,
-            {"entity_id": entity_id, "old_state": old_state, "new_state": None},
-            EventOrigin.local,
-            context=context,
+        self._async_fire_state_changed(
+            {
+                "entity_id": entity_id,
+                "old_state": old_state,
+                "new_state": None,
+            },
+            context,
         )
         return True
 
@@ -1149,7 +1364,8 @@ class StateMachine:
         Attributes is an optional dict to specify attributes of this state.
 
         If you just update the attributes and not the state, last changed will
-        not be affected.
+        not be affected. Unchanged attributes are shared with the old state,
+        so listeners can skip comparing them.
 
         This method must be run in the event loop.
         """
@@ -1163,7 +1379,7 @@ class StateMachine:
             last_changed = None
         else:
             same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == MappingProxyType(attributes)
+            same_attr = old_state.attributes == attributes
             last_changed = old_state.last_changed if same_state else None
 
         if same_state and same_attr:
@@ -1174,23 +1390,92 @@ class StateMachine:
 
         now = dt_util.utcnow()
 
-        state = State(
-            entity_id,
-            new_state,
-            attributes,
-            last_changed,
-            now,
-            context,
-            old_state is None,
-        )
+        if old_state is None:
+            state = State(
+                entity_id, new_state, attributes, last_changed, now, context, True
+            )
+            event_data = {
+                "entity_id": entity_id,
+                "old_state": None,
+                "new_state": state,
+            }
+        else:
+            if same_attr:
+                # Share the immutable attributes with the old state
+                attributes = old_state.attributes
+            state = old_state._evolve(  # pylint: disable=protected-access
+                new_state, attributes, last_changed, now, context
+            )
+            event_data = {
+                "entity_id": entity_id,
+                "old_state": old_state,
+                "new_state": state,
+            }
+
         self._states[entity_id] = state
-        self._bus.async_fire(
-            EVENT_STATE_CHANGED,
-            {"entity_id": entity_id, "old_state": old_state, "new_state": state},
-            EventOrigin.local,
-            context,
-            time_fired=now,
-        )
+        self._async_fire_state_changed(event_data, context, now)
+
+    @contextmanager
+    def async_batch(self) -> Generator[None, None, None]:
+        """Fire the state changes of a block of writes together.
+
+        States are set and removed right away, but their state_changed events
+        are fired in order when the block exits. Bursts of writes, like the
+        ones of push based integrations, then only look up the listeners of
+        state_changed once.
+
+        This method must be run in the event loop.
+        """
+        if self._batch is not None:
+            yield
+            return
+
+        batch: List[Event] = []
+        self._batch = batch
+        try:
+            yield
+        finally:
+            self._batch = None
+            if batch:
+                self._bus._async_fire_batch(  # pylint: disable=protected-access
+                    EVENT_STATE_CHANGED, batch
+                )
+
+    @callback
+    def _async_fire_state_changed(
+        self,
+        event_data: Dict[str, Any],
+        context: Optional[Context],
+        time_fired: Optional[datetime.datetime] = None,
+    ) -> None:
+        """Fire a state_changed event or add it to the current batch."""
+        if self._batch is None:
+            self._bus.async_fire(
+                EVENT_STATE_CHANGED,
+                event_data,
+                EventOrigin.local,
+                context,
+                time_fired=time_fired,
+            )
+        else:
+            self._batch.append(
+                Event(
+                    EVENT_STATE_CHANGED,
+                    event_data,
+                    EventOrigin.local,
+                    time_fired,
+                    context,
+                )
+            )
+
+
+def _run_callback_batch(job: HassJob, events: List[Event]) -> None:
+    """Run a callback listener for each of a batch of events."""
+    for event in events:
+        try:
+            job.target(event)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error running listener %s for %s", job.target, event)
 
 
 class Service:
@@ -1503,6 +1788,9 @@ class Config:
         # If True, pip install is skipped for requirements on startup
         self.skip_pip: bool = False
 
+        # If True, integrations are imported in the executor ahead of setup
+        self.preimport_integrations: bool = False
+
         # List of loaded components
         self.components: Set[str] = set()
 
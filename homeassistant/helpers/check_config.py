@@ -1,8 +1,10 @@
 """Helper to check the configuration file."""
+import asyncio
 from collections import OrderedDict
 import logging
 import os
-from typing import List, NamedTuple, Optional
+from timeit import default_timer as timer
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, cast
 
 import voluptuous as vol
 
@@ -14,7 +16,6 @@ from homeassistant.config import (
     YAML_CONFIG_FILE,
     _format_config_error,
     config_per_platform,
-    extract_domain_configs,
     load_yaml_config_file,
     merge_packages_config,
 )
@@ -43,6 +44,8 @@ class HomeAssistantConfig(OrderedDict):
         """Initialize HA config."""
         super().__init__()
         self.errors: List[CheckConfigError] = []
+        # Seconds it took to validate the config of each integration
+        self.validation_times: Dict[str, float] = {}
 
     def add_error(
         self,
@@ -76,10 +79,6 @@ async def async_check_ha_config_file(hass: HomeAssistant) -> HomeAssistantConfig
         pack_config = core_config[CONF_PACKAGES].get(package, config)
         result.add_error(message, domain, pack_config)
 
-    def _comp_error(ex: Exception, domain: str, config: ConfigType) -> None:
-        """Handle errors from components: async_log_exception."""
-        result.add_error(_format_config_error(ex, domain, config)[0], domain, config)
-
     # Load configuration.yaml
     config_path = hass.config.path(YAML_CONFIG_FILE)
     try:
@@ -111,117 +110,193 @@ async def async_check_ha_config_file(hass: HomeAssistant) -> HomeAssistantConfig
     # Filter out repeating config sections
     components = {key.split(" ")[0] for key in config.keys()}
 
-    # Process and validate config
-    for domain in components:
-        try:
-            integration = await async_get_integration_with_requirements(hass, domain)
-        except (RequirementsNotFound, loader.IntegrationNotFound) as ex:
-            result.add_error(f"Component error: {domain} - {ex}")
-            continue
+    # Validate the integrations concurrently, each into its own result
+    domain_results = {domain: HomeAssistantConfig() for domain in components}
+    await asyncio.gather(
+        *(
+            _async_check_domain(hass, domain, config, domain_result)
+            for domain, domain_result in domain_results.items()
+        )
+    )
+    for domain, domain_result in domain_results.items():
+        result.update(domain_result)
+        result.errors.extend(domain_result.errors)
+        result.validation_times.update(domain_result.validation_times)
 
-        try:
-            component = integration.get_component()
-        except ImportError as ex:
-            result.add_error(f"Component error: {domain} - {ex}")
-            continue
+    return result
 
-        # Check if the integration has a custom config validator
-        config_validator = None
+
+async def _async_check_domain(
+    hass: HomeAssistant, domain: str, config: ConfigType, result: HomeAssistantConfig
+) -> None:
+    """Validate the config of an integration."""
+    result.validation_times[domain] = 0.0
+    await _async_validate_domain(hass, domain, config, result)
+
+
+async def _async_run_schema(
+    hass: HomeAssistant,
+    result: HomeAssistantConfig,
+    domain: str,
+    schema: Callable[[Any], Any],
+    config: Any,
+) -> Any:
+    """Run a schema in the executor and add the time it took to the domain.
+
+    Waiting for the executor doesn't count, so the integrations validated
+    at the same time don't slow each other down in the report.
+    """
+    durations: List[float] = []
+
+    def _run_schema() -> Any:
+        """Run the schema and measure how long it took."""
+        start = timer()
         try:
-            config_validator = integration.get_platform("config")
-        except ImportError as err:
-            # Filter out import error of the config platform.
-            # If the config platform contains bad imports, make sure
-            # that still fails.
-            if err.name != f"{integration.pkg_path}.config":
-                result.add_error(f"Error importing config platform {domain}: {err}")
-                continue
-
-        if config_validator is not None and hasattr(
-            config_validator, "async_validate_config"
-        ):
-            try:
-                result[domain] = (
-                    await config_validator.async_validate_config(  # type: ignore
-                        hass, config
-                    )
-                )[domain]
-                continue
-            except (vol.Invalid, HomeAssistantError) as ex:
-                _comp_error(ex, domain, config)
-                continue
-            except Exception as err:  # pylint: disable=broad-except
-                logging.getLogger(__name__).exception(
-                    "Unexpected error validating config"
-                )
-                result.add_error(
-                    f"Unexpected error calling config validator: {err}",
-                    domain,
-                    config.get(domain),
-                )
-                continue
+            return schema(config)
+        finally:
+            durations.append(timer() - start)
 
-        config_schema = getattr(component, "CONFIG_SCHEMA", None)
-        if config_schema is not None:
-            try:
-                config = config_schema(config)
-                result[domain] = config[domain]
-            except vol.Invalid as ex:
-                _comp_error(ex, domain, config)
-                continue
+    try:
+        return await hass.async_add_executor_job(_run_schema)
+    finally:
+        result.validation_times[domain] += sum(durations)
 
-        component_platform_schema = getattr(
-            component,
-            "PLATFORM_SCHEMA_BASE",
-            getattr(component, "PLATFORM_SCHEMA", None),
-        )
 
-        if component_platform_schema is None:
-            continue
+def _comp_error(
+    result: HomeAssistantConfig, ex: Exception, domain: str, config: ConfigType
+) -> None:
+    """Handle errors from components: async_log_exception."""
+    result.add_error(_format_config_error(ex, domain, config)[0], domain, config)
 
-        platforms = []
-        for p_name, p_config in config_per_platform(config, domain):
-            # Validate component specific platform schema
-            try:
-                p_validated = component_platform_schema(p_config)
-            except vol.Invalid as ex:
-                _comp_error(ex, domain, config)
-                continue
 
-            # Not all platform components follow same pattern for platforms
-            # So if p_name is None we are not going to validate platform
-            # (the automation component is one of them)
-            if p_name is None:
-                platforms.append(p_validated)
-                continue
+async def _async_validate_domain(
+    hass: HomeAssistant, domain: str, config: ConfigType, result: HomeAssistantConfig
+) -> None:
+    """Validate the config of an integration and its platforms.
+
+    The config is shared by the integrations being validated, so it is only
+    replaced locally, never modified. Schemas are run in the executor.
+    """
+    try:
+        integration = await async_get_integration_with_requirements(hass, domain)
+    except (RequirementsNotFound, loader.IntegrationNotFound) as ex:
+        result.add_error(f"Component error: {domain} - {ex}")
+        return
+
+    try:
+        component = integration.get_component()
+    except ImportError as ex:
+        result.add_error(f"Component error: {domain} - {ex}")
+        return
 
+    # Check if the integration has a custom config validator
+    config_validator = None
+    try:
+        config_validator = integration.get_platform("config")
+    except ImportError as err:
+        # Filter out import error of the config platform.
+        # If the config platform contains bad imports, make sure
+        # that still fails.
+        if err.name != f"{integration.pkg_path}.config":
+            result.add_error(f"Error importing config platform {domain}: {err}")
+            return
+
+    if config_validator is not None and hasattr(
+        config_validator, "async_validate_config"
+    ):
+        # Custom validators run in the event loop, their time includes
+        # waiting for the jobs they start
+        start = timer()
+        try:
+            result[domain] = (
+                await config_validator.async_validate_config(  # type: ignore
+                    hass, config
+                )
+            )[domain]
+            return
+        except (vol.Invalid, HomeAssistantError) as ex:
+            _comp_error(result, ex, domain, config)
+            return
+        except Exception as err:  # pylint: disable=broad-except
+            logging.getLogger(__name__).exception("Unexpected error validating config")
+            result.add_error(
+                f"Unexpected error calling config validator: {err}",
+                domain,
+                config.get(domain),
+            )
+            return
+        finally:
+            result.validation_times[domain] += timer() - start
+
+    config_schema = getattr(component, "CONFIG_SCHEMA", None)
+    if config_schema is not None:
+        try:
+            config = await _async_run_schema(
+                hass, result, domain, config_schema, config
+            )
+            result[domain] = config[domain]
+        except vol.Invalid as ex:
+            _comp_error(result, ex, domain, config)
+            return
+
+    component_platform_schema = getattr(
+        component,
+        "PLATFORM_SCHEMA_BASE",
+        getattr(component, "PLATFORM_SCHEMA", None),
+    )
+
+    if component_platform_schema is None:
+        return
+
+    async def _async_validate_platform(
+        p_name: Optional[str], p_config: ConfigType
+    ) -> Optional[ConfigType]:
+        """Validate the config of a platform, None if it is invalid."""
+        # Validate component specific platform schema
+        try:
+            p_validated = await _async_run_schema(
+                hass, result, domain, component_platform_schema, p_config
+            )
+        except vol.Invalid as ex:
+            _comp_error(result, ex, domain, config)
+            return None
+
+        # Not all platform components follow same pattern for platforms
+        # So if p_name is None we are not going to validate platform
+        # (the automation component is one of them)
+        if p_name is None:
+            return cast(ConfigType, p_validated)
+
+        try:
+            p_integration = await async_get_integration_with_requirements(hass, p_name)
+            platform = p_integration.get_platform(domain)
+        except (
+            loader.IntegrationNotFound,
+            RequirementsNotFound,
+            ImportError,
+        ) as ex:
+            result.add_error(f"Platform error {domain}.{p_name} - {ex}")
+            return None
+
+        # Validate platform specific schema
+        platform_schema = getattr(platform, "PLATFORM_SCHEMA", None)
+        if platform_schema is not None:
             try:
-                p_integration = await async_get_integration_with_requirements(
-                    hass, p_name
+                p_validated = await _async_run_schema(
+                    hass, result, domain, platform_schema, p_validated
                 )
-                platform = p_integration.get_platform(domain)
-            except (
-                loader.IntegrationNotFound,
-                RequirementsNotFound,
-                ImportError,
-            ) as ex:
-                result.add_error(f"Platform error {domain}.{p_name} - {ex}")
-                continue
-
-            # Validate platform specific schema
-            platform_schema = getattr(platform, "PLATFORM_SCHEMA", None)
-            if platform_schema is not None:
-                try:
-                    p_validated = platform_schema(p_validated)
-                except vol.Invalid as ex:
-                    _comp_error(ex, f"{domain}.{p_name}", p_validated)
-                    continue
-
-            platforms.append(p_validated)
-
-        # Remove config for current component and add validated config back in.
-        for filter_comp in extract_domain_configs(config, domain):
-            del config[filter_comp]
-        result[domain] = platforms
+            except vol.Invalid as ex:
+                _comp_error(result, ex, f"{domain}.{p_name}", p_validated)
+                return None
 
-    return result
+        return cast(ConfigType, p_validated)
+
+    platforms = await asyncio.gather(
+        *(
+            _async_validate_platform(p_name, p_config)
+            for p_name, p_config in config_per_platform(config, domain)
+        )
+    )
+    result[domain] = [
+        p_validated for p_validated in platforms if p_validated is not None
+    ]
@@ -31,6 +31,8 @@ CONNECTION_NETWORK_MAC = "mac"
 CONNECTION_UPNP = "upnp"
 CONNECTION_ZIGBEE = "zigbee"
 
+IDX_AREA_ID = "area_id"
+IDX_CONFIG_ENTRIES = "config_entries"
 IDX_CONNECTIONS = "connections"
 IDX_IDENTIFIERS = "identifiers"
 REGISTERED_DEVICE = "registered"
@@ -127,6 +129,7 @@ class DeviceRegistry:
     devices: Dict[str, DeviceEntry]
     deleted_devices: Dict[str, DeletedDeviceEntry]
     _devices_index: Dict[str, Dict[str, Dict[Tuple[str, str], str]]]
+    _registered_index: Dict[str, Dict[str, Dict[str, DeviceEntry]]]
 
     def __init__(self, hass: HomeAssistantType) -> None:
         """Initialize the device registry."""
@@ -192,6 +195,7 @@ class DeviceRegistry:
         else:
             devices_index = self._devices_index[REGISTERED_DEVICE]
             self.devices[device.id] = device
+            _add_device_to_registered_index(self._registered_index, device)
 
         _add_device_to_index(devices_index, device)
 
@@ -203,6 +207,7 @@ class DeviceRegistry:
         else:
             devices_index = self._devices_index[REGISTERED_DEVICE]
             self.devices.pop(device.id)
+            _remove_device_from_registered_index(self._registered_index, device)
 
         _remove_device_from_index(devices_index, device)
 
@@ -213,6 +218,8 @@ class DeviceRegistry:
         devices_index = self._devices_index[REGISTERED_DEVICE]
         _remove_device_from_index(devices_index, old_device)
         _add_device_to_index(devices_index, new_device)
+        _remove_device_from_registered_index(self._registered_index, old_device)
+        _add_device_to_registered_index(self._registered_index, new_device)
 
     def _clear_index(self) -> None:
         """Clear the index."""
@@ -220,12 +227,14 @@ class DeviceRegistry:
             REGISTERED_DEVICE: {IDX_IDENTIFIERS: {}, IDX_CONNECTIONS: {}},
             DELETED_DEVICE: {IDX_IDENTIFIERS: {}, IDX_CONNECTIONS: {}},
         }
+        self._registered_index = {IDX_AREA_ID: {}, IDX_CONFIG_ENTRIES: {}}
 
     def _rebuild_index(self) -> None:
         """Create the index after loading devices."""
         self._clear_index()
         for device in self.devices.values():
             _add_device_to_index(self._devices_index[REGISTERED_DEVICE], device)
+            _add_device_to_registered_index(self._registered_index, device)
         for deleted_device in self.deleted_devices.values():
             _add_device_to_index(self._devices_index[DELETED_DEVICE], deleted_device)
 
@@ -559,9 +568,8 @@ class DeviceRegistry:
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for dev_id, device in self.devices.items():
-            if area_id == device.area_id:
-                self._async_update_device(dev_id, area_id=None)
+        for device in async_entries_for_area(self, area_id):
+            self._async_update_device(device.id, area_id=None)
 
 
 @singleton(DATA_REGISTRY)
@@ -575,7 +583,8 @@ async def async_get_registry(hass: HomeAssistantType) -> DeviceRegistry:
 @callback
 def async_entries_for_area(registry: DeviceRegistry, area_id: str) -> List[DeviceEntry]:
     """Return entries that match an area."""
-    return [device for device in registry.devices.values() if device.area_id == area_id]
+    # pylint: disable=protected-access
+    return list(registry._registered_index[IDX_AREA_ID].get(area_id, {}).values())
 
 
 @callback
@@ -583,11 +592,10 @@ def async_entries_for_config_entry(
     registry: DeviceRegistry, config_entry_id: str
 ) -> List[DeviceEntry]:
     """Return entries that match a config entry."""
-    return [
-        device
-        for device in registry.devices.values()
-        if config_entry_id in device.config_entries
-    ]
+    # pylint: disable=protected-access
+    return list(
+        registry._registered_index[IDX_CONFIG_ENTRIES].get(config_entry_id, {}).values()
+    )
 
 
 @callback
@@ -694,3 +702,34 @@ def _remove_device_from_index(
     for connection in device.connections:
         if connection in devices_index[IDX_CONNECTIONS]:
             del devices_index[IDX_CONNECTIONS][connection]
+
+
+def _add_device_to_registered_index(
+    registered_index: Dict[str, Dict[str, Dict[str, DeviceEntry]]],
+    device: DeviceEntry,
+) -> None:
+    """Add a registered device to the area and config entry index."""
+    for index, key in _registered_index_keys(device):
+        registered_index[index].setdefault(key, {})[device.id] = device
+
+
+def _remove_device_from_registered_index(
+    registered_index: Dict[str, Dict[str, Dict[str, DeviceEntry]]],
+    device: DeviceEntry,
+) -> None:
+    """Remove a registered device from the area and config entry index."""
+    for index, key in _registered_index_keys(device):
+        devices = registered_index[index].get(key)
+        if devices is None:
+            continue
+        devices.pop(device.id, None)
+        if not devices:
+            del registered_index[index][key]
+
+
+def _registered_index_keys(device: DeviceEntry) -> List[Tuple[str, str]]:
+    """Return the keys a registered device is indexed by."""
+    keys = [(IDX_CONFIG_ENTRIES, key) for key in device.config_entries]
+    if device.area_id is not None:
+        keys.append((IDX_AREA_ID, device.area_id))
+    return keys
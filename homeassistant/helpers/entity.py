@@ -5,7 +5,16 @@ from datetime import datetime, timedelta
 import functools as ft
 import logging
 from timeit import default_timer as timer
-from typing import Any, Awaitable, Dict, Iterable, List, Optional
+from typing import (
+    Any,
+    Awaitable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 
 from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.const import (
@@ -110,9 +119,24 @@ class Entity(ABC):
     # Process updates in parallel
     parallel_updates: Optional[asyncio.Semaphore] = None
 
+    # Seconds the last forced refresh took, without waiting for parallel updates
+    _update_duration: Optional[float] = None
+
     # Entry in the entity registry
     registry_entry: Optional[RegistryEntry] = None
 
+    # Properties whose value never changes, like a fixed name or unit. Their
+    # attributes, merged with the customize overrides, are built once and
+    # kept until the registry entry or the customize overrides change.
+    # Supported are capability_attributes, unit_of_measurement, name, icon,
+    # entity_picture, assumed_state, supported_features and device_class.
+    _static_properties: FrozenSet[str] = frozenset()
+
+    # The static attributes and what they were built from
+    _static_attributes: Optional[
+        Tuple[Optional[Dict[str, Any]], Dict[str, Any], Tuple[Any, Any]]
+    ] = None
+
     # Hold list for functions to call on remove.
     _on_remove: Optional[List[CALLBACK_TYPE]] = None
 
@@ -227,6 +251,15 @@ class Entity(ABC):
         """Flag supported features."""
         return None
 
+    @property
+    def update_duration(self) -> Optional[float]:
+        """Return the seconds the last forced refresh of the state took.
+
+        Waiting for the updates of other entities because of parallel
+        updates doesn't count. None if the entity wasn't updated.
+        """
+        return self._update_duration
+
     @property
     def context_recent_time(self) -> timedelta:
         """Time that a context is considered recent."""
@@ -274,6 +307,7 @@ class Entity(ABC):
 
         # update entity data
         if force_refresh:
+            self._update_duration = None
             try:
                 await self.async_device_update()
             except Exception:  # pylint: disable=broad-except
@@ -296,6 +330,66 @@ class Entity(ABC):
         self._async_write_ha_state()
 
     @callback
+    def _build_static_attributes(
+        self, customize: Any
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any], Tuple[Any, Any]]:
+        """Build the attributes of the static properties.
+
+        Returns the capability attributes if they are static, the other static
+        attributes merged with the customize overrides and what they depend on.
+        """
+        capability_attributes = None
+        if "capability_attributes" in self._static_properties:
+            capability_attributes = self.capability_attributes
+
+        attr: Dict[str, Any] = {}
+        self._add_property_attributes(attr, True)
+        if customize is not None:
+            attr.update(customize.get(self.entity_id))
+
+        return capability_attributes, attr, (self.registry_entry, customize)
+
+    def _add_property_attributes(self, attr: Dict[str, Any], static: bool) -> None:
+        """Add the attributes of the static or of the other properties."""
+        static_properties = self._static_properties
+
+        if ("unit_of_measurement" in static_properties) is static:
+            unit_of_measurement = self.unit_of_measurement
+            if unit_of_measurement is not None:
+                attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
+
+        entry = self.registry_entry
+        # pylint: disable=consider-using-ternary
+        if ("name" in static_properties) is static:
+            name = (entry and entry.name) or self.name
+            if name is not None:
+                attr[ATTR_FRIENDLY_NAME] = name
+
+        if ("icon" in static_properties) is static:
+            icon = (entry and entry.icon) or self.icon
+            if icon is not None:
+                attr[ATTR_ICON] = icon
+
+        if ("entity_picture" in static_properties) is static:
+            entity_picture = self.entity_picture
+            if entity_picture is not None:
+                attr[ATTR_ENTITY_PICTURE] = entity_picture
+
+        if ("assumed_state" in static_properties) is static:
+            assumed_state = self.assumed_state
+            if assumed_state:
+                attr[ATTR_ASSUMED_STATE] = assumed_state
+
+        if ("supported_features" in static_properties) is static:
+            supported_features = self.supported_features
+            if supported_features is not None:
+                attr[ATTR_SUPPORTED_FEATURES] = supported_features
+
+        if ("device_class" in static_properties) is static:
+            device_class = self.device_class
+            if device_class is not None:
+                attr[ATTR_DEVICE_CLASS] = str(device_class)
+
     def _async_write_ha_state(self) -> None:
         """Write the state to the state machine."""
         if self.registry_entry and self.registry_entry.disabled_by:
@@ -311,7 +405,20 @@ class Entity(ABC):
 
         start = timer()
 
-        attr = self.capability_attributes
+        assert self.hass is not None
+        customize = self.hass.data.get(DATA_CUSTOMIZE)
+        static = self._static_attributes
+        if self._static_properties and (
+            static is None
+            or static[2][0] is not self.registry_entry
+            or static[2][1] is not customize
+        ):
+            static = self._static_attributes = self._build_static_attributes(customize)
+
+        if static is not None and "capability_attributes" in self._static_properties:
+            attr = static[0]
+        else:
+            attr = self.capability_attributes
         attr = dict(attr) if attr else {}
 
         if not self.available:
@@ -322,35 +429,7 @@ class Entity(ABC):
             attr.update(self.state_attributes or {})
             attr.update(self.device_state_attributes or {})
 
-        unit_of_measurement = self.unit_of_measurement
-        if unit_of_measurement is not None:
-            attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
-
-        entry = self.registry_entry
-        # pylint: disable=consider-using-ternary
-        name = (entry and entry.name) or self.name
-        if name is not None:
-            attr[ATTR_FRIENDLY_NAME] = name
-
-        icon = (entry and entry.icon) or self.icon
-        if icon is not None:
-            attr[ATTR_ICON] = icon
-
-        entity_picture = self.entity_picture
-        if entity_picture is not None:
-            attr[ATTR_ENTITY_PICTURE] = entity_picture
-
-        assumed_state = self.assumed_state
-        if assumed_state:
-            attr[ATTR_ASSUMED_STATE] = assumed_state
-
-        supported_features = self.supported_features
-        if supported_features is not None:
-            attr[ATTR_SUPPORTED_FEATURES] = supported_features
-
-        device_class = self.device_class
-        if device_class is not None:
-            attr[ATTR_DEVICE_CLASS] = str(device_class)
+        self._add_property_attributes(attr, False)
 
         end = timer()
 
@@ -378,9 +457,11 @@ class Entity(ABC):
             )
 
         # Overwrite properties that have been set in the config file.
-        assert self.hass is not None
-        if DATA_CUSTOMIZE in self.hass.data:
-            attr.update(self.hass.data[DATA_CUSTOMIZE].get(self.entity_id))
+        # They are part of the static attributes if the entity has those.
+        if static is not None:
+            attr.update(static[1])
+        elif customize is not None:
+            attr.update(customize.get(self.entity_id))
 
         # Convert temperature if we detect one
         try:
@@ -453,6 +534,7 @@ class Entity(ABC):
         if self.parallel_updates:
             await self.parallel_updates.acquire()
 
+        start = timer()
         try:
             # pylint: disable=no-member
             if hasattr(self, "async_update"):
@@ -481,6 +563,7 @@ class Entity(ABC):
             )
             await task
         finally:
+            self._update_duration = timer() - start
             self._update_staged = False
             if self.parallel_updates:
                 self.parallel_updates.release()
@@ -3,9 +3,13 @@ import asyncio
 from contextvars import ContextVar
 from datetime import datetime, timedelta
 from logging import Logger
+import random
+from time import monotonic
 from types import ModuleType
 from typing import TYPE_CHECKING, Callable, Coroutine, Dict, Iterable, List, Optional
 
+import attr
+
 from homeassistant import config_entries
 from homeassistant.const import ATTR_RESTORED, DEVICE_DEFAULT_NAME
 from homeassistant.core import (
@@ -36,6 +40,23 @@ PLATFORM_NOT_READY_RETRIES = 10
 DATA_ENTITY_PLATFORM = "entity_platform"
 PLATFORM_NOT_READY_BASE_WAIT_TIME = 30  # seconds
 
+# Consecutive slow or unavailable polls before an entity is polled less often
+POLL_BACKOFF_THRESHOLD = 3
+# Poll such an entity at most every 2 ** POLL_BACKOFF_MAX_LEVEL intervals
+POLL_BACKOFF_MAX_LEVEL = 3
+
+
+@attr.s(slots=True)
+class PollingStats:
+    """Latency and overruns of the polling of a platform."""
+
+    polls: int = attr.ib(default=0)
+    overruns: int = attr.ib(default=0)
+    # Entity updates skipped because the entity is backed off
+    skipped: int = attr.ib(default=0)
+    last_duration: Optional[float] = attr.ib(default=None)
+    max_duration: float = attr.ib(default=0.0)
+
 
 class EntityPlatform:
     """Manage the entities for a single platform."""
@@ -69,6 +90,9 @@ class EntityPlatform:
         # Method to cancel the retry of setup
         self._async_cancel_retry_setup: Optional[CALLBACK_TYPE] = None
         self._process_updates: Optional[asyncio.Lock] = None
+        # Consecutive failed polls and polls left to skip of backed off entities
+        self._poll_backoff: Dict[str, List[int]] = {}
+        self.polling_stats = PollingStats()
 
         self.parallel_updates: Optional[asyncio.Semaphore] = None
 
@@ -333,10 +357,13 @@ class EntityPlatform:
         ):
             return
 
+        # Start at a random point of the interval so that platforms set up
+        # together don't all poll at the same moment
         self._async_unsub_polling = async_track_time_interval(
             self.hass,
             self._update_entity_states,
             self.scan_interval,
+            first_interval=self.scan_interval * random.random(),
         )
 
     async def _async_add_entity(  # type: ignore[no-untyped-def]
@@ -501,7 +528,13 @@ class EntityPlatform:
             # has a chance to finish.
             self.hass.states.async_reserve(entity.entity_id)
 
-        entity.async_on_remove(lambda: self.entities.pop(entity_id))
+        @callback
+        def remove_entity_cb() -> None:
+            """Remove entity from entities list."""
+            self.entities.pop(entity_id)
+            self._poll_backoff.pop(entity_id, None)
+
+        entity.async_on_remove(remove_entity_cb)
 
         await entity.add_to_platform_finish()
 
@@ -558,6 +591,19 @@ class EntityPlatform:
             self.hass, self.entities.values(), service_call, expand_group
         )
 
+    @callback
+    def async_write_ha_states(self, entities: Iterable["Entity"]) -> None:
+        """Write the states of a burst of entity updates at once.
+
+        Push based integrations can flush the entities that a message updated
+        in one go, their state_changed events are fired together.
+
+        This method must be run in the event loop.
+        """
+        with self.hass.states.async_batch():
+            for entity in entities:
+                entity.async_write_ha_state()
+
     @callback
     def async_register_entity_service(self, name, schema, func, required_features=None):  # type: ignore[no-untyped-def]
         """Register an entity service.
@@ -599,24 +645,86 @@ class EntityPlatform:
         if self._process_updates is None:
             self._process_updates = asyncio.Lock()
         if self._process_updates.locked():
+            stats = self.polling_stats
+            stats.overruns += 1
             self.logger.warning(
                 "Updating %s %s took longer than the scheduled update interval %s",
                 self.platform_name,
                 self.domain,
                 self.scan_interval,
             )
+            self.logger.debug(
+                "Polling of %s %s: %s polls, %s overruns, %s skipped entity "
+                "updates, last poll took %ss, slowest %.3fs",
+                self.platform_name,
+                self.domain,
+                stats.polls,
+                stats.overruns,
+                stats.skipped,
+                "-" if stats.last_duration is None else f"{stats.last_duration:.3f}",
+                stats.max_duration,
+            )
             return
 
         async with self._process_updates:
+            start = monotonic()
             tasks = []
             for entity in self.entities.values():
-                if not entity.should_poll:
+                if not entity.should_poll or self._async_skip_poll(entity.entity_id):
                     continue
-                tasks.append(entity.async_update_ha_state(True))
+                tasks.append(self._async_poll_entity(entity))
 
             if tasks:
                 await asyncio.gather(*tasks)
 
+            stats = self.polling_stats
+            stats.polls += 1
+            stats.last_duration = monotonic() - start
+            stats.max_duration = max(stats.max_duration, stats.last_duration)
+
+    @callback
+    def _async_skip_poll(self, entity_id: str) -> bool:
+        """Return if a backed off entity should not be polled this time."""
+        backoff = self._poll_backoff.get(entity_id)
+        if backoff is None or not backoff[1]:
+            return False
+
+        backoff[1] -= 1
+        self.polling_stats.skipped += 1
+        return True
+
+    async def _async_poll_entity(self, entity: "Entity") -> None:
+        """Update a polling entity, backing off when it is slow or unavailable.
+
+        An entity that was slower than the scan interval or unavailable for
+        POLL_BACKOFF_THRESHOLD polls in a row skips 1, 3 and then 7 polls
+        before it is polled again. Waiting for the other updates of the
+        platform because of PARALLEL_UPDATES doesn't make an entity slow.
+        """
+        entity_id = entity.entity_id
+        await entity.async_update_ha_state(True)
+        duration = entity.update_duration or 0.0
+
+        if entity.available and duration < self.scan_interval.total_seconds():
+            self._poll_backoff.pop(entity_id, None)
+            return
+
+        if entity_id not in self.entities:
+            return
+
+        backoff = self._poll_backoff.setdefault(entity_id, [0, 0])
+        backoff[0] += 1
+        if backoff[0] < POLL_BACKOFF_THRESHOLD:
+            return
+
+        level = min(backoff[0] - POLL_BACKOFF_THRESHOLD + 1, POLL_BACKOFF_MAX_LEVEL)
+        backoff[1] = 2 ** level - 1
+        self.logger.debug(
+            "Skipping the next %s polls of %s, it is slow or unavailable",
+            backoff[1],
+            entity_id,
+        )
+
 
 current_platform: ContextVar[Optional[EntityPlatform]] = ContextVar(
     "current_platform", default=None
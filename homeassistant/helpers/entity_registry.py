@@ -55,6 +55,10 @@ DISABLED_HASS = "hass"
 DISABLED_INTEGRATION = "integration"
 DISABLED_USER = "user"
 
+IDX_AREA_ID = "area_id"
+IDX_CONFIG_ENTRY_ID = "config_entry_id"
+IDX_DEVICE_ID = "device_id"
+
 STORAGE_VERSION = 1
 STORAGE_KEY = "core.entity_registry"
 
@@ -124,6 +128,11 @@ class EntityRegistry:
         self.hass = hass
         self.entities: Dict[str, RegistryEntry]
         self._index: Dict[Tuple[str, str, str], str] = {}
+        self._entries_index: Dict[str, Dict[str, Dict[str, RegistryEntry]]] = {
+            IDX_AREA_ID: {},
+            IDX_CONFIG_ENTRY_ID: {},
+            IDX_DEVICE_ID: {},
+        }
         self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
         self.hass.bus.async_listen(
             EVENT_DEVICE_REGISTRY_UPDATED, self.async_device_modified
@@ -505,19 +514,14 @@ class EntityRegistry:
     @callback
     def async_clear_config_entry(self, config_entry: str) -> None:
         """Clear config entry from registry entries."""
-        for entity_id in [
-            entity_id
-            for entity_id, entry in self.entities.items()
-            if config_entry == entry.config_entry_id
-        ]:
-            self.async_remove(entity_id)
+        for entry in async_entries_for_config_entry(self, config_entry):
+            self.async_remove(entry.entity_id)
 
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for entity_id, entry in self.entities.items():
-            if area_id == entry.area_id:
-                self._async_update_entity(entity_id, area_id=None)
+        for entry in async_entries_for_area(self, area_id):
+            self._async_update_entity(entry.entity_id, area_id=None)
 
     def _register_entry(self, entry: RegistryEntry) -> None:
         self.entities[entry.entity_id] = entry
@@ -525,6 +529,8 @@ class EntityRegistry:
 
     def _add_index(self, entry: RegistryEntry) -> None:
         self._index[(entry.domain, entry.platform, entry.unique_id)] = entry.entity_id
+        for index, key in _entries_index_keys(entry):
+            self._entries_index[index].setdefault(key, {})[entry.entity_id] = entry
 
     def _unregister_entry(self, entry: RegistryEntry) -> None:
         self._remove_index(entry)
@@ -532,9 +538,23 @@ class EntityRegistry:
 
     def _remove_index(self, entry: RegistryEntry) -> None:
         del self._index[(entry.domain, entry.platform, entry.unique_id)]
+        for index, key in _entries_index_keys(entry):
+            entries = self._entries_index[index][key]
+            del entries[entry.entity_id]
+            if not entries:
+                del self._entries_index[index][key]
+
+    def _entries_for(self, index: str, key: str) -> List[RegistryEntry]:
+        """Return the entries with a value for an indexed attribute."""
+        return list(self._entries_index[index].get(key, {}).values())
 
     def _rebuild_index(self) -> None:
         self._index = {}
+        self._entries_index = {
+            IDX_AREA_ID: {},
+            IDX_CONFIG_ENTRY_ID: {},
+            IDX_DEVICE_ID: {},
+        }
         for entry in self.entities.values():
             self._add_index(entry)
 
@@ -552,11 +572,11 @@ def async_entries_for_device(
     registry: EntityRegistry, device_id: str, include_disabled_entities: bool = False
 ) -> List[RegistryEntry]:
     """Return entries that match a device."""
+    # pylint: disable=protected-access
     return [
         entry
-        for entry in registry.entities.values()
-        if entry.device_id == device_id
-        and (not entry.disabled_by or include_disabled_entities)
+        for entry in registry._entries_for(IDX_DEVICE_ID, device_id)
+        if not entry.disabled_by or include_disabled_entities
     ]
 
 
@@ -565,7 +585,8 @@ def async_entries_for_area(
     registry: EntityRegistry, area_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match an area."""
-    return [entry for entry in registry.entities.values() if entry.area_id == area_id]
+    # pylint: disable=protected-access
+    return registry._entries_for(IDX_AREA_ID, area_id)
 
 
 @callback
@@ -573,10 +594,20 @@ def async_entries_for_config_entry(
     registry: EntityRegistry, config_entry_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match a config entry."""
+    # pylint: disable=protected-access
+    return registry._entries_for(IDX_CONFIG_ENTRY_ID, config_entry_id)
+
+
+def _entries_index_keys(entry: RegistryEntry) -> List[Tuple[str, str]]:
+    """Return the keys an entry is indexed by."""
     return [
-        entry
-        for entry in registry.entities.values()
-        if entry.config_entry_id == config_entry_id
+        (index, key)
+        for index, key in (
+            (IDX_AREA_ID, entry.area_id),
+            (IDX_CONFIG_ENTRY_ID, entry.config_entry_id),
+            (IDX_DEVICE_ID, entry.device_id),
+        )
+        if key is not None
     ]
 
 
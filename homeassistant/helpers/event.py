@@ -1190,8 +1190,13 @@ def async_track_time_interval(
     hass: HomeAssistant,
     action: Callable[..., Union[None, Awaitable]],
     interval: timedelta,
+    first_interval: Optional[timedelta] = None,
 ) -> CALLBACK_TYPE:
-    """Add a listener that fires repetitively at every timedelta interval."""
+    """Add a listener that fires repetitively at every timedelta interval.
+
+    If first_interval is passed, the listener first fires after it instead of
+    after interval.
+    """
     remove = None
     interval_listener_job = None
 
@@ -1213,7 +1218,13 @@ def async_track_time_interval(
         hass.async_run_hass_job(job, now)
 
     interval_listener_job = HassJob(interval_listener)
-    remove = async_track_point_in_utc_time(hass, interval_listener_job, next_interval())
+    remove = async_track_point_in_utc_time(
+        hass,
+        interval_listener_job,
+        next_interval()
+        if first_interval is None
+        else dt_util.utcnow() + first_interval,
+    )
 
     def remove_listener() -> None:
         """Remove interval listener."""
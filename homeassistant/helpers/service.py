@@ -333,24 +333,28 @@ async def async_extract_referenced_entity_ids(
         for area_id in area_lookup:
             if area_id not in area_reg.areas:
                 selected.missing_areas.add(area_id)
-                continue
 
-        # Find entities tied to an area
-        for entity_entry in ent_reg.entities.values():
-            if entity_entry.area_id in area_lookup:
+            # Find entities tied to an area
+            for entity_entry in entity_registry.async_entries_for_area(
+                ent_reg, area_id
+            ):
                 selected.indirectly_referenced.add(entity_entry.entity_id)
 
-        # Find devices for this area
-        for device_entry in dev_reg.devices.values():
-            if device_entry.area_id in area_lookup:
+            # Find devices for this area
+            for device_entry in device_registry.async_entries_for_area(
+                dev_reg, area_id
+            ):
                 picked_devices.add(device_entry.id)
 
     if not picked_devices:
         return selected
 
-    for entity_entry in ent_reg.entities.values():
-        if not entity_entry.area_id and entity_entry.device_id in picked_devices:
-            selected.indirectly_referenced.add(entity_entry.entity_id)
+    for device_id in picked_devices:
+        for entity_entry in entity_registry.async_entries_for_device(
+            ent_reg, device_id, include_disabled_entities=True
+        ):
+            if not entity_entry.area_id:
+                selected.indirectly_referenced.add(entity_entry.entity_id)
 
     return selected
 
@@ -455,6 +459,26 @@ def async_set_service_schema(
     hass.data[SERVICE_DESCRIPTION_CACHE][f"{domain}.{service}"] = description
 
 
+def _get_referenced_entities(
+    platform: "EntityPlatform", referenced: Set[str]
+) -> List["Entity"]:
+    """Return the entities of a platform that are referenced.
+
+    The platform entities are keyed by entity_id, so when fewer entities are
+    referenced than the platform has, they are looked up instead of checking
+    every entity of the platform. Either way the entities are returned in the
+    order of the platform.
+    """
+    entities = platform.entities
+    if len(referenced) < len(entities):
+        found = [entity_id for entity_id in referenced if entity_id in entities]
+        if len(found) > 1:
+            found_ids = set(found)
+            found = [entity_id for entity_id in entities if entity_id in found_ids]
+        return [entities[entity_id] for entity_id in found]
+    return [entity for entity in entities.values() if entity.entity_id in referenced]
+
+
 @bind_hass
 async def entity_service_call(
     hass: HomeAssistantType,
@@ -510,11 +534,7 @@ async def entity_service_call(
             else:
                 assert all_referenced is not None
                 entity_candidates.extend(
-                    [
-                        entity
-                        for entity in platform.entities.values()
-                        if entity.entity_id in all_referenced
-                    ]
+                    _get_referenced_entities(platform, all_referenced)
                 )
 
     elif target_all_entities:
@@ -534,10 +554,7 @@ async def entity_service_call(
 
         for platform in platforms:
             platform_entities = []
-            for entity in platform.entities.values():
-
-                if entity.entity_id not in all_referenced:
-                    continue
+            for entity in _get_referenced_entities(platform, all_referenced):
 
                 if not entity_perms(entity.entity_id, POLICY_CONTROL):
                     raise Unauthorized(
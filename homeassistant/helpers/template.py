@@ -4,7 +4,7 @@ import asyncio
 import base64
 import collections.abc
 from datetime import datetime, timedelta
-from functools import partial, wraps
+from functools import lru_cache, partial, wraps
 import json
 import logging
 import math
@@ -66,6 +66,9 @@ _COLLECTABLE_STATE_ATTRIBUTES = {
     "name",
 }
 
+# Recently parsed values, shared by the templates rendering the same value
+_JSON_CACHE_SIZE = 16
+
 ALL_STATES_RATE_LIMIT = timedelta(minutes=1)
 DOMAIN_STATES_RATE_LIMIT = timedelta(seconds=1)
 
@@ -502,10 +505,15 @@ class Template:
         variables = dict(variables or {})
         variables["value"] = value
 
-        try:
-            variables["value_json"] = json.loads(value)
-        except (ValueError, TypeError):
-            pass
+        if isinstance(value, (str, bytes)):
+            value_json = _parse_json(value)
+            if value_json is not _SENTINEL:
+                variables["value_json"] = value_json
+        else:
+            try:
+                variables["value_json"] = json.loads(value)
+            except (ValueError, TypeError):
+                pass
 
         try:
             return self._compiled.render(variables).strip()
@@ -1292,6 +1300,20 @@ def urlencode(value):
     return urllib_urlencode(value).encode("utf-8")
 
 
+@lru_cache(maxsize=_JSON_CACHE_SIZE)
+def _parse_json(value: Union[str, bytes]) -> Any:
+    """Parse a JSON value or return _SENTINEL if it isn't valid JSON.
+
+    Many templates can render the same value, like the entities subscribed
+    to the same MQTT topic, so the value is only parsed once. Sharing the
+    result is safe because templates can't modify it.
+    """
+    try:
+        return json.loads(value)
+    except ValueError:
+        return _SENTINEL
+
+
 class TemplateEnvironment(ImmutableSandboxedEnvironment):
     """The Home Assistant template environment."""
 
@@ -11,12 +11,15 @@ import json
 import logging
 import pathlib
 import sys
+import time
+from timeit import default_timer as timer
 from types import ModuleType
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
     Dict,
+    Iterable,
     List,
     Optional,
     Set,
@@ -46,6 +49,8 @@ _LOGGER = logging.getLogger(__name__)
 DATA_COMPONENTS = "components"
 DATA_INTEGRATIONS = "integrations"
 DATA_CUSTOM_COMPONENTS = "custom_components"
+DATA_MANIFEST_CACHE = "integration_manifest_cache"
+DATA_IMPORT_TIMES = "integration_import_times"
 PACKAGE_CUSTOM_COMPONENTS = "custom_components"
 PACKAGE_BUILTIN = "homeassistant.components"
 CUSTOM_WARNING = (
@@ -58,6 +63,12 @@ _UNDEF = object()  # Internal; not helpers.typing.UNDEFINED due to circular depe
 
 MAX_LOAD_CONCURRENTLY = 4
 
+MANIFEST_CACHE_STORAGE_KEY = "core.integration_manifests"
+MANIFEST_CACHE_STORAGE_VERSION = 1
+MANIFEST_CACHE_SAVE_DELAY = 10
+# Coarsest modification time resolution of the supported file systems
+MANIFEST_MTIME_RESOLUTION_NS = 2 * 10 ** 9
+
 
 class Manifest(TypedDict, total=False):
     """
@@ -97,6 +108,107 @@ def manifest_from_legacy_module(domain: str, module: ModuleType) -> Manifest:
     }
 
 
+class ManifestCache:
+    """Parsed manifest.json files that are kept between restarts.
+
+    A cached manifest is only used while the modification time, size and
+    inode of its file are unchanged. Integrations that didn't change can then
+    be resolved without reading and parsing their manifest.
+
+    A file that was modified shortly before it was read can change again
+    without a new modification time, its manifest is parsed again until it
+    was read long enough after its last modification.
+    """
+
+    def __init__(self, store: Any, manifests: Dict[str, Dict[str, Any]]) -> None:
+        """Initialize the manifest cache."""
+        self._store = store
+        # Manifest path -> file stat, when it was read and manifest
+        self._manifests = manifests
+        self._dirty = False
+
+    def get(self, manifest_path: str, stat: List[int]) -> Optional[Manifest]:
+        """Return a copy of a cached manifest if its file didn't change.
+
+        The stat is the modification time, size and inode of the file.
+        """
+        entry = self._manifests.get(manifest_path)
+        if (
+            entry is None
+            or entry.get("stat") != stat
+            or entry["read_at"] - stat[0] <= MANIFEST_MTIME_RESOLUTION_NS
+        ):
+            return None
+        return cast(Manifest, dict(entry["manifest"]))
+
+    def set(
+        self, manifest_path: str, stat: List[int], read_at: int, manifest: Manifest
+    ) -> None:
+        """Cache a parsed manifest of a file read at read_at."""
+        self._manifests[manifest_path] = {
+            "stat": stat,
+            "read_at": read_at,
+            "manifest": dict(manifest),
+        }
+        self._dirty = True
+
+    def dependency_closure(self, domains: Iterable[str]) -> Set[str]:
+        """Return the domains and all their cached dependencies."""
+        dependencies: Dict[str, Set[str]] = {}
+        for entry in self._manifests.values():
+            manifest = entry["manifest"]
+            dependencies.setdefault(manifest["domain"], set()).update(
+                manifest.get("dependencies", [])
+            )
+
+        closure = set(domains)
+        to_process = list(closure)
+        while to_process:
+            for dependency in dependencies.get(to_process.pop(), ()):
+                if dependency not in closure:
+                    closure.add(dependency)
+                    to_process.append(dependency)
+        return closure
+
+    def async_schedule_save(self) -> None:
+        """Save the cache if manifests were parsed since the last save."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        self._store.async_delay_save(
+            lambda: dict(self._manifests), MANIFEST_CACHE_SAVE_DELAY
+        )
+
+
+async def async_load_manifest_cache(hass: "HomeAssistant") -> ManifestCache:
+    """Load the manifest cache from storage and start using it."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers.storage import Store
+
+    store = Store(hass, MANIFEST_CACHE_STORAGE_VERSION, MANIFEST_CACHE_STORAGE_KEY)
+    manifests = await store.async_load()
+    cache = hass.data[DATA_MANIFEST_CACHE] = ManifestCache(
+        store, cast(Dict[str, Dict[str, Any]], manifests or {})
+    )
+    return cache
+
+
+def cached_dependency_closure(
+    hass: "HomeAssistant", domains: Iterable[str]
+) -> Set[str]:
+    """Return the domains with their dependencies according to the manifest cache.
+
+    The cache can be stale, the result is only meant to look up the
+    integrations that are likely needed at once.
+
+    Async friendly.
+    """
+    cache: Optional[ManifestCache] = hass.data.get(DATA_MANIFEST_CACHE)
+    if cache is None:
+        return set(domains)
+    return cache.dependency_closure(domains)
+
+
 async def _async_get_custom_components(
     hass: "HomeAssistant",
 ) -> Dict[str, "Integration"]:
@@ -131,6 +243,10 @@ async def _async_get_custom_components(
         )
     )
 
+    manifest_cache: Optional[ManifestCache] = hass.data.get(DATA_MANIFEST_CACHE)
+    if manifest_cache is not None:
+        manifest_cache.async_schedule_save()
+
     return {
         integration.domain: integration
         for integration in integrations
@@ -274,19 +390,34 @@ class Integration:
         cls, hass: "HomeAssistant", root_module: ModuleType, domain: str
     ) -> "Optional[Integration]":
         """Resolve an integration from a root module."""
+        cache: Optional[ManifestCache] = hass.data.get(DATA_MANIFEST_CACHE)
+
         for base in root_module.__path__:  # type: ignore
             manifest_path = pathlib.Path(base) / domain / "manifest.json"
 
-            if not manifest_path.is_file():
-                continue
-
             try:
-                manifest = json.loads(manifest_path.read_text())
-            except ValueError as err:
-                _LOGGER.error(
-                    "Error parsing manifest.json file at %s: %s", manifest_path, err
-                )
+                file_stat = manifest_path.stat()
+            except OSError:
                 continue
+            # A list, so it compares equal after a JSON round trip
+            stat = [file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino]
+
+            manifest = None
+            if cache is not None:
+                manifest = cache.get(str(manifest_path), stat)
+
+            if manifest is None:
+                read_at = time.time_ns()
+                try:
+                    manifest = json.loads(manifest_path.read_text())
+                except ValueError as err:
+                    _LOGGER.error(
+                        "Error parsing manifest.json file at %s: %s", manifest_path, err
+                    )
+                    continue
+
+                if cache is not None:
+                    cache.set(str(manifest_path), stat, read_at, manifest)
 
             return cls(
                 hass, f"{root_module.__name__}.{domain}", manifest_path.parent, manifest
@@ -461,10 +592,17 @@ class Integration:
         return self._all_dependencies_resolved
 
     def get_component(self) -> ModuleType:
-        """Return the component."""
+        """Return the component.
+
+        The time it took to import is kept in DATA_IMPORT_TIMES.
+        """
         cache = self.hass.data.setdefault(DATA_COMPONENTS, {})
         if self.domain not in cache:
+            start = timer()
             cache[self.domain] = importlib.import_module(self.pkg_path)
+            self.hass.data.setdefault(DATA_IMPORT_TIMES, {})[self.domain] = (
+                timer() - start
+            )
         return cache[self.domain]  # type: ignore
 
     def get_platform(self, platform_name: str) -> ModuleType:
@@ -524,6 +662,10 @@ async def async_get_integration(hass: "HomeAssistant", domain: str) -> Integrati
         Integration.resolve_from_root, hass, components, domain
     )
 
+    manifest_cache: Optional[ManifestCache] = hass.data.get(DATA_MANIFEST_CACHE)
+    if manifest_cache is not None:
+        manifest_cache.async_schedule_save()
+
     if integration is not None:
         cache[domain] = integration
         event.set()
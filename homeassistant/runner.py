@@ -30,6 +30,7 @@ class RuntimeConfig:
 
     config_dir: str
     skip_pip: bool = False
+    preimport_integrations: bool = False
     safe_mode: bool = False
 
     verbose: bool = False
@@ -3,9 +3,10 @@ import argparse
 import asyncio
 import collections
 from contextlib import suppress
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 import logging
+from tempfile import TemporaryDirectory
 from timeit import default_timer as timer
 from typing import Callable, Dict, TypeVar
 
@@ -85,6 +86,72 @@ async def fire_events(hass):
     return timer() - start
 
 
+@benchmark
+async def fire_events_with_filter(hass):
+    """Fire a million events with a filter."""
+    count = 0
+    event_name = "benchmark_event"
+    events_to_fire = 10 ** 6
+    event = asyncio.Event()
+
+    @core.callback
+    def event_filter(event):
+        """Filter event."""
+        return False
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == events_to_fire:
+            event.set()
+
+    hass.bus.async_listen(event_name, listener, event_filter)
+    hass.bus.async_listen(event_name, listener)
+
+    for _ in range(events_to_fire):
+        hass.bus.async_fire(event_name)
+
+    start = timer()
+
+    await event.wait()
+
+    return timer() - start
+
+
+@benchmark
+async def fire_events_with_entity_filter(hass):
+    """Fire a million events to 1000 listeners filtered by entity_id."""
+    count = 0
+    event_name = "benchmark_event"
+    events_to_fire = 10 ** 6
+    event = asyncio.Event()
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == events_to_fire:
+            event.set()
+
+    for idx in range(1000):
+        hass.bus.async_listen(event_name, listener, entity_ids=[f"light.kitchen{idx}"])
+    event_data = {"entity_id": "light.kitchen0"}
+
+    for _ in range(events_to_fire):
+        hass.bus.async_fire(event_name, event_data)
+
+    start = timer()
+
+    await event.wait()
+
+    return timer() - start
+
+
 @benchmark
 async def time_changed_helper(hass):
     """Run a million events through time changed helper."""
@@ -185,6 +252,157 @@ async def state_changed_event_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def entity_service_call(hass):
+    """Call a service on one of 10000 entities ten thousand times."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers.entity import Entity
+    from homeassistant.helpers.entity_platform import EntityPlatform
+    from homeassistant.helpers.service import entity_service_call as service_call
+
+    class BenchmarkEntity(Entity):
+        """Entity that is not polled."""
+
+        @property
+        def should_poll(self):
+            """Return False to skip updating the state after the call."""
+            return False
+
+    platforms = []
+    for platform_idx in range(10):
+        platform = EntityPlatform(
+            hass=hass,
+            logger=logging.getLogger(__name__),
+            domain="light",
+            platform_name=f"benchmark_{platform_idx}",
+            platform=None,
+            scan_interval=timedelta(seconds=30),
+            entity_namespace=None,
+        )
+        for idx in range(1000):
+            entity = BenchmarkEntity()
+            entity.hass = hass
+            entity.entity_id = f"light.benchmark_{platform_idx}_{idx}"
+            platform.entities[entity.entity_id] = entity
+        platforms.append(platform)
+
+    @core.callback
+    def handle_call(entity, call):
+        """Handle the entity service call."""
+
+    call = core.ServiceCall("light", "turn_on", {"entity_id": "light.benchmark_9_999"})
+
+    with TemporaryDirectory() as config_dir:
+        # Needed to load the group integration to expand the entity ids
+        hass.config.config_dir = config_dir
+
+        start = timer()
+
+        for _ in range(10 ** 4):
+            await service_call(hass, platforms, handle_call, call)
+
+        return timer() - start
+
+
+@benchmark
+async def entity_write_state(hass):
+    """Write the state of a power sensor a hundred thousand times."""
+    return _entity_write_state(hass, frozenset())
+
+
+@benchmark
+async def entity_write_state_static_properties(hass):
+    """Write the state of a sensor with declared static properties."""
+    return _entity_write_state(
+        hass, frozenset({"name", "icon", "unit_of_measurement", "device_class"})
+    )
+
+
+def _entity_write_state(hass, static_properties):
+    """Write the state of a power sensor a hundred thousand times."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers.entity import Entity
+
+    class PowerSensor(Entity):
+        """Sensor with static attributes and a changing state."""
+
+        _static_properties = static_properties
+        power = 0
+
+        @property
+        def name(self):
+            """Return the name of the sensor."""
+            return "Power"
+
+        @property
+        def icon(self):
+            """Return the icon of the sensor."""
+            return "mdi:flash"
+
+        @property
+        def unit_of_measurement(self):
+            """Return the unit of the sensor."""
+            return "W"
+
+        @property
+        def device_class(self):
+            """Return the device class of the sensor."""
+            return "power"
+
+        @property
+        def state(self):
+            """Return the power."""
+            return self.power
+
+        @property
+        def device_state_attributes(self):
+            """Return the attributes of the sensor."""
+            return {f"phase_{idx}": idx for idx in range(3)}
+
+    sensor = PowerSensor()
+    sensor.hass = hass
+    sensor.entity_id = "sensor.power"
+
+    start = timer()
+
+    for power in range(10 ** 5):
+        sensor.power = power
+        sensor.async_write_ha_state()
+
+    return timer() - start
+
+
+@benchmark
+async def set_states_batch(hass):
+    """Set the states of 500 sensors in 200 batches with 10 listeners."""
+    count = 0
+    event = asyncio.Event()
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == 10 * 500 * 200:
+            event.set()
+
+    for _ in range(10):
+        hass.bus.async_listen(EVENT_STATE_CHANGED, listener)
+    entity_ids = [f"sensor.power_{idx}" for idx in range(500)]
+
+    start = timer()
+
+    for value in range(200):
+        with hass.states.async_batch():
+            for entity_id in entity_ids:
+                hass.states.async_set(entity_id, value)
+
+    await event.wait()
+
+    return timer() - start
+
+
 @benchmark
 async def logbook_filtering_state(hass):
     """Filter state changes."""
@@ -323,6 +541,98 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def recorder_write_states(hass):
+    """Persist 100k state changes of 100 entities, 400 per commit."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components import recorder
+
+    count = 10 ** 5
+    instance = hass.data[recorder.DATA_INSTANCE] = recorder.Recorder(
+        hass,
+        auto_purge=False,
+        keep_days=1,
+        commit_interval=1,
+        uri="sqlite://",
+        db_max_retries=1,
+        db_retry_wait=0,
+        entity_filter=lambda entity_id: True,
+        exclude_t=[],
+        db_integrity_check=False,
+    )
+    hass.state = core.CoreState.running
+    instance.async_initialize()
+    instance.start()
+    await instance.async_db_ready
+
+    start = timer()
+
+    for idx in range(count):
+        hass.states.async_set(
+            f"sensor.power_{idx % 100}", idx, {"unit_of_measurement": "W"}
+        )
+        if idx % 400 == 399:
+            hass.bus.async_fire(EVENT_TIME_CHANGED, {ATTR_NOW: dt_util.utcnow()})
+
+    await hass.async_add_executor_job(instance.block_till_done)
+
+    runtime = timer() - start
+    print(f"Persisted {count / runtime:.0f} events per second")
+    return runtime
+
+
+@benchmark
+async def mqtt_route_messages(hass):
+    """Route 100k MQTT messages on 10k topics to 3000 subscriptions."""
+    # pylint: disable=import-outside-toplevel
+    from paho.mqtt.client import MQTTMessage
+
+    from homeassistant import config_entries
+    from homeassistant.components import mqtt
+
+    conf = mqtt.CONFIG_SCHEMA({mqtt.DOMAIN: {mqtt.CONF_BROKER: "localhost"}})
+    entry = config_entries.ConfigEntry(
+        1,
+        mqtt.DOMAIN,
+        "MQTT",
+        {},
+        config_entries.SOURCE_USER,
+        config_entries.CONN_CLASS_LOCAL_PUSH,
+        {},
+    )
+    client = mqtt.MQTT(hass, entry, conf[mqtt.DOMAIN])
+    count = 0
+
+    @core.callback
+    def message_received(_):
+        """Handle message."""
+        nonlocal count
+        count += 1
+
+    for idx in range(1000):
+        await client.async_subscribe(f"home/device_{idx}/state", message_received, 0)
+        await client.async_subscribe(f"home/device_{idx}/state", message_received, 0)
+        await client.async_subscribe(f"home/device_{idx}/+/set", message_received, 0)
+
+    messages = []
+    for idx in range(5000):
+        for topic in (f"home/device_{idx}/state", f"home/device_{idx}/light/set"):
+            msg = MQTTMessage(topic=topic.encode())
+            msg.payload = b"ON"
+            messages.append(msg)
+
+    start = timer()
+
+    for _ in range(10):
+        for msg in messages:
+            client._mqtt_handle_message(msg)  # pylint: disable=protected-access
+
+    runtime = timer() - start
+    assert count == 10 * 1000 * 3
+    print(f"Routed {10 * len(messages) / runtime:.0f} messages per second")
+    return runtime
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -350,9 +660,12 @@ def _create_state_changed_event_from_old_new(
         ],
     )
 
-    row.event_type = EVENT_STATE_CHANGED
-    row.event_data = "{}"
-    row.attributes = attributes_json
+    row.event_type = None
+    row.shared_event_type = EVENT_STATE_CHANGED
+    row.event_data = None
+    row.shared_data = None
+    row.attributes = None
+    row.shared_attrs = attributes_json
     row.time_fired = event_time_fired
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
@@ -72,6 +72,12 @@ def run(script_args: List) -> int:
     parser.add_argument(
         "-s", "--secrets", action="store_true", help="Show secret information"
     )
+    parser.add_argument(
+        "-t",
+        "--timing",
+        action="store_true",
+        help="Show how long the config of each integration took to validate",
+    )
 
     args, unknown = parser.parse_known_args()
     if unknown:
@@ -148,6 +154,15 @@ def run(script_args: List) -> int:
                 color("cyan", "[from:", flatsecret.get(skey, "keyring") + "]"),
             )
 
+    if args.timing and "components" in res:
+        print(color(C_HEAD, "Validation time per integration:"))
+        for domain, seconds in sorted(
+            res["components"].validation_times.items(),
+            key=lambda item: item[1],
+            reverse=True,
+        ):
+            print(" -", domain + ":", f"{seconds:.3f}s")
+
     return len(res["except"])
 
 
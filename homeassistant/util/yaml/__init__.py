@@ -2,7 +2,13 @@
 from .const import _SECRET_NAMESPACE, SECRET_YAML
 from .dumper import dump, save_yaml
 from .input import UndefinedSubstitution, extract_inputs, substitute
-from .loader import clear_secret_cache, load_yaml, parse_yaml, secret_yaml
+from .loader import (
+    clear_secret_cache,
+    load_yaml,
+    load_yaml_cached,
+    parse_yaml,
+    secret_yaml,
+)
 from .objects import Input
 
 __all__ = [
@@ -13,6 +19,7 @@ __all__ = [
     "save_yaml",
     "clear_secret_cache",
     "load_yaml",
+    "load_yaml_cached",
     "secret_yaml",
     "parse_yaml",
     "UndefinedSubstitution",
@@ -1,10 +1,28 @@
 """Custom loader."""
 from collections import OrderedDict
+from contextvars import ContextVar
 import fnmatch
+import hashlib
 import logging
 import os
+import pickle
 import sys
-from typing import Dict, Iterator, List, TextIO, TypeVar, Union, overload
+import tempfile
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+    overload,
+)
 
 import yaml
 
@@ -35,6 +53,18 @@ __SECRET_CACHE: Dict[str, JSON_TYPE] = {}
 CREDSTASH_WARN = False
 KEYRING_WARN = False
 
+YAML_CACHE_VERSION = 2
+
+# The coarsest modification time resolution of the file systems in use, FAT
+# has 2 seconds. A file modified this close to when it was read may have been
+# modified again without a new modification time.
+MTIME_RESOLUTION_NS = 2 * 10 ** 9
+
+# What the YAML being loaded by load_yaml_cached depends on, by "kind:name"
+_DEPENDENCIES: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
+    "yaml_dependencies", default=None
+)
+
 
 def clear_secret_cache() -> None:
     """Clear the secret cache.
@@ -55,8 +85,148 @@ class SafeLineLoader(yaml.SafeLoader):
         return node
 
 
+def _track_dependency(key: str, value_func: Callable[[], Any]) -> None:
+    """Record something that the YAML being loaded depends on."""
+    dependencies = _DEPENDENCIES.get()
+    if dependencies is not None and key not in dependencies:
+        dependencies[key] = value_func()
+
+
+def _file_signature(fname: str) -> Optional[Tuple[int, int, int, int, str, int]]:
+    """Return the stat and hash of a file and when it was read.
+
+    The stat is the modification time, size, change time and inode.
+    """
+    try:
+        with open(fname, "rb") as fil:
+            read_at = time.time_ns()
+            stat = os.fstat(fil.fileno())
+            return (
+                stat.st_mtime_ns,
+                stat.st_size,
+                stat.st_ctime_ns,
+                stat.st_ino,
+                hashlib.sha256(fil.read()).hexdigest(),
+                read_at,
+            )
+    except OSError:
+        return None
+
+
+def _dir_signature(directory: str) -> Optional[List[str]]:
+    """Return the entries of a directory."""
+    try:
+        return sorted(os.listdir(directory))
+    except OSError:
+        return None
+
+
+def _dependency_changed(key: str, value: Any) -> bool:
+    """Return if something that a cached YAML file depends on changed."""
+    kind, name = key.split(":", 1)
+    if kind == "env":
+        return os.environ.get(name) != value
+    if kind == "dir":
+        return _dir_signature(name) != value
+    if kind != "file":
+        return True
+
+    try:
+        stat = os.stat(name)
+    except OSError:
+        return value is not None
+    if value is None:
+        return True
+    # The hash is only skipped when the stat is unchanged and the file was
+    # read long enough after it was modified. The hash also tells if a file
+    # that was only touched still has the same content.
+    if (stat.st_mtime_ns, stat.st_size, stat.st_ctime_ns, stat.st_ino,) == value[
+        :4
+    ] and value[5] - stat.st_mtime_ns > MTIME_RESOLUTION_NS:
+        return False
+    signature = _file_signature(name)
+    return signature is None or signature[4] != value[4]
+
+
+def load_yaml_cached(fname: str, cache_fname: str) -> JSON_TYPE:
+    """Load a YAML file, reusing the parsed tree while its sources are unchanged.
+
+    The tree is pickled, so the file names and line numbers of its nodes are
+    kept for error messages. The cache is used while every loaded file,
+    included directory and environment variable is unchanged. Secrets from
+    keyring or credstash are not cached.
+    """
+    data = _load_yaml_cache(fname, cache_fname)
+    if data is not None:
+        return data
+
+    token = _DEPENDENCIES.set({})
+    try:
+        data = load_yaml(fname)
+        dependencies = _DEPENDENCIES.get()
+    finally:
+        _DEPENDENCIES.reset(token)
+
+    _save_yaml_cache(
+        cache_fname,
+        {
+            "version": YAML_CACHE_VERSION,
+            "file": fname,
+            "dependencies": dependencies,
+            "data": data,
+        },
+    )
+    return data
+
+
+def _load_yaml_cache(fname: str, cache_fname: str) -> Optional[JSON_TYPE]:
+    """Return the cached tree of a YAML file if it is still valid."""
+    try:
+        with open(cache_fname, "rb") as cache_file:
+            cache = pickle.load(cache_file)
+    except FileNotFoundError:
+        return None
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.debug("Unable to read YAML cache %s: %s", cache_fname, err)
+        return None
+
+    if (
+        not isinstance(cache, dict)
+        or cache.get("version") != YAML_CACHE_VERSION
+        or cache.get("file") != fname
+        or any(
+            _dependency_changed(key, value)
+            for key, value in cache["dependencies"].items()
+        )
+    ):
+        return None
+
+    _LOGGER.debug("Loaded %s from YAML cache", fname)
+    return cast(JSON_TYPE, cache["data"])
+
+
+def _save_yaml_cache(cache_fname: str, cache: Dict[str, Any]) -> None:
+    """Save a YAML cache, it is only readable by the owner as it has secrets."""
+    tmp_fname = ""
+    try:
+        data = pickle.dumps(cache, pickle.HIGHEST_PROTOCOL)
+        cache_dir = os.path.dirname(cache_fname)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Modern versions of Python tempfile create this file with mode 0o600
+        with tempfile.NamedTemporaryFile(dir=cache_dir, delete=False) as fdesc:
+            fdesc.write(data)
+            tmp_fname = fdesc.name
+        os.replace(tmp_fname, cache_fname)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError) as err:
+        _LOGGER.warning("Unable to save YAML cache %s: %s", cache_fname, err)
+    finally:
+        if tmp_fname and os.path.exists(tmp_fname):
+            os.remove(tmp_fname)
+
+
 def load_yaml(fname: str) -> JSON_TYPE:
     """Load a YAML file."""
+    _track_dependency(f"file:{fname}", lambda: _file_signature(fname))
     try:
         with open(fname, encoding="utf-8") as conf_file:
             return parse_yaml(conf_file)
@@ -131,7 +301,9 @@ def _is_file_valid(name: str) -> bool:
 
 def _find_files(directory: str, pattern: str) -> Iterator[str]:
     """Recursively load files in a directory."""
+    _track_dependency(f"dir:{directory}", lambda: _dir_signature(directory))
     for root, dirs, files in os.walk(directory, topdown=True):
+        _track_dependency(f"dir:{root}", lambda: _dir_signature(root))
         dirs[:] = [d for d in dirs if _is_file_valid(d)]
         for basename in sorted(files):
             if _is_file_valid(basename) and fnmatch.fnmatch(basename, pattern):
@@ -236,6 +408,7 @@ def _construct_seq(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
 def _env_var_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> str:
     """Load environment variables and embed it into the configuration YAML."""
     args = node.value.split()
+    _track_dependency(f"env:{args[0]}", lambda: os.environ.get(args[0]))
 
     # Check for a default value
     if len(args) > 1:
@@ -249,6 +422,7 @@ def _env_var_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> str:
 def _load_secret_yaml(secret_path: str) -> JSON_TYPE:
     """Load the secrets yaml from path."""
     secret_path = os.path.join(secret_path, SECRET_YAML)
+    _track_dependency(f"file:{secret_path}", lambda: _file_signature(secret_path))
     if secret_path in __SECRET_CACHE:
         return __SECRET_CACHE[secret_path]
 
@@ -307,6 +481,7 @@ def secret_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
                 )
 
             _LOGGER.debug("Secret %s retrieved from keyring", node.value)
+            _track_dependency(f"keyring:{node.value}", lambda: None)
             return pwd
 
     global credstash  # pylint: disable=invalid-name, global-statement
@@ -324,6 +499,7 @@ def secret_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
                         "Credstash is deprecated and will be removed in March 2021."
                     )
                 _LOGGER.debug("Secret %s retrieved from credstash", node.value)
+                _track_dependency(f"credstash:{node.value}", lambda: None)
                 return pwd
         except credstash.ItemNotFound:
             pass
@@ -7,7 +7,9 @@ import unittest
 from unittest.mock import patch, sentinel
 
 from homeassistant.components import history, recorder
+from homeassistant.components.recorder import statistics
 from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.util import session_scope
 import homeassistant.core as ha
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.setup import async_setup_component, setup_component
@@ -268,6 +270,62 @@ class TestComponentHistory(unittest.TestCase):
 
         assert states == hist
 
+    def test_get_significant_states_max_points(self):
+        """Test that states are downsampled keeping the peaks of each bucket."""
+        self.test_setup()
+        zero = dt_util.utcnow()
+        values = [str(minute % 7) for minute in range(60)]
+        values[17] = "1000"
+        values[40] = "-5"
+        for minute, value in enumerate(values):
+            with patch(
+                "homeassistant.core.dt_util.utcnow",
+                return_value=zero + timedelta(minutes=minute),
+            ):
+                self.hass.states.set("sensor.power", value)
+        wait_recording_done(self.hass)
+
+        hist = history.get_significant_states(
+            self.hass,
+            zero - timedelta(seconds=1),
+            zero + timedelta(minutes=60),
+            entity_ids=["sensor.power"],
+            include_start_time_state=False,
+            max_points=12,
+        )
+
+        states = [state.state for state in hist["sensor.power"]]
+        assert len(states) <= 12
+        assert "1000" in states
+        assert "-5" in states
+        assert states[-1] == values[-1]
+
+    def test_get_significant_states_few_max_points(self):
+        """Test the state at the start time counts towards max_points."""
+        self.test_setup()
+        zero = dt_util.utcnow()
+        for minute in range(-1, 10):
+            with patch(
+                "homeassistant.core.dt_util.utcnow",
+                return_value=zero + timedelta(minutes=minute),
+            ):
+                self.hass.states.set("sensor.power", str(minute))
+        wait_recording_done(self.hass)
+
+        for max_points, expected in (
+            (1, ["9"]),
+            (2, ["-1", "9"]),
+            (3, ["-1", "8", "9"]),
+        ):
+            hist = history.get_significant_states(
+                self.hass,
+                zero - timedelta(seconds=1),
+                zero + timedelta(minutes=10),
+                entity_ids=["sensor.power"],
+                max_points=max_points,
+            )
+            assert [state.state for state in hist["sensor.power"]] == expected
+
     def test_get_significant_states_with_initial(self):
         """Test that only significant states are returned.
 
@@ -803,6 +861,119 @@ async def test_fetch_period_api_with_no_timestamp(hass, hass_client):
     assert response.status == 200
 
 
+async def test_fetch_period_api_with_aggregate(hass, hass_client):
+    """Test the fetch period view serving long-term statistics."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    instance = hass.data[recorder.DATA_INSTANCE]
+    await hass.async_add_executor_job(instance.block_till_done)
+
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    hass.states.async_set("sensor.temperature", "10")
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(instance.block_till_done)
+    await hass.async_add_executor_job(statistics.compile_statistics, instance, start)
+
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}?aggregate=hour"
+    )
+    assert response.status == 200
+    assert await response.json() == [
+        [
+            {
+                "entity_id": "sensor.temperature",
+                "start": start.isoformat(),
+                "mean": 10.0,
+                "min": 10.0,
+                "max": 10.0,
+            }
+        ]
+    ]
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}?aggregate=minute"
+    )
+    assert response.status == 400
+
+
+async def test_fetch_period_api_with_aggregate_filters(hass, hass_client):
+    """Test the long-term statistics are filtered and kept in include order."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(
+        hass,
+        "history",
+        {
+            "history": {
+                "use_include_order": True,
+                "include": {
+                    "entities": ["sensor.b", "sensor.a"],
+                    "entity_globs": ["sensor.c*"],
+                },
+                "exclude": {"entities": ["sensor.cold"]},
+            }
+        },
+    )
+    instance = hass.data[recorder.DATA_INSTANCE]
+    await hass.async_add_executor_job(instance.block_till_done)
+
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    for entity_id in ("sensor.a", "sensor.b", "sensor.cow", "sensor.cold", "sensor.d"):
+        hass.states.async_set(entity_id, "10")
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(instance.block_till_done)
+    await hass.async_add_executor_job(statistics.compile_statistics, instance, start)
+
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}?aggregate=hour"
+    )
+    assert response.status == 200
+    assert [rows[0]["entity_id"] for rows in await response.json()] == [
+        "sensor.b",
+        "sensor.a",
+        "sensor.cow",
+    ]
+
+
+async def test_fetch_period_api_with_max_points(hass, hass_client):
+    """Test the fetch period view for history with max_points."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{dt_util.utcnow().isoformat()}?max_points=100"
+    )
+    assert response.status == 200
+
+    response = await client.get(
+        f"/api/history/period/{dt_util.utcnow().isoformat()}?max_points=many"
+    )
+    assert response.status == 400
+
+    start = dt_util.utcnow()
+    for value in range(5):
+        hass.states.async_set("sensor.power", str(value))
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    for max_points in (1, 2):
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}",
+            params={"filter_entity_id": "sensor.power", "max_points": max_points},
+        )
+        assert response.status == 200
+        response_json = await response.json()
+        assert len(response_json[0]) == max_points
+        assert response_json[0][-1]["state"] == "4"
+
+
 async def test_fetch_period_api_with_include_order(hass, hass_client):
     """Test the fetch period view for history."""
     await hass.async_add_executor_job(init_recorder_component, hass)
@@ -1008,3 +1179,81 @@ async def test_entity_ids_limit_via_api_with_skip_initial_state(hass, hass_clien
     assert len(response_json) == 2
     assert response_json[0][0]["entity_id"] == "light.kitchen"
     assert response_json[1][0]["entity_id"] == "light.cow"
+
+
+async def test_entity_ids_fetched_in_one_query(hass, hass_client):
+    """Test the requested entities are read at once and keep their order."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {"history": {}})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.cow", "on")
+    hass.states.async_set("light.attic", "on")
+
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    with patch(
+        "homeassistant.components.history._iter_significant_states",
+        wraps=history._iter_significant_states,
+    ) as iter_states:
+        response = await client.get(
+            f"/api/history/period/{dt_util.utcnow().isoformat()}",
+            params={
+                "filter_entity_id": "light.kitchen,light.missing,light.attic,light.cow"
+            },
+        )
+    assert response.status == 200
+    response_json = await response.json()
+    assert [states[0]["entity_id"] for states in response_json] == [
+        "light.kitchen",
+        "light.attic",
+        "light.cow",
+    ]
+    assert iter_states.call_count == 1
+
+
+async def test_entity_ids_read_in_requested_order(hass, hass_client):
+    """Test the requested entities are read in order, with or without changes."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {"history": {}})
+    instance = hass.data[recorder.DATA_INSTANCE]
+    await hass.async_add_executor_job(instance.block_till_done)
+    hass.states.async_set("light.attic", "on")
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(instance.block_till_done)
+
+    start = dt_util.utcnow()
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.cow", "on")
+    hass.states.async_set("light.cow", "off")
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(instance.block_till_done)
+
+    def read_states():
+        with session_scope(hass=hass) as session:
+            return list(
+                history._iter_significant_states(
+                    hass,
+                    session,
+                    start,
+                    entity_ids=["light.cow", "light.attic", "light.kitchen"],
+                )
+            )
+
+    entity_states = await hass.async_add_executor_job(read_states)
+    assert [
+        (entity_id, [state.state for state in states])
+        for entity_id, states in entity_states
+    ] == [
+        ("light.cow", ["on", "off"]),
+        ("light.attic", ["on"]),
+        ("light.kitchen", ["on"]),
+    ]
@@ -10,8 +10,11 @@ import pytz
 
 from homeassistant import config as hass_config
 from homeassistant.components.history_stats import DOMAIN
-from homeassistant.components.history_stats.sensor import HistoryStatsSensor
-from homeassistant.const import SERVICE_RELOAD, STATE_UNKNOWN
+from homeassistant.components.history_stats.sensor import (
+    HistoryStatsData,
+    HistoryStatsSensor,
+)
+from homeassistant.const import EVENT_STATE_CHANGED, SERVICE_RELOAD, STATE_UNKNOWN
 import homeassistant.core as ha
 from homeassistant.helpers.template import Template
 from homeassistant.setup import async_setup_component, setup_component
@@ -258,6 +261,83 @@ class TestHistoryStatsSensor(unittest.TestCase):
         assert sensor3.state == 2
         assert sensor4.state == 50
 
+    def test_measure_incremental(self):
+        """Test the history is read once and then kept up to date."""
+        t0 = dt_util.utcnow() - timedelta(minutes=40)
+        t1 = t0 + timedelta(minutes=20)
+        t2 = dt_util.utcnow() - timedelta(minutes=10)
+
+        # Start     t0        t1        t2        End
+        # |--20min--|--20min--|--10min--|--10min--|
+        # |---off---|---on----|---off---|---on----|
+
+        fake_states = {
+            "binary_sensor.test_id": [
+                ha.State("binary_sensor.test_id", "on", last_changed=t0),
+                ha.State("binary_sensor.test_id", "off", last_changed=t1),
+            ]
+        }
+
+        start = Template("{{ as_timestamp(now()) - 3600 }}", self.hass)
+        end = Template("{{ now() }}", self.hass)
+
+        sensor = HistoryStatsSensor(
+            self.hass, "binary_sensor.test_id", "on", start, end, None, "time", "Test"
+        )
+
+        with patch(
+            "homeassistant.components.history.state_changes_during_period",
+            return_value=fake_states,
+        ) as state_changes, patch(
+            "homeassistant.components.history.get_state",
+            return_value=ha.State("binary_sensor.test_id", "off"),
+        ) as get_state, patch.object(
+            sensor, "async_schedule_update_ha_state"
+        ) as schedule_update:
+            sensor.update()
+            assert sensor.state == 0.33
+            assert sensor.count == 1
+
+            sensor._async_state_changed(
+                ha.Event(
+                    EVENT_STATE_CHANGED,
+                    {
+                        "new_state": ha.State(
+                            "binary_sensor.test_id", "on", last_changed=t2
+                        )
+                    },
+                )
+            )
+            assert schedule_update.called
+            sensor.update()
+
+        assert sensor.state == 0.5
+        assert sensor.count == 2
+        assert state_changes.call_count == 1
+        assert get_state.call_count == 1
+
+    def test_history_stats_data(self):
+        """Test the running totals when the period slides."""
+        data = HistoryStatsData(0, None)
+        assert not data.has_data
+
+        data.add(10, True)
+        data.add(20, False)
+        data.add(25, False)
+        data.add(30, True)
+        # Older changes are ignored
+        data.add(5, False)
+        assert data.has_data
+        assert data.measure(40) == (20, 2)
+        # The period ends before the last change
+        assert data.measure(25) == (10, 1)
+
+        data.trim(15)
+        assert data.measure(40) == (15, 1)
+
+        data.trim(35)
+        assert data.measure(40) == (5, 0)
+
     def test_wrong_date(self):
         """Test when start or end value is not a timestamp or a date."""
         good = Template("{{ now() }}", self.hass)
@@ -1,6 +1,10 @@
 """Tests for Home Assistant View."""
-from unittest.mock import AsyncMock, Mock
+import asyncio
+from contextlib import suppress
+import json
+from unittest.mock import AsyncMock, Mock, patch
 
+from aiohttp import ClientError, web
 from aiohttp.web_exceptions import (
     HTTPBadRequest,
     HTTPInternalServerError,
@@ -9,6 +13,7 @@ from aiohttp.web_exceptions import (
 import pytest
 import voluptuous as vol
 
+from homeassistant.components.http.const import KEY_HASS
 from homeassistant.components.http.view import (
     HomeAssistantView,
     request_handler_factory,
@@ -69,3 +74,92 @@ async def test_not_running(mock_request_with_stopping):
         Mock(requires_auth=False), AsyncMock(side_effect=Unauthorized)
     )(mock_request_with_stopping)
     assert response.status == 503
+
+
+async def _stream_client(hass, aiohttp_client, items):
+    """Return a client of an app streaming the items."""
+    app = web.Application()
+    app[KEY_HASS] = hass
+
+    async def handler(request):
+        return await HomeAssistantView.json_stream(request, items)
+
+    app.router.add_get("/", handler)
+    return await aiohttp_client(app)
+
+
+async def test_json_stream(hass, aiohttp_client):
+    """Test streaming JSON in chunks."""
+    items = [{"number": number} for number in range(100)]
+    client = await _stream_client(hass, aiohttp_client, lambda: iter(items))
+
+    with patch("homeassistant.components.http.view.JSON_STREAM_CHUNK_SIZE", 50):
+        resp = await client.get("/")
+
+    assert resp.status == 200
+    assert resp.content_type == "application/json"
+    assert await resp.json() == items
+
+
+async def test_json_stream_empty(hass, aiohttp_client):
+    """Test streaming no items."""
+    client = await _stream_client(hass, aiohttp_client, list)
+
+    resp = await client.get("/")
+    assert resp.status == 200
+    assert await resp.json() == []
+
+
+async def test_json_stream_invalid_json(hass, aiohttp_client, caplog):
+    """Test streaming invalid JSON before anything has been sent."""
+    client = await _stream_client(hass, aiohttp_client, lambda: [float("NaN")])
+
+    resp = await client.get("/")
+    assert resp.status == 500
+    assert "Unable to serialize to JSON" in caplog.text
+
+
+async def test_json_stream_invalid_json_after_first_chunk(hass, aiohttp_client):
+    """Test the response is incomplete when an item can't be serialized."""
+
+    def items():
+        yield from range(10)
+        yield float("NaN")
+
+    client = await _stream_client(hass, aiohttp_client, items)
+
+    with patch("homeassistant.components.http.view.JSON_STREAM_CHUNK_SIZE", 1):
+        resp = await client.get("/")
+
+    assert resp.status == 200
+    with pytest.raises(ValueError):
+        json.loads(await resp.text())
+
+
+async def test_json_stream_write_timeout(hass, aiohttp_client, caplog):
+    """Test a client that doesn't receive the stream is disconnected."""
+    generated = []
+
+    def items():
+        for number in range(1000):
+            generated.append(number)
+            yield number
+
+    client = await _stream_client(hass, aiohttp_client, items)
+    write = web.StreamResponse.write
+
+    async def slow_write(response, data):
+        if data != b"[":
+            await asyncio.sleep(10)
+        await write(response, data)
+
+    with patch("homeassistant.components.http.view.JSON_STREAM_CHUNK_SIZE", 1), patch(
+        "homeassistant.components.http.view.JSON_STREAM_WRITE_TIMEOUT", 0.01
+    ), patch.object(web.StreamResponse, "write", slow_write):
+        resp = await client.get("/")
+        with suppress(ClientError):
+            await resp.read()
+
+    assert "Timed out writing a JSON response" in caplog.text
+    # The items stop being generated once the client is disconnected
+    assert len(generated) < 1000
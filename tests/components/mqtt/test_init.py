@@ -5,6 +5,7 @@ import json
 import ssl
 from unittest.mock import AsyncMock, MagicMock, call, mock_open, patch
 
+from paho.mqtt.client import MQTT_ERR_NO_CONN
 import pytest
 import voluptuous as vol
 
@@ -19,6 +20,7 @@ from homeassistant.const import (
     TEMP_CELSIUS,
 )
 from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import device_registry
 from homeassistant.setup import async_setup_component
 from homeassistant.util.dt import utcnow
@@ -313,6 +315,46 @@ async def test_all_subscriptions_run_when_decode_fails(
     assert len(calls) == 1
 
 
+async def test_messages_from_paho_thread_are_batched(hass, mqtt_mock):
+    """Test messages from the paho thread are queued and handled in batches."""
+    messages = []
+
+    @callback
+    def record_message(msg):
+        """Record the message."""
+        messages.append(msg)
+
+    await mqtt.async_subscribe(hass, "test-topic/+", record_message)
+    await mqtt.async_subscribe(hass, "test-topic/+", record_message)
+    await mqtt.async_subscribe(hass, "test-topic/+", record_message, encoding=None)
+
+    with patch.object(
+        hass.loop, "call_soon_threadsafe", wraps=hass.loop.call_soon_threadsafe
+    ) as call_soon_threadsafe:
+        # A flood of messages while the event loop is busy
+        for idx in range(mqtt.MAX_MESSAGE_BATCH + 10):
+            mqtt_mock._mqtt_on_message(
+                None, None, mqtt.Message(f"test-topic/{idx}", b"on", 0, False)
+            )
+    assert call_soon_threadsafe.call_count == 1
+
+    await asyncio.sleep(0)
+    assert len(messages) == 3 * mqtt.MAX_MESSAGE_BATCH
+
+    await hass.async_block_till_done()
+    assert len(messages) == 3 * (mqtt.MAX_MESSAGE_BATCH + 10)
+    assert [msg.topic for msg in messages[:4]] == [
+        "test-topic/0",
+        "test-topic/0",
+        "test-topic/0",
+        "test-topic/1",
+    ]
+    # The message is shared by subscriptions on the same filter and encoding
+    assert messages[0] is messages[1]
+    assert messages[0].payload == "on"
+    assert messages[2].payload == b"on"
+
+
 async def test_subscribe_topic(hass, mqtt_mock, calls, record_calls):
     """Test the subscription of a topic."""
     unsub = await mqtt.async_subscribe(hass, "test-topic", record_calls)
@@ -608,6 +650,81 @@ async def test_subscribe_same_topic(hass, mqtt_client_mock, mqtt_mock):
     mqtt_client_mock.subscribe.assert_called()
 
 
+async def test_subscribe_unsubscribe_coalesced(hass, mqtt_client_mock, mqtt_mock):
+    """Test concurrent subscribe and unsubscribe requests are sent together."""
+    # Fake that the client is connected
+    mqtt_mock().connected = True
+
+    with patch("homeassistant.components.mqtt.MAX_TOPICS_PER_REQUEST", 2):
+        unsubs = await asyncio.gather(
+            mqtt.async_subscribe(hass, "test/a", None),
+            mqtt.async_subscribe(hass, "test/b", None, qos=1),
+            mqtt.async_subscribe(hass, "test/a", None, qos=2),
+            mqtt.async_subscribe(hass, "test/c", None),
+        )
+        await hass.async_block_till_done()
+
+        assert mqtt_client_mock.subscribe.mock_calls == [
+            call([("test/a", 2), ("test/b", 1)]),
+            call("test/c", 0),
+        ]
+
+        for unsub in unsubs[1:]:
+            unsub()
+        await hass.async_block_till_done()
+
+    # test/a still has a subscription
+    mqtt_client_mock.unsubscribe.assert_called_once_with(["test/b", "test/c"])
+
+    stats = mqtt_mock().subscription_stats
+    assert stats.subscribe_packets == 2
+    assert stats.subscribed_topics == 3
+    assert stats.unsubscribe_packets == 1
+
+
+async def test_subscribe_error(hass, mqtt_client_mock, mqtt_mock):
+    """Test a failed subscribe is raised to the callers waiting for it."""
+    # Fake that the client is connected
+    mqtt_mock().connected = True
+    mqtt_client_mock.subscribe.side_effect = lambda *args: (MQTT_ERR_NO_CONN, None)
+
+    results = await asyncio.gather(
+        mqtt.async_subscribe(hass, "test/a", None),
+        mqtt.async_subscribe(hass, "test/b", None),
+        return_exceptions=True,
+    )
+    assert len(results) == 2
+    assert all(isinstance(result, HomeAssistantError) for result in results)
+
+
+async def test_pending_subscribe_on_disconnect(hass, mqtt_client_mock, mqtt_mock):
+    """Test queued requests are dropped on disconnect and fail on stop."""
+    mqtt_client = mqtt_mock()
+    # Fake that the client is connected
+    mqtt_client.connected = True
+
+    async with mqtt_client._paho_lock:
+        subscribe = hass.async_create_task(mqtt.async_subscribe(hass, "test/a", None))
+        await asyncio.sleep(0)
+        mqtt_client._mqtt_on_disconnect(None, None, 0)
+        # The sending task waits for the lock, so hass isn't done
+        for _ in range(3):
+            await asyncio.sleep(0)
+        # Subscribed again on the next connect
+        assert subscribe.done()
+        assert callable(subscribe.result())
+
+        mqtt_client.connected = True
+        subscribe = hass.async_create_task(mqtt.async_subscribe(hass, "test/b", None))
+        await asyncio.sleep(0)
+        await mqtt_client.async_disconnect()
+        with pytest.raises(HomeAssistantError, match="MQTT client stopped"):
+            await subscribe
+
+    await hass.async_block_till_done()
+    assert not mqtt_client_mock.subscribe.called
+
+
 async def test_not_calling_unsubscribe_with_active_subscribers(
     hass, mqtt_client_mock, mqtt_mock
 ):
@@ -811,6 +928,11 @@ async def test_default_birth_message(hass, mqtt_client_mock, mqtt_mock):
             "homeassistant/status", "online", 0, False
         )
 
+    # How long discovery and subscriptions took to settle is recorded
+    stats = mqtt_mock().subscription_stats
+    assert stats.startup_duration is not None
+    assert stats.subscribe_packets == 1
+
 
 @pytest.mark.parametrize(
     "mqtt_config",
@@ -877,16 +999,16 @@ async def test_mqtt_subscribes_topics_on_connect(hass, mqtt_client_mock, mqtt_mo
     await mqtt.async_subscribe(hass, "still/pending", None)
     await mqtt.async_subscribe(hass, "still/pending", None, 1)
 
-    hass.add_job = MagicMock()
     mqtt_mock._mqtt_on_connect(None, None, 0, 0)
 
     await hass.async_block_till_done()
 
     assert mqtt_client_mock.disconnect.call_count == 0
 
-    expected = {"topic/test": 0, "home/sensor": 2, "still/pending": 1}
-    calls = {call[1][1]: call[1][2] for call in hass.add_job.mock_calls}
-    assert calls == expected
+    # All topics are re-subscribed in one request
+    mqtt_client_mock.subscribe.assert_called_once_with(
+        [("topic/test", 0), ("home/sensor", 2), ("still/pending", 1)]
+    )
 
 
 async def test_setup_fails_without_config(hass):
@@ -0,0 +1,61 @@
+"""The tests for the MQTT subscription matcher."""
+from paho.mqtt.matcher import MQTTMatcher
+import pytest
+
+from homeassistant.components.mqtt.matcher import SubscriptionMatcher
+
+FILTERS = [
+    "a/b/c",
+    "a/+/c",
+    "a/#",
+    "#",
+    "+/+/+",
+    "+",
+    "a/b",
+    "a/b/#",
+    "$SYS/#",
+    "$SYS/+",
+    "+/broker",
+    "a//c",
+    "a/+/",
+]
+
+
+@pytest.mark.parametrize(
+    "topic",
+    ["a/b/c", "a/b", "a", "b", "a/x/c", "a/b/c/d", "$SYS/broker", "x/broker", "a//c"],
+)
+def test_match_like_paho(topic):
+    """Test the subscriptions matching a topic are the same as paho-mqtt."""
+    matcher = SubscriptionMatcher()
+    for topic_filter in FILTERS:
+        matcher.add(topic_filter, topic_filter)
+
+    expected = []
+    for topic_filter in FILTERS:
+        paho_matcher = MQTTMatcher()
+        paho_matcher[topic_filter] = topic_filter
+        if next(paho_matcher.iter_match(topic), None) is not None:
+            expected.append(topic_filter)
+
+    assert matcher.match(topic) == expected
+
+
+def test_add_remove():
+    """Test subscriptions are matched in order and can be removed."""
+    matcher = SubscriptionMatcher()
+    matcher.add("a/+", "first")
+    matcher.add("a/b", "second")
+    matcher.add("a/+", "third")
+    assert matcher.match("a/b") == ["first", "second", "third"]
+
+    matcher.remove("a/+", "first")
+    assert matcher.match("a/b") == ["second", "third"]
+    matcher.remove("a/b", "second")
+    matcher.remove("a/+", "third")
+    assert matcher.match("a/b") == []
+    # Levels without subscriptions are pruned
+    assert not matcher._root.children
+
+    with pytest.raises(KeyError):
+        matcher.remove("a/+", "first")
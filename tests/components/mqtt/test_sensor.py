@@ -204,6 +204,37 @@ async def test_setting_sensor_value_via_mqtt_json_message(hass, mqtt_mock):
     assert state.state == "100"
 
 
+async def test_json_payload_parsed_once(hass, mqtt_mock):
+    """Test sensors on the same topic share the parsed JSON payload."""
+    assert await async_setup_component(
+        hass,
+        sensor.DOMAIN,
+        {
+            sensor.DOMAIN: [
+                {
+                    "platform": "mqtt",
+                    "name": key,
+                    "state_topic": "test-topic",
+                    "value_template": f"{{{{ value_json.{key} }}}}",
+                }
+                for key in ("temperature", "humidity", "battery")
+            ]
+        },
+    )
+    await hass.async_block_till_done()
+
+    with patch("homeassistant.helpers.template.json.loads", wraps=json.loads) as loads:
+        async_fire_mqtt_message(
+            hass, "test-topic", '{"temperature": 21, "humidity": 40, "battery": 90}'
+        )
+        await hass.async_block_till_done()
+
+    assert loads.call_count == 1
+    assert hass.states.get("sensor.temperature").state == "21"
+    assert hass.states.get("sensor.humidity").state == "40"
+    assert hass.states.get("sensor.battery").state == "90"
+
+
 async def test_force_update_disabled(hass, mqtt_mock):
     """Test force update option."""
     assert await async_setup_component(
@@ -1,7 +1,7 @@
 """The tests for the Recorder component."""
 # pylint: disable=protected-access
 from datetime import datetime, timedelta
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from sqlalchemy.exc import OperationalError
 
@@ -14,7 +14,15 @@ from homeassistant.components.recorder import (
     run_information_with_session,
 )
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    EventData,
+    Events,
+    EventTypes,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
+from homeassistant.components.recorder.shared import RowIds
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import MATCH_ALL, STATE_LOCKED, STATE_UNLOCKED
 from homeassistant.core import Context, callback
@@ -55,17 +63,14 @@ def test_saving_state_with_exception(hass, hass_recorder, caplog):
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    def _throw_if_state_in_session(*args, **kwargs):
-        for obj in hass.data[DATA_INSTANCE].event_session:
-            if isinstance(obj, States):
-                raise OperationalError(
-                    "insert the state", "fake params", "forced to fail"
-                )
+    def _throw_if_inserting_states(statement, *args, **kwargs):
+        if getattr(statement, "table", None) is States.__table__:
+            raise OperationalError("insert the state", "fake params", "forced to fail")
 
     with patch("time.sleep"), patch.object(
         hass.data[DATA_INSTANCE].event_session,
-        "flush",
-        side_effect=_throw_if_state_in_session,
+        "execute",
+        side_effect=_throw_if_inserting_states,
     ):
         hass.states.set(entity_id, "fail", attributes)
         wait_recording_done(hass)
@@ -112,7 +117,11 @@ def test_saving_event(hass, hass_recorder):
     hass.data[DATA_INSTANCE].block_till_done()
 
     with session_scope(hass=hass) as session:
-        db_events = list(session.query(Events).filter_by(event_type=event_type))
+        db_events = list(
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == event_type)
+        )
         assert len(db_events) == 1
         db_event = db_events[0].to_native()
 
@@ -432,6 +441,117 @@ def test_saving_sets_old_state(hass_recorder):
         assert states[3].old_state_id == states[1].state_id
 
 
+def test_saving_sets_old_state_within_one_commit(hass_recorder):
+    """Test old state is linked when both states are saved in the same commit."""
+    hass = hass_recorder()
+
+    hass.states.set("test.one", "on", {})
+    hass.states.set("test.one", "off", {})
+    hass.states.set("test.one", "on", {})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert len(states) == 3
+
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id == states[0].state_id
+        assert states[2].old_state_id == states[1].state_id
+        assert len({state.event_id for state in states}) == 3
+        for state in states:
+            assert session.query(Events).get(state.event_id) is not None
+
+
+def test_saving_states_shares_attributes(hass_recorder):
+    """Test states with the same attributes share one attributes row."""
+    hass = hass_recorder()
+
+    hass.states.set("test.one", "on", {"friendly_name": "One"})
+    hass.states.set("test.one", "off", {"friendly_name": "One"})
+    wait_recording_done(hass)
+    hass.states.set("test.one", "on", {"friendly_name": "One"})
+    hass.states.set("test.two", "on", {"friendly_name": "Two"})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert len(states) == 4
+        assert len({state.attributes_id for state in states}) == 2
+        assert all(state.attributes is None for state in states)
+        assert states[2].to_native().attributes == {"friendly_name": "One"}
+        assert states[3].to_native().attributes == {"friendly_name": "Two"}
+        assert session.query(StateAttributes).count() == 2
+
+    # The shared attributes are looked up in the database
+    # when they are no longer known by the recorder thread
+    hass.data[DATA_INSTANCE]._state_attributes.clear()
+    hass.states.set("test.two", "off", {"friendly_name": "Two"})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StateAttributes).count() == 2
+
+
+def test_saving_events_shares_event_types_and_data(hass_recorder):
+    """Test events share their event type and data rows."""
+    hass = hass_recorder()
+
+    hass.bus.fire("test_event", {"shared": True})
+    hass.bus.fire("test_event", {"shared": True})
+    hass.bus.fire("test_event", {"shared": False})
+    hass.states.set("test.one", "on")
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        events = list(
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == "test_event")
+        )
+        assert len(events) == 3
+        assert len({event.event_type_id for event in events}) == 1
+        assert len({event.data_id for event in events}) == 2
+        assert all(event.event_type is None for event in events)
+        assert all(event.event_data is None for event in events)
+        assert [event.to_native().data for event in events] == [
+            {"shared": True},
+            {"shared": True},
+            {"shared": False},
+        ]
+
+        state_changed = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == "state_changed")
+            .one()
+        )
+        assert state_changed.data_id is None
+        assert state_changed.to_native().data == {}
+        assert session.query(EventData).count() == len(
+            {
+                event.data_id
+                for event in session.query(Events)
+                if event.data_id is not None
+            }
+        )
+
+
+def test_row_ids_from_postgresql_sequence():
+    """Test the ids are taken from the sequence of the column on PostgreSQL."""
+    session = Mock()
+    session.bind.dialect.name = "postgresql"
+    session.execute.return_value = [(8,), (7,)]
+
+    assert RowIds(States.__table__.c.state_id).reserve(session, 2) == [7, 8]
+    assert "nextval" in str(session.execute.call_args[0][0])
+    assert session.execute.call_args[0][1] == {
+        "table": "states",
+        "column": "state_id",
+        "count": 2,
+    }
+    session.query.assert_not_called()
+
+
 def test_saving_state_with_serializable_data(hass_recorder, caplog):
     """Test saving data that cannot be serialized does not crash."""
     hass = hass_recorder()
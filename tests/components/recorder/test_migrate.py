@@ -79,3 +79,59 @@ def test_forgiving_add_index():
     engine = create_engine("sqlite://", poolclass=StaticPool)
     models.Base.metadata.create_all(engine)
     migration._create_index(engine, "states", "ix_states_context_id")
+
+
+def test_move_state_attributes():
+    """Test that existing state attributes are moved to a shared table."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+    engine.execute(
+        models.States.__table__.insert(),
+        [
+            {"entity_id": "test.one", "attributes": '{"a": 1}'},
+            {"entity_id": "test.two", "attributes": '{"a": 1}'},
+            {"entity_id": "test.two", "attributes": '{"a": 2}'},
+        ],
+    )
+
+    migration._move_state_attributes(engine)
+
+    rows = engine.execute(
+        "SELECT states.attributes, state_attributes.shared_attrs FROM states "
+        "JOIN state_attributes "
+        "ON states.attributes_id = state_attributes.attributes_id "
+        "ORDER BY states.state_id"
+    ).fetchall()
+    assert rows == [(None, '{"a": 1}'), (None, '{"a": 1}'), (None, '{"a": 2}')]
+    assert engine.execute("SELECT COUNT(*) FROM state_attributes").scalar() == 2
+
+
+def test_move_event_types_and_data():
+    """Test that existing event types and data are moved to shared tables."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+    engine.execute(
+        models.Events.__table__.insert(),
+        [
+            {"event_type": "test_event", "event_data": '{"a": 1}'},
+            {"event_type": "test_event", "event_data": '{"a": 1}'},
+            {"event_type": "state_changed", "event_data": "{}"},
+        ],
+    )
+
+    migration._move_event_types_and_data(engine)
+
+    rows = engine.execute(
+        "SELECT events.event_type, events.event_data, "
+        "event_types.event_type, event_data.shared_data FROM events "
+        "JOIN event_types ON events.event_type_id = event_types.event_type_id "
+        "LEFT JOIN event_data ON events.data_id = event_data.data_id "
+        "ORDER BY events.event_id"
+    ).fetchall()
+    assert rows == [
+        (None, None, "test_event", '{"a": 1}'),
+        (None, None, "test_event", '{"a": 1}'),
+        (None, None, "state_changed", None),
+    ]
+    assert engine.execute("SELECT COUNT(*) FROM event_types").scalar() == 2
+    assert engine.execute("SELECT COUNT(*) FROM event_data").scalar() == 1
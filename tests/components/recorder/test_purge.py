@@ -5,16 +5,23 @@ from unittest.mock import patch
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.models import (
+    EventData,
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
+from homeassistant.components.recorder.purge import PurgeProgress, purge_old_data
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.util import dt as dt_util
 
 from .common import wait_recording_done
 
 
+@patch("homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 2)
 def test_purge_old_states(hass, hass_recorder):
-    """Test deleting old states."""
+    """Test deleting old states in batches."""
     hass = hass_recorder()
     _add_test_states(hass)
 
@@ -37,8 +44,9 @@ def test_purge_old_states(hass, hass_recorder):
         assert states.count() == 2
 
 
+@patch("homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 2)
 def test_purge_old_events(hass, hass_recorder):
-    """Test deleting old events."""
+    """Test deleting old events in batches."""
     hass = hass_recorder()
     _add_test_events(hass)
 
@@ -61,6 +69,34 @@ def test_purge_old_events(hass, hass_recorder):
         assert events.count() == 2
 
 
+@patch("homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 2)
+def test_purge_unused_shared_rows(hass, hass_recorder):
+    """Test deleting unused shared attributes and event data in batches."""
+    hass = hass_recorder()
+    with session_scope(hass=hass) as session:
+        for idx in range(3):
+            session.add(
+                StateAttributes(**StateAttributes.row_from_shared_attrs(f"[{idx}]"))
+            )
+            session.add(EventData(**EventData.row_from_shared_data(f"[{idx}]")))
+
+    with session_scope(hass=hass) as session:
+        attributes = session.query(StateAttributes)
+        event_data = session.query(EventData)
+        assert attributes.count() == 3
+        assert event_data.count() == 3
+
+        finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
+        assert not finished
+        assert attributes.count() == 1
+        assert event_data.count() == 1
+
+        finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
+        assert finished
+        assert attributes.count() == 0
+        assert event_data.count() == 0
+
+
 def test_purge_old_recorder_runs(hass, hass_recorder):
     """Test deleting old recorder runs keeps current run."""
     hass = hass_recorder()
@@ -77,6 +113,54 @@ def test_purge_old_recorder_runs(hass, hass_recorder):
         assert recorder_runs.count() == 1
 
 
+def test_purge_clears_old_state_references(hass, hass_recorder):
+    """Test purged states are no longer referenced as old state."""
+    hass = hass_recorder()
+    _add_test_states(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States).order_by(States.state_id))
+        for old_state, state in zip(states, states[1:]):
+            state.old_state_id = old_state.state_id
+
+    progress = PurgeProgress()
+    assert purge_old_data(hass.data[DATA_INSTANCE], 4, False, progress)
+    assert progress.states == 4
+    assert progress.batches == 1
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States).order_by(States.state_id))
+        assert [state.state for state in states] == ["dontpurgeme", "dontpurgeme"]
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id == states[0].state_id
+
+
+def test_recording_after_full_purge(hass, hass_recorder):
+    """Test the ids of purged rows are not reused by new rows."""
+    hass = hass_recorder()
+    hass.states.set("test.one", "on", {"shared": True})
+    hass.states.set("test.two", "on", {"shared": False})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        purged_state_ids = {state.state_id for state in session.query(States)}
+        purged_event_ids = {event.event_id for event in session.query(Events)}
+
+    hass.data[DATA_INSTANCE].do_adhoc_purge(keep_days=0)
+    wait_recording_done(hass)
+
+    hass.states.set("test.one", "off", {"shared": True})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        state = session.query(States).one()
+        assert state.state_id > max(purged_state_ids)
+        assert state.event_id > max(purged_event_ids)
+        assert state.old_state_id is None
+        attributes = session.query(StateAttributes).get(state.attributes_id)
+        assert json.loads(attributes.shared_attrs) == {"shared": True}
+
+
 def test_purge_method(hass, hass_recorder):
     """Test purge method."""
     hass = hass_recorder()
@@ -0,0 +1,227 @@
+"""The tests for the long-term statistics of the recorder."""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.recorder import StatisticsTask
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.recorder.models import States, Statistics
+from homeassistant.components.recorder.statistics import (
+    PERIOD_DAY,
+    PERIOD_HOUR,
+    compile_statistics,
+    statistics_during_period,
+    uncompiled_hours,
+)
+from homeassistant.components.recorder.util import session_scope
+import homeassistant.util.dt as dt_util
+
+from .common import wait_recording_done
+
+ZERO = datetime(2021, 1, 1, 22, tzinfo=dt_util.UTC)
+
+
+def _add_states(hass, states):
+    """Add states of (entity_id, state, minutes after ZERO) to the database."""
+    with session_scope(hass=hass) as session:
+        for entity_id, state, minutes in states:
+            last_updated = ZERO + timedelta(minutes=minutes)
+            session.add(
+                States(
+                    entity_id=entity_id,
+                    domain=entity_id.split(".")[0],
+                    state=state,
+                    attributes="{}",
+                    last_changed=last_updated,
+                    last_updated=last_updated,
+                )
+            )
+
+
+def test_compile_hourly_statistics(hass_recorder):
+    """Test the hourly statistics are weighted by the duration of each state."""
+    hass = hass_recorder()
+    _add_states(
+        hass,
+        [
+            ("sensor.temperature", "10", -30),
+            ("sensor.temperature", "20", 15),
+            ("sensor.temperature", "unavailable", 30),
+            ("sensor.temperature", "30", 45),
+            ("sensor.text", "on", 10),
+            ("light.kitchen", "5", 10),
+        ],
+    )
+
+    compile_statistics(hass.data[DATA_INSTANCE], ZERO)
+    # Compiled periods are not compiled again
+    compile_statistics(hass.data[DATA_INSTANCE], ZERO)
+
+    stats = statistics_during_period(hass, ZERO)
+    assert list(stats) == ["sensor.temperature"]
+    assert stats["sensor.temperature"] == [
+        {
+            "entity_id": "sensor.temperature",
+            "start": ZERO.isoformat(),
+            "mean": pytest.approx((10 * 15 + 20 * 15 + 30 * 15) / 45),
+            "min": 10.0,
+            "max": 30.0,
+        }
+    ]
+
+
+def test_compile_statistics_removed_entity(hass_recorder):
+    """Test the time an entity was removed during the hour is skipped."""
+    hass = hass_recorder()
+    _add_states(
+        hass,
+        [
+            ("sensor.temperature", "10", -30),
+            ("sensor.temperature", None, 20),
+            ("sensor.temperature", "30", 40),
+            ("sensor.removed", "5", -30),
+            ("sensor.removed", None, 30),
+        ],
+    )
+
+    compile_statistics(hass.data[DATA_INSTANCE], ZERO)
+
+    stats = statistics_during_period(hass, ZERO)
+    assert [
+        (row["entity_id"], row["mean"], row["min"], row["max"])
+        for rows in stats.values()
+        for row in rows
+    ] == [
+        ("sensor.removed", pytest.approx(5.0), 5.0, 5.0),
+        ("sensor.temperature", pytest.approx(20.0), 10.0, 30.0),
+    ]
+
+
+def test_compile_statistics_error_keeps_recording(hass_recorder):
+    """Test an error compiling statistics doesn't stop the recorder."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+
+    with patch(
+        "homeassistant.components.recorder.statistics.compile_statistics",
+        side_effect=[TypeError, None],
+    ) as compile_mock:
+        instance.queue.put(StatisticsTask(ZERO))
+        instance.queue.put(StatisticsTask(ZERO + timedelta(hours=1)))
+        wait_recording_done(hass)
+
+    assert compile_mock.call_count == 2
+    assert instance.is_alive()
+
+
+def test_compile_daily_statistics(hass_recorder):
+    """Test the daily statistics are compiled after the last hour of the day."""
+    hass = hass_recorder()
+    _add_states(
+        hass,
+        [("sensor.temperature", "10", 0), ("sensor.temperature", "20", 60)],
+    )
+
+    compile_statistics(hass.data[DATA_INSTANCE], ZERO)
+    assert statistics_during_period(hass, ZERO, period=PERIOD_DAY) == {}
+
+    compile_statistics(hass.data[DATA_INSTANCE], ZERO + timedelta(hours=1))
+    stats = statistics_during_period(hass, ZERO, period=PERIOD_DAY)
+    assert stats["sensor.temperature"] == [
+        {
+            "entity_id": "sensor.temperature",
+            "start": ZERO.replace(hour=0).isoformat(),
+            "mean": 15.0,
+            "min": 10.0,
+            "max": 20.0,
+        }
+    ]
+
+    # A sensor without changes keeps its state during the next hour
+    compile_statistics(hass.data[DATA_INSTANCE], ZERO + timedelta(hours=2))
+    stats = statistics_during_period(
+        hass, ZERO + timedelta(hours=2), entity_ids=["sensor.temperature"]
+    )
+    assert [(row["min"], row["max"]) for row in stats["sensor.temperature"]] == [
+        (20.0, 20.0)
+    ]
+
+
+def test_compile_daily_statistics_weighted_by_duration(hass_recorder):
+    """Test the daily mean weighs each hour by how long its state was numeric."""
+    hass = hass_recorder()
+    _add_states(
+        hass,
+        [("sensor.temperature", "40", 45), ("sensor.temperature", "10", 60)],
+    )
+
+    compile_statistics(hass.data[DATA_INSTANCE], ZERO)
+    compile_statistics(hass.data[DATA_INSTANCE], ZERO + timedelta(hours=1))
+
+    stats = statistics_during_period(hass, ZERO, period=PERIOD_DAY)
+    assert stats["sensor.temperature"][0]["mean"] == pytest.approx(
+        (40 * 15 + 10 * 60) / 75
+    )
+
+
+def test_compile_statistics_initial_state_from_previous_hour(hass_recorder):
+    """Test the state at the start of an hour comes from the previous hour."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    _add_states(
+        hass,
+        [
+            ("sensor.temperature", "10", -30),
+            ("sensor.temperature", "20", 30),
+            ("sensor.humidity", "50", 10),
+            ("sensor.humidity", "unavailable", 20),
+        ],
+    )
+    compile_statistics(instance, ZERO)
+
+    # The states before the hour aren't read anymore
+    with session_scope(hass=hass) as session:
+        session.query(States).delete()
+    compile_statistics(instance, ZERO + timedelta(hours=1))
+
+    stats = statistics_during_period(hass, ZERO + timedelta(hours=1))
+    assert list(stats) == ["sensor.temperature"]
+    assert [
+        (row["mean"], row["min"], row["max"]) for row in stats["sensor.temperature"]
+    ] == [(20.0, 20.0, 20.0)]
+
+
+def test_uncompiled_hours(hass_recorder):
+    """Test finding the hours that still need to be compiled."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    now = ZERO + timedelta(hours=3, minutes=5)
+
+    assert uncompiled_hours(instance, now, 10) == []
+
+    _add_states(hass, [("sensor.temperature", "10", 30)])
+    hours = [ZERO + timedelta(hours=hour) for hour in range(3)]
+    assert uncompiled_hours(instance, now, 10) == hours
+    # Hours older than keep_days are skipped
+    assert uncompiled_hours(instance, now + timedelta(days=1), 1) == [
+        ZERO + timedelta(hours=hour) for hour in range(3, 27)
+    ]
+
+    compile_statistics(instance, hours[0])
+    assert uncompiled_hours(instance, now, 10) == hours[1:]
+
+
+def test_statistics_are_not_purged(hass_recorder):
+    """Test that purging the states keeps the statistics."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    _add_states(hass, [("sensor.temperature", "10", 30)])
+    compile_statistics(instance, ZERO)
+
+    instance.do_adhoc_purge(keep_days=0)
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 0
+        assert session.query(Statistics).filter_by(period=PERIOD_HOUR).count() == 1
@@ -187,6 +187,107 @@ async def test_subscribe_unsubscribe_events(hass, websocket_client):
     assert sum(hass.bus.async_listeners().values()) == init_count
 
 
+async def test_subscribe_entities(hass, websocket_client):
+    """Test subscribe entities sends a snapshot and then only the changes."""
+    hass.states.async_set("light.permitted", "off", {"color": "red"})
+    original_state = hass.states.get("light.permitted")
+
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "a": {
+            "light.permitted": {
+                "a": {"color": "red"},
+                "c": original_state.context.id,
+                "lc": original_state.last_changed.timestamp(),
+                "s": "off",
+            }
+        }
+    }
+
+    hass.states.async_set("light.permitted", "off", {"color": "blue"})
+    await hass.async_block_till_done()
+    changed_state = hass.states.get("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {
+                    "a": {"color": "blue"},
+                    "c": changed_state.context.id,
+                    "lu": changed_state.last_updated.timestamp(),
+                }
+            }
+        }
+    }
+
+    hass.states.async_remove("light.permitted")
+    await hass.async_block_till_done()
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"r": ["light.permitted"]}
+
+
+async def test_subscribe_entities_filtered(hass, websocket_client):
+    """Test subscribe entities only sends the entities and domains asked for."""
+    hass.states.async_set("light.one", "off")
+    hass.states.async_set("light.two", "off")
+    hass.states.async_set("switch.existing", "off")
+    init_count = sum(hass.bus.async_listeners().values())
+
+    await websocket_client.send_json(
+        {
+            "id": 7,
+            "type": "subscribe_entities",
+            "entity_ids": ["light.one"],
+            "domains": ["switch"],
+        }
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert set(msg["event"]["a"]) == {"light.one", "switch.existing"}
+
+    hass.states.async_set("light.two", "on")
+    hass.states.async_set("light.one", "on")
+    await hass.async_block_till_done()
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["c"]["light.one"]["+"]["s"] == "on"
+
+    hass.states.async_set("switch.new", "on")
+    await hass.async_block_till_done()
+    hass.states.async_set("light.two", "off")
+    hass.states.async_set("switch.new", "off")
+    await hass.async_block_till_done()
+
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["a"]) == ["switch.new"]
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["c"]["switch.new"]["+"]["s"] == "off"
+
+    await websocket_client.send_json(
+        {"id": 8, "type": "unsubscribe_events", "subscription": 7}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 8
+    assert msg["success"]
+    assert sum(hass.bus.async_listeners().values()) == init_count
+
+
 async def test_get_states(hass, websocket_client):
     """Test get_states command."""
     hass.states.async_set("greeting.hello", "world")
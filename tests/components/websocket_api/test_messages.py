@@ -1,8 +1,11 @@
 """Test Websocket API messages module."""
+import json
 
 from homeassistant.components.websocket_api.messages import (
     _cached_event_message as lru_event_cache,
+    _cached_state_diff_message as lru_state_diff_cache,
     cached_event_message,
+    cached_state_diff_message,
     message_to_json,
 )
 from homeassistant.const import EVENT_STATE_CHANGED
@@ -96,3 +99,53 @@ async def test_message_to_json(caplog):
 
 class _Unserializeable:
     """A class that cannot be serialized."""
+
+
+async def test_cached_state_diff_message(hass):
+    """Test that the state diff of an event is computed once."""
+
+    events = []
+
+    @callback
+    def _event_listener(event):
+        events.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _event_listener)
+
+    hass.states.async_set("light.window", "on", {"color": "red", "effect": "none"})
+    hass.states.async_set("light.window", "off", {"color": "blue"})
+    hass.states.async_remove("light.window")
+    await hass.async_block_till_done()
+
+    assert len(events) == 3
+    lru_state_diff_cache.cache_clear()
+
+    msg0 = cached_state_diff_message(2, events[1])
+    msg1 = cached_state_diff_message(3, events[1])
+    assert msg0 != msg1
+    assert msg0.replace('"id": 2', '"id": 3', 1) == msg1
+
+    cache_info = lru_state_diff_cache.cache_info()
+    assert cache_info.hits == 1
+    assert cache_info.misses == 1
+
+    assert json.loads(msg0) == {
+        "id": 2,
+        "type": "event",
+        "event": {
+            "c": {
+                "light.window": {
+                    "+": {
+                        "s": "off",
+                        "c": events[1].context.id,
+                        "lc": events[1].data["new_state"].last_changed.timestamp(),
+                        "a": {"color": "blue"},
+                    },
+                    "-": {"a": ["effect"]},
+                }
+            }
+        },
+    }
+    assert json.loads(cached_state_diff_message(2, events[2]))["event"] == {
+        "r": ["light.window"]
+    }
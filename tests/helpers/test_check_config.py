@@ -1,4 +1,5 @@
 """Test check_config helper."""
+import asyncio
 import logging
 from unittest.mock import Mock, patch
 
@@ -65,6 +66,49 @@ async def test_config_platform_valid(hass):
         assert not res.errors
 
 
+async def test_validation_times(hass):
+    """Test the integrations are validated together and timed."""
+    files = {
+        YAML_CONFIG_FILE: BASE_CONFIG
+        + "light:\n  - platform: demo\n  - platform: beer\n  - platform: demo\n"
+        + "switch:\n  platform: demo\n"
+        + "beer:\n"
+    }
+    with patch("os.path.isfile", return_value=True), patch_yaml_files(files):
+        res = await async_check_ha_config_file(hass)
+        log_ha_config(res)
+
+    assert res.keys() == {"homeassistant", "light", "switch"}
+    # Invalid platforms are dropped, the order of the others is kept
+    assert res["light"] == [{"platform": "demo"}, {"platform": "demo"}]
+    assert res["switch"] == [{"platform": "demo"}]
+    assert sorted(err.message for err in res.errors) == [
+        "Component error: beer - Integration 'beer' not found.",
+        "Platform error light.beer - Integration 'beer' not found.",
+    ]
+    assert res.validation_times.keys() == {"light", "switch", "beer"}
+    assert all(seconds >= 0 for seconds in res.validation_times.values())
+
+
+async def test_validation_times_exclude_executor_wait(hass):
+    """Test waiting for the executor doesn't count as validation time."""
+    files = {YAML_CONFIG_FILE: BASE_CONFIG + "switch:\n  platform: demo\n"}
+    add_executor_job = hass.async_add_executor_job
+
+    async def slow_add_executor_job(target, *args):
+        """Wait before running the job, like when the executor is busy."""
+        await asyncio.sleep(0.2)
+        return await add_executor_job(target, *args)
+
+    with patch("os.path.isfile", return_value=True), patch_yaml_files(
+        files
+    ), patch.object(hass, "async_add_executor_job", slow_add_executor_job):
+        res = await async_check_ha_config_file(hass)
+
+    assert res["switch"] == [{"platform": "demo"}]
+    assert res.validation_times["switch"] < 0.2
+
+
 async def test_component_platform_not_found(hass):
     """Test errors if component or platform not found."""
     # Make sure they don't exist
@@ -372,6 +372,47 @@ async def test_deleted_device_removing_area_id(registry):
     assert entry_w_area != entry_wo_area
 
 
+async def test_entries_for_area_and_config_entry(registry):
+    """Test looking up devices by area and config entry follows updates."""
+    entry = registry.async_get_or_create(
+        config_entry_id="123",
+        connections={(device_registry.CONNECTION_NETWORK_MAC, "12:34:56:AB:CD:EF")},
+    )
+    other_entry = registry.async_get_or_create(
+        config_entry_id="456",
+        connections={(device_registry.CONNECTION_NETWORK_MAC, "12:34:56:AB:CD:FF")},
+    )
+
+    entry = registry.async_update_device(entry.id, area_id="kitchen")
+    registry.async_get_or_create(
+        config_entry_id="123",
+        connections={(device_registry.CONNECTION_NETWORK_MAC, "12:34:56:AB:CD:FF")},
+    )
+    other_entry = registry.async_update_device(other_entry.id, area_id="kitchen")
+    assert device_registry.async_entries_for_area(registry, "kitchen") == [
+        entry,
+        other_entry,
+    ]
+    assert device_registry.async_entries_for_config_entry(registry, "123") == [
+        entry,
+        other_entry,
+    ]
+    assert device_registry.async_entries_for_config_entry(registry, "456") == [
+        other_entry
+    ]
+
+    other_entry = registry.async_update_device(
+        other_entry.id, area_id="bedroom", remove_config_entry_id="123"
+    )
+    assert device_registry.async_entries_for_area(registry, "kitchen") == [entry]
+    assert device_registry.async_entries_for_area(registry, "bedroom") == [other_entry]
+    assert device_registry.async_entries_for_config_entry(registry, "123") == [entry]
+
+    registry.async_remove_device(entry.id)
+    assert device_registry.async_entries_for_area(registry, "kitchen") == []
+    assert device_registry.async_entries_for_config_entry(registry, "123") == []
+
+
 async def test_specifying_via_device_create(registry):
     """Test specifying a via_device and updating."""
     via = registry.async_get_or_create(
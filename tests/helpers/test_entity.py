@@ -7,9 +7,11 @@ from unittest.mock import MagicMock, PropertyMock, patch
 
 import pytest
 
+from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.const import ATTR_DEVICE_CLASS, STATE_UNAVAILABLE
 from homeassistant.core import Context
 from homeassistant.helpers import entity, entity_registry
+from homeassistant.helpers.entity_values import EntityValues
 
 from tests.common import (
     MockConfigEntry,
@@ -718,3 +720,89 @@ async def test_setup_source(hass):
     await platform.async_reset()
 
     assert entity.entity_sources(hass) == {}
+
+
+async def test_static_properties(hass):
+    """Test the attributes of static properties are built once."""
+    reads = []
+
+    class StaticEntity(entity.Entity):
+        """Entity with a static name and capability attributes."""
+
+        _static_properties = frozenset({"name", "capability_attributes"})
+        value = 0
+
+        @property
+        def name(self):
+            """Return the name of the entity."""
+            reads.append("name")
+            return "Static"
+
+        @property
+        def icon(self):
+            """Return an icon that follows the state."""
+            return f"mdi:numeric-{self.value}"
+
+        @property
+        def capability_attributes(self):
+            """Return the capability attributes of the entity."""
+            reads.append("capability_attributes")
+            return {"max": 10}
+
+        @property
+        def state(self):
+            """Return the state of the entity."""
+            return self.value
+
+    ent = StaticEntity()
+    ent.hass = hass
+    ent.entity_id = "hello.world"
+
+    for value in range(3):
+        ent.value = value
+        ent.async_write_ha_state()
+        state = hass.states.get("hello.world")
+        assert state.state == str(value)
+        assert state.attributes == {
+            "max": 10,
+            "friendly_name": "Static",
+            "icon": f"mdi:numeric-{value}",
+        }
+    assert reads == ["capability_attributes", "name"]
+
+    # Registry entry updates rebuild the static attributes
+    ent.registry_entry = entity_registry.RegistryEntry(
+        entity_id="hello.world",
+        unique_id="test-unique-id",
+        platform="test-platform",
+        name="Renamed",
+    )
+    ent.async_write_ha_state()
+    assert hass.states.get("hello.world").attributes["friendly_name"] == "Renamed"
+    assert reads.count("capability_attributes") == 2
+
+    # So do customize updates, which override the dynamic attributes too
+    hass.data[DATA_CUSTOMIZE] = EntityValues(
+        {"hello.world": {"friendly_name": "Customized", "icon": "mdi:star"}}
+    )
+    ent.async_write_ha_state()
+    state = hass.states.get("hello.world")
+    assert state.attributes["friendly_name"] == "Customized"
+    assert state.attributes["icon"] == "mdi:star"
+    assert reads.count("capability_attributes") == 3
+
+
+async def test_update_duration(hass):
+    """Test the duration of forced refreshes is recorded."""
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = "hello.world"
+    ent.update = MagicMock()
+    assert ent.update_duration is None
+
+    await ent.async_update_ha_state()
+    assert ent.update_duration is None
+
+    await ent.async_update_ha_state(True)
+    assert ent.update.called
+    assert ent.update_duration >= 0
@@ -6,7 +6,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from homeassistant.const import PERCENTAGE
+from homeassistant.const import EVENT_STATE_CHANGED, PERCENTAGE
 from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError, PlatformNotReady
 from homeassistant.helpers import entity_platform, entity_registry
@@ -22,6 +22,7 @@ from tests.common import (
     MockEntity,
     MockEntityPlatform,
     MockPlatform,
+    async_capture_events,
     async_fire_time_changed,
     mock_entity_platform,
     mock_registry,
@@ -90,6 +91,94 @@ async def test_polling_updates_entities_with_exception(hass):
     assert len(update_err) == 1
 
 
+async def test_polling_backs_off_unavailable_entities(hass):
+    """Test unavailable entities are polled less often."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
+
+    ent = MockEntity(should_poll=True, available=False)
+    ent.update = Mock()
+    await component.async_add_entities([ent])
+    platform = component._platforms[DOMAIN]
+
+    polled = []
+    for _ in range(10):
+        ent.update.reset_mock()
+        await platform._update_entity_states(dt_util.utcnow())
+        polled.append(ent.update.called)
+
+    assert polled == [True] * 3 + [False] + [True] + [False] * 3 + [True, False]
+    assert platform.polling_stats.polls == 10
+    assert platform.polling_stats.skipped == 5
+    assert platform.polling_stats.last_duration is not None
+
+    ent._values["available"] = True
+    for _ in range(7):
+        await platform._update_entity_states(dt_util.utcnow())
+    ent.update.reset_mock()
+    await platform._update_entity_states(dt_util.utcnow())
+    assert ent.update.called
+
+
+async def test_polling_backoff_ignores_parallel_updates_wait(hass):
+    """Test entities waiting for a slow sibling are not backed off."""
+    platform = MockPlatform()
+    platform.PARALLEL_UPDATES = 1
+    mock_entity_platform(hass, "test_domain.platform", platform)
+
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=0.05))
+    component._platforms = {}
+    await component.async_setup({DOMAIN: {"platform": "platform"}})
+    await hass.async_block_till_done()
+    handle = list(component._platforms.values())[-1]
+
+    class SlowEntity(MockEntity):
+        """Mock entity that updates slower than the scan interval."""
+
+        async def async_update(self):
+            """Update the entity."""
+            await asyncio.sleep(0.1)
+
+    class FastEntity(MockEntity):
+        """Mock entity that updates at once."""
+
+        async def async_update(self):
+            """Update the entity."""
+
+    await handle.async_add_entities(
+        [
+            SlowEntity(name="slow", should_poll=True),
+            FastEntity(name="fast_1", should_poll=True),
+            FastEntity(name="fast_2", should_poll=True),
+        ]
+    )
+
+    for _ in range(3):
+        await handle._update_entity_states(dt_util.utcnow())
+
+    assert list(handle._poll_backoff) == ["test_domain.slow"]
+    assert handle._poll_backoff["test_domain.slow"][1] == 1
+
+
+async def test_polling_overrun(hass, caplog):
+    """Test polls that overrun the scan interval are counted and logged."""
+    caplog.set_level(logging.DEBUG)
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
+    await component.async_add_entities([MockEntity(should_poll=True)])
+    platform = component._platforms[DOMAIN]
+
+    platform._process_updates = asyncio.Lock()
+    async with platform._process_updates:
+        await platform._update_entity_states(dt_util.utcnow())
+
+    assert platform.polling_stats.overruns == 1
+    assert platform.polling_stats.polls == 0
+    assert "took longer than the scheduled update interval" in caplog.text
+    assert (
+        "Polling of test_domain test_domain: 0 polls, 1 overruns, 0 skipped entity "
+        "updates, last poll took -s, slowest 0.000s" in caplog.text
+    )
+
+
 async def test_update_state_adds_entities(hass):
     """Test if updating poll entities cause an entity to be added works."""
     component = EntityComponent(_LOGGER, DOMAIN, hass)
@@ -619,6 +708,26 @@ async def test_not_fails_with_adding_empty_entities_(hass):
     assert len(hass.states.async_entity_ids()) == 0
 
 
+async def test_write_ha_states(hass):
+    """Test writing the states of several entities at once."""
+    platform = MockEntityPlatform(hass)
+    entities = [MockEntity(name=f"test {idx}", state="on") for idx in range(3)]
+    await platform.async_add_entities(entities)
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    for entity in entities:
+        entity._values["state"] = "off"
+    with patch.object(hass.bus, "async_fire", wraps=hass.bus.async_fire) as mock_fire:
+        platform.async_write_ha_states(entities)
+    await hass.async_block_till_done()
+
+    assert not mock_fire.called
+    assert [event.data["entity_id"] for event in events] == [
+        entity.entity_id for entity in entities
+    ]
+    assert all(hass.states.get(entity.entity_id).state == "off" for entity in entities)
+
+
 async def test_entity_registry_updates_entity_id(hass):
     """Test that updates on the entity registry update platform entities."""
     registry = mock_registry(
@@ -794,3 +794,45 @@ async def test_disabled_entities_excluded_from_entity_list(hass, registry):
         registry, device_entry.id, include_disabled_entities=True
     )
     assert entries == [entry1, entry2]
+
+
+async def test_entries_for_device_area_and_config_entry(hass, registry):
+    """Test looking up entries by device, area and config entry follows updates."""
+    config_entry = MockConfigEntry(domain="light")
+    entry1 = registry.async_get_or_create(
+        "light", "hue", "5678", config_entry=config_entry, device_id="device-1"
+    )
+    entry2 = registry.async_get_or_create(
+        "light", "hue", "ABCD", device_id="device-1", area_id="kitchen"
+    )
+
+    assert entity_registry.async_entries_for_device(registry, "device-1") == [
+        entry1,
+        entry2,
+    ]
+    assert entity_registry.async_entries_for_area(registry, "kitchen") == [entry2]
+    assert entity_registry.async_entries_for_config_entry(
+        registry, config_entry.entry_id
+    ) == [entry1]
+
+    entry1 = registry.async_update_entity(
+        entry1.entity_id, area_id="kitchen", new_entity_id="light.renamed"
+    )
+    entry2 = registry.async_update_entity(entry2.entity_id, area_id="bedroom")
+    assert entity_registry.async_entries_for_area(registry, "kitchen") == [entry1]
+    assert entity_registry.async_entries_for_area(registry, "bedroom") == [entry2]
+    assert entity_registry.async_entries_for_config_entry(
+        registry, config_entry.entry_id
+    ) == [entry1]
+
+    registry.async_clear_area_id("bedroom")
+    assert entity_registry.async_entries_for_area(registry, "bedroom") == []
+
+    registry.async_clear_config_entry(config_entry.entry_id)
+    assert entity_registry.async_entries_for_device(registry, "device-1") == [
+        registry.async_get(entry2.entity_id)
+    ]
+    assert (
+        entity_registry.async_entries_for_config_entry(registry, config_entry.entry_id)
+        == []
+    )
@@ -2421,6 +2421,33 @@ async def test_track_time_interval(hass):
     assert len(specific_runs) == 2
 
 
+async def test_track_time_interval_first_interval(hass):
+    """Test tracking time interval with a different first interval."""
+    specific_runs = []
+
+    utc_now = dt_util.utcnow()
+    unsub = async_track_time_interval(
+        hass,
+        callback(lambda x: specific_runs.append(x)),
+        timedelta(seconds=10),
+        first_interval=timedelta(seconds=2),
+    )
+
+    async_fire_time_changed(hass, utc_now + timedelta(seconds=3))
+    await hass.async_block_till_done()
+    assert len(specific_runs) == 1
+
+    async_fire_time_changed(hass, utc_now + timedelta(seconds=5))
+    await hass.async_block_till_done()
+    assert len(specific_runs) == 1
+
+    async_fire_time_changed(hass, utc_now + timedelta(minutes=20))
+    await hass.async_block_till_done()
+    assert len(specific_runs) == 2
+
+    unsub()
+
+
 async def test_track_sunrise(hass, legacy_patchable_time):
     """Test track the sunrise."""
     latitude = 32.87336
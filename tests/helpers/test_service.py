@@ -438,6 +438,27 @@ async def test_call_with_one_of_required_features(hass, mock_entities):
     assert all(entity in actual for entity in expected)
 
 
+async def test_call_referenced_entities_in_platform_order(hass, mock_entities):
+    """Test referenced entities are called in the order of their platform."""
+    test_service_mock = AsyncMock(return_value=None)
+    await service.entity_service_call(
+        hass,
+        [Mock(entities=mock_entities)],
+        test_service_mock,
+        ha.ServiceCall(
+            "test_domain",
+            "test_service",
+            {"entity_id": ["light.bathroom", "light.living_room", "light.kitchen"]},
+        ),
+    )
+
+    assert [call[0][0] for call in test_service_mock.call_args_list] == [
+        mock_entities["light.kitchen"],
+        mock_entities["light.living_room"],
+        mock_entities["light.bathroom"],
+    ]
+
+
 async def test_call_with_sync_func(hass, mock_entities):
     """Test invoking sync service calls."""
     test_service_mock = Mock(return_value=None)
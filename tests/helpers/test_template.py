@@ -761,6 +761,30 @@ def test_render_with_possible_json_value_non_string_value(hass):
     assert tpl.async_render_with_possible_json_value(value) == expected
 
 
+def test_render_with_possible_json_value_parsed_once(hass):
+    """Test templates rendering the same value share the parsed JSON."""
+    templates = [
+        template.Template("{{ value_json.temperature }}", hass),
+        template.Template("{{ value_json.humidity }}", hass),
+    ]
+    value = '{"temperature": 21.5, "humidity": 40, "device": "sensor_parsed_once"}'
+
+    with patch(
+        "homeassistant.helpers.template.json.loads", wraps=template.json.loads
+    ) as loads:
+        assert [
+            tpl.async_render_with_possible_json_value(value) for tpl in templates
+        ] == [
+            "21.5",
+            "40",
+        ]
+        assert [
+            tpl.async_render_with_possible_json_value("not json") for tpl in templates
+        ] == ["not json", "not json"]
+
+    assert loads.call_count == 2
+
+
 def test_if_state_exists(hass):
     """Test if state exists works."""
     hass.states.async_set("test.object", "available")
@@ -60,6 +60,28 @@ def test_config_platform_valid(isfile_patch, loop):
         assert len(res["yaml_files"]) == 1
 
 
+@patch("os.path.isfile", return_value=True)
+def test_timing(isfile_patch, loop, capsys):
+    """Test the validation time of each integration is printed."""
+    files = {
+        YAML_CONFIG_FILE: BASE_CONFIG
+        + "light:\n  platform: demo\nswitch:\n  platform: demo"
+    }
+    with patch_yaml_files(files), patch(
+        "sys.argv", ["check_config", "-c", get_test_config_dir(), "--timing"]
+    ):
+        assert check_config.run([]) == 0
+
+    output = capsys.readouterr().out
+    assert "Validation time per integration:" in output
+    lines = output[output.index("Validation time per integration:") :].splitlines()
+    assert sorted(line.split(":")[0] for line in lines[1:]) == [
+        " - light",
+        " - switch",
+    ]
+    assert all(line.endswith("s") for line in lines[1:])
+
+
 @patch("os.path.isfile", return_value=True)
 def test_component_platform_not_found(isfile_patch, loop):
     """Test errors if component or platform not found."""
@@ -6,7 +6,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from homeassistant import bootstrap, core, runner
+from homeassistant import bootstrap, core, loader, runner
 import homeassistant.config as config_util
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.util.dt as dt_util
@@ -310,6 +310,76 @@ async def test_setup_after_deps_not_present(hass):
     assert order == ["root", "second_dep"]
 
 
+async def test_import_integrations_dependencies_first(hass, caplog):
+    """Test integrations are imported after their dependencies."""
+    order = []
+    integrations = {}
+    for domain, dependencies, requirements in (
+        ("root", ["first_dep", "second_dep"], []),
+        ("first_dep", ["second_dep"], []),
+        ("second_dep", [], []),
+        ("broken", [], []),
+        ("broken_dependent", ["broken"], []),
+        ("not_installed", [], ["not-installed==1.0"]),
+    ):
+        integration = integrations[domain] = mock_integration(
+            hass, MockModule(domain, dependencies, requirements=requirements)
+        )
+        integration.get_component = Mock(
+            side_effect=lambda domain=domain: order.append(domain)
+        )
+    integrations["broken"].get_component.side_effect = ImportError("boom")
+
+    with patch(
+        "homeassistant.bootstrap.is_installed",
+        side_effect=lambda req: req != "not-installed==1.0",
+    ):
+        await bootstrap._async_import_integrations(hass, integrations)
+
+    assert order == ["second_dep", "first_dep", "root"]
+    assert integrations["broken"].get_component.called
+    assert not integrations["broken_dependent"].get_component.called
+    assert not integrations["not_installed"].get_component.called
+    assert "Unable to import broken ahead of setup: boom" in caplog.text
+    assert (
+        "Not importing broken_dependent ahead of setup, its dependencies were not "
+        "imported" in caplog.text
+    )
+    assert (
+        "Not importing not_installed ahead of setup, requirements not installed: "
+        "not-installed==1.0" in caplog.text
+    )
+
+
+async def test_preimport_integrations_opt_in(hass):
+    """Test integrations are only imported ahead of setup when enabled."""
+    mock_integration(hass, MockModule("root"))
+    with patch(
+        "homeassistant.bootstrap._async_import_integrations", return_value=None
+    ) as mock_import:
+        await bootstrap._async_set_up_integrations(hass, {"root": {}})
+    assert not mock_import.called
+
+    hass.config.preimport_integrations = True
+    with patch(
+        "homeassistant.bootstrap._async_import_integrations", return_value=None
+    ) as mock_import:
+        await bootstrap._async_set_up_integrations(hass, {"root": {}})
+    assert mock_import.called
+
+
+async def test_log_import_times(hass, caplog):
+    """Test the slowest imports are logged."""
+    bootstrap._async_log_import_times(hass)
+    assert "Imported" not in caplog.text
+
+    hass.data[loader.DATA_IMPORT_TIMES] = {"fast": 0.01, "slow": 1.5}
+    bootstrap._async_log_import_times(hass)
+    assert "Imported 2 integrations in 1.51s, slowest: slow (1.50s), fast" in (
+        caplog.text
+    )
+
+
 @pytest.fixture
 def mock_is_virtual_env():
     """Mock enable logging."""
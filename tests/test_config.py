@@ -3,6 +3,7 @@
 from collections import OrderedDict
 import copy
 import os
+import threading
 from unittest import mock
 from unittest.mock import AsyncMock, Mock, patch
 
@@ -1089,6 +1090,44 @@ async def test_component_config_exceptions(hass, caplog):
     )
 
 
+async def test_component_platforms_validated_in_executor(hass):
+    """Test platform configs are validated in the executor, keeping their order."""
+    threads = []
+
+    def platform_schema(p_config):
+        """Validate a platform config outside the event loop."""
+        threads.append(threading.get_ident())
+        if p_config["platform"] == "invalid":
+            raise vol.Invalid("invalid platform")
+        return p_config
+
+    config = await config_util.async_process_component_config(
+        hass,
+        {
+            "test_domain": [{"platform": None}, {"platform": "invalid"}],
+            "test_domain 2": {"platform": None, "name": "second"},
+            "other_domain": {},
+        },
+        integration=Mock(
+            domain="test_domain",
+            get_platform=Mock(return_value=None),
+            get_component=Mock(
+                return_value=Mock(
+                    spec=["PLATFORM_SCHEMA_BASE"],
+                    PLATFORM_SCHEMA_BASE=platform_schema,
+                )
+            ),
+        ),
+    )
+
+    assert config == {
+        "test_domain": [{"platform": None}, {"platform": None, "name": "second"}],
+        "other_domain": {},
+    }
+    assert len(threads) == 3
+    assert threading.get_ident() not in threads
+
+
 @pytest.mark.parametrize(
     "domain, schema, expected",
     [
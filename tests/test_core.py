@@ -379,6 +379,106 @@ async def test_eventbus_unsubscribe_listener(hass):
     assert len(calls) == 1
 
 
+async def test_eventbus_filtered_listener(hass):
+    """Test listeners are only scheduled for events that pass their filter."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    @ha.callback
+    def event_filter(event):
+        """Mock filter."""
+        return event.data.get("filtered") is None
+
+    @ha.callback
+    def broken_filter(event):
+        """Mock filter that raises."""
+        raise ValueError
+
+    hass.bus.async_listen("test", listener, event_filter)
+    hass.bus.async_listen("test", listener, broken_filter)
+    unsub = hass.bus.async_listen("test", listener, event_filter)
+    unsub()
+
+    hass.bus.async_fire("test", {"filtered": True})
+    hass.bus.async_fire("test", {"other": True})
+    await hass.async_block_till_done()
+
+    assert [event.data for event in calls] == [{"other": True}]
+
+
+async def test_eventbus_entity_filtered_listener(hass):
+    """Test listeners filtered by entity_id and domain."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event.data.get("entity_id"))
+
+    old_count = hass.bus.async_listeners().get("test", 0)
+    unsub = hass.bus.async_listen(
+        "test", listener, entity_ids=["light.kitchen", "switch.outlet"]
+    )
+    assert hass.bus.async_listeners()["test"] == old_count + 1
+    unsub()
+    assert hass.bus.async_listeners().get("test", 0) == old_count
+
+    hass.bus.async_listen(
+        "test",
+        listener,
+        entity_ids=["light.Kitchen", "switch.outlet"],
+        domains=["switch"],
+    )
+    hass.bus.async_listen(
+        "test",
+        listener,
+        lambda event: event.data.get("extra"),
+        entity_ids=["sensor.temperature"],
+    )
+
+    for entity_id in (
+        "light.kitchen",
+        "light.living_room",
+        "switch.outlet",
+        "sensor.temperature",
+        ["light.kitchen"],
+        None,
+    ):
+        hass.bus.async_fire("test", {"entity_id": entity_id})
+    hass.bus.async_fire("test", {"entity_id": "sensor.temperature", "extra": True})
+    await hass.async_block_till_done()
+
+    assert calls == ["light.kitchen", "switch.outlet", "sensor.temperature"]
+    assert hass.bus.async_listeners()["test"] == old_count + 2
+
+
+async def test_eventbus_entity_filtered_listener_order(hass):
+    """Test filtered listeners are scheduled after the unfiltered ones."""
+    calls = []
+
+    def make_listener(name):
+        @ha.callback
+        def listener(event):
+            """Mock listener."""
+            calls.append(name)
+
+        return listener
+
+    hass.bus.async_listen("test", make_listener("domain"), domains=["light"])
+    hass.bus.async_listen("test", make_listener("entity"), entity_ids=["light.kitchen"])
+    hass.bus.async_listen("test", make_listener("plain"))
+    hass.bus.async_listen(MATCH_ALL, make_listener("match_all"))
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+
+    assert calls == ["match_all", "plain", "entity", "domain"]
+
+
 async def test_eventbus_listen_once_event_with_callback(hass):
     """Test listen_once_event method."""
     runs = []
@@ -637,6 +737,85 @@ async def test_statemachine_force_update(hass):
     assert len(events) == 1
 
 
+async def test_statemachine_reuses_unchanged_attributes(hass):
+    """Test unchanged attributes are shared with the new state."""
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    hass.states.async_set("light.bowl", "on", {"brightness": 100, "color": "red"})
+    state = hass.states.get("light.bowl")
+
+    hass.states.async_set("light.bowl", "off", {"brightness": 100, "color": "red"})
+    state2 = hass.states.get("light.bowl")
+    assert state2.attributes is state.attributes
+    assert state2.domain == "light"
+    assert state2.object_id == "bowl"
+
+    hass.states.async_set("light.bowl", "off", {"brightness": 50, "effect": "none"})
+    state3 = hass.states.get("light.bowl")
+    assert state3.attributes == {"brightness": 50, "effect": "none"}
+    assert state3.last_changed == state2.last_changed
+
+    with pytest.raises(ha.InvalidStateError):
+        hass.states.async_set("light.bowl", "x" * 256)
+
+    hass.states.async_remove("light.bowl")
+
+    await hass.async_block_till_done()
+    assert [set(event.data) for event in events] == [
+        {"entity_id", "old_state", "new_state"}
+    ] * 4
+
+
+async def test_statemachine_batch(hass):
+    """Test state changes of a batch are fired in order when it exits."""
+    hass.states.async_set("light.bowl", "on")
+    await hass.async_block_till_done()
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    with hass.states.async_batch():
+        hass.states.async_set("light.bowl", "off")
+        assert hass.states.get("light.bowl").state == "off"
+        with hass.states.async_batch():
+            hass.states.async_set("light.kitchen", "on")
+        hass.states.async_remove("light.bowl")
+        await hass.async_block_till_done()
+        assert events == []
+
+    await hass.async_block_till_done()
+    assert [
+        (event.data["entity_id"], event.data["new_state"] and "set") for event in events
+    ] == [("light.bowl", "set"), ("light.kitchen", "set"), ("light.bowl", None)]
+    assert events[0].data["new_state"].state == "off"
+
+    with pytest.raises(ValueError), hass.states.async_batch():
+        hass.states.async_set("light.kitchen", "off")
+        raise ValueError
+
+    await hass.async_block_till_done()
+    assert len(events) == 4
+    assert events[3].data["new_state"].state == "off"
+
+
+async def test_statemachine_batch_listener_error(hass, caplog):
+    """Test an error of a listener doesn't stop it for the rest of a batch."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Fail for the kitchen light."""
+        if event.data["entity_id"] == "light.kitchen":
+            raise ValueError
+        calls.append(event.data["entity_id"])
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, listener)
+    with hass.states.async_batch():
+        hass.states.async_set("light.kitchen", "on")
+        hass.states.async_set("light.bowl", "on")
+
+    await hass.async_block_till_done()
+    assert calls == ["light.bowl"]
+    assert "Error running listener" in caplog.text
+
+
 def test_service_call_repr():
     """Test ServiceCall repr."""
     call = ha.ServiceCall("homeassistant", "start")
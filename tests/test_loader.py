@@ -1,4 +1,5 @@
 """Test to verify that we can load components."""
+from datetime import timedelta
 from unittest.mock import ANY, patch
 
 import pytest
@@ -6,8 +7,14 @@ import pytest
 from homeassistant import core, loader
 from homeassistant.components import http, hue
 from homeassistant.components.hue import light as hue_light
+import homeassistant.util.dt as dt_util
 
-from tests.common import MockModule, async_mock_service, mock_integration
+from tests.common import (
+    MockModule,
+    async_fire_time_changed,
+    async_mock_service,
+    mock_integration,
+)
 
 
 async def test_component_dependencies(hass):
@@ -253,6 +260,13 @@ def test_integration_properties(hass):
     assert integration.ssdp is None
 
 
+async def test_get_component_import_time(hass):
+    """Test the import time of components is recorded."""
+    integration = await loader.async_get_integration(hass, "hue")
+    integration.get_component()
+    assert hass.data[loader.DATA_IMPORT_TIMES]["hue"] >= 0
+
+
 async def test_integrations_only_once(hass):
     """Test that we load integrations only once."""
     int_1 = hass.async_create_task(loader.async_get_integration(hass, "hue"))
@@ -261,6 +275,86 @@ async def test_integrations_only_once(hass):
     assert await int_1 is await int_2
 
 
+async def test_manifest_cache(hass, hass_storage):
+    """Test manifests are cached until their file changes."""
+    await loader.async_load_manifest_cache(hass)
+    integration = await loader.async_get_integration(hass, "hue")
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=loader.MANIFEST_CACHE_SAVE_DELAY)
+    )
+    await hass.async_block_till_done()
+    manifests = hass_storage[loader.MANIFEST_CACHE_STORAGE_KEY]["data"]
+    manifest_path = str(integration.file_path / "manifest.json")
+    assert manifests[manifest_path]["manifest"]["domain"] == "hue"
+    assert "is_built_in" not in manifests[manifest_path]["manifest"]
+
+    manifests[manifest_path]["manifest"]["name"] = "Cached Hue"
+    hass.data.pop(loader.DATA_INTEGRATIONS)
+    await loader.async_load_manifest_cache(hass)
+    assert (await loader.async_get_integration(hass, "hue")).name == "Cached Hue"
+
+    for index in range(3):
+        manifests[manifest_path]["stat"][index] -= 1
+        hass.data.pop(loader.DATA_INTEGRATIONS)
+        await loader.async_load_manifest_cache(hass)
+        assert (await loader.async_get_integration(hass, "hue")).name == "Philips Hue"
+        manifests[manifest_path]["stat"][index] += 1
+        assert manifests[manifest_path]["manifest"]["name"] == "Philips Hue"
+        manifests[manifest_path]["manifest"]["name"] = "Cached Hue"
+
+
+async def test_manifest_cache_recently_modified(hass, hass_storage):
+    """Test manifests read shortly after they were modified are parsed again."""
+    await loader.async_load_manifest_cache(hass)
+    integration = await loader.async_get_integration(hass, "hue")
+    cache = hass.data[loader.DATA_MANIFEST_CACHE]
+    manifest_path = str(integration.file_path / "manifest.json")
+    # pylint: disable=protected-access
+    entry = cache._manifests[manifest_path]
+    entry["manifest"]["name"] = "Cached Hue"
+    mtime = entry["stat"][0]
+
+    entry["read_at"] = mtime + loader.MANIFEST_MTIME_RESOLUTION_NS
+    hass.data.pop(loader.DATA_INTEGRATIONS)
+    assert (await loader.async_get_integration(hass, "hue")).name == "Philips Hue"
+    entry = cache._manifests[manifest_path]
+    assert entry["read_at"] > mtime + loader.MANIFEST_MTIME_RESOLUTION_NS
+
+    entry["manifest"]["name"] = "Cached Hue"
+    hass.data.pop(loader.DATA_INTEGRATIONS)
+    assert (await loader.async_get_integration(hass, "hue")).name == "Cached Hue"
+
+
+async def test_cached_dependency_closure(hass, hass_storage):
+    """Test the dependencies of cached manifests are resolved at once."""
+    assert loader.cached_dependency_closure(hass, ["mod3"]) == {"mod3"}
+
+    hass_storage[loader.MANIFEST_CACHE_STORAGE_KEY] = {
+        "version": loader.MANIFEST_CACHE_STORAGE_VERSION,
+        "key": loader.MANIFEST_CACHE_STORAGE_KEY,
+        "data": {
+            f"/{domain}/manifest.json": {
+                "stat": [0, 0, 0],
+                "read_at": 0,
+                "manifest": {"domain": domain, "dependencies": dependencies},
+            }
+            for domain, dependencies in (
+                ("mod1", []),
+                ("mod2", ["mod1"]),
+                ("mod3", ["mod2", "mod4"]),
+            )
+        },
+    }
+    await loader.async_load_manifest_cache(hass)
+    assert loader.cached_dependency_closure(hass, ["mod3"]) == {
+        "mod1",
+        "mod2",
+        "mod3",
+        "mod4",
+    }
+
+
 async def test_get_custom_components_internal(hass):
     """Test that we can a list of custom components."""
     # pylint: disable=protected-access
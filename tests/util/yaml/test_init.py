@@ -478,3 +478,89 @@ def test_input():
     """Test loading inputs."""
     data = {"hello": yaml.Input("test_name")}
     assert yaml.parse_yaml(yaml.dump(data)) == data
+
+
+def test_load_yaml_cached(tmp_path):
+    """Test the parsed YAML is cached until a file it was loaded from changes."""
+    config_path = tmp_path / YAML_CONFIG_FILE
+    cache_path = str(tmp_path / ".storage" / "yaml_cache")
+    config_path.write_text(
+        "name: !secret name\n"
+        "path: !env_var YAML_CACHE_TEST default\n"
+        "packages: !include_dir_named packages\n"
+    )
+    (tmp_path / "secrets.yaml").write_text("name: Home\n")
+    (tmp_path / "packages").mkdir()
+    (tmp_path / "packages" / "one.yaml").write_text("light:\n  - platform: demo\n")
+
+    def load():
+        """Load the configuration and return if it came from the cache."""
+        with patch.object(
+            yaml_loader, "load_yaml", wraps=yaml_loader.load_yaml
+        ) as mock_load:
+            data = yaml.load_yaml_cached(str(config_path), cache_path)
+        return data, not mock_load.called
+
+    data, cached = load()
+    assert not cached
+    assert data == {
+        "name": "Home",
+        "path": "default",
+        "packages": {"one": {"light": [{"platform": "demo"}]}},
+    }
+
+    data, cached = load()
+    assert cached
+    assert data["packages"].__line__ == 2
+    light = data["packages"]["one"]["light"]
+    assert light.__config_file__ == str(tmp_path / "packages" / "one.yaml")
+    assert light.__line__ == 1
+
+    (tmp_path / "packages" / "two.yaml").write_text("switch:\n")
+    data, cached = load()
+    assert not cached
+    assert list(data["packages"]) == ["one", "two"]
+    assert load()[1]
+
+    yaml.clear_secret_cache()
+    (tmp_path / "secrets.yaml").write_text("name: House\n")
+    data, cached = load()
+    assert not cached
+    assert data["name"] == "House"
+
+    with patch.dict(os.environ, {"YAML_CACHE_TEST": "set"}):
+        data, cached = load()
+    assert not cached
+    assert data["path"] == "set"
+
+
+def test_load_yaml_cached_same_size_edit(tmp_path):
+    """Test an edit keeping the size and modification time is noticed."""
+    config_path = tmp_path / YAML_CONFIG_FILE
+    cache_path = str(tmp_path / ".storage" / "yaml_cache")
+    config_path.write_text("name: one\n")
+    # Modified long before it is read
+    old_mtime_ns = config_path.stat().st_mtime_ns - 3600 * 10 ** 9
+    os.utime(config_path, ns=(old_mtime_ns, old_mtime_ns))
+
+    def load():
+        """Load the configuration and return the files that were hashed."""
+        with patch.object(
+            yaml_loader, "_file_signature", wraps=yaml_loader._file_signature
+        ) as mock_signature:
+            data = yaml.load_yaml_cached(str(config_path), cache_path)
+        return data, [call[1][0] for call in mock_signature.mock_calls]
+
+    assert load() == ({"name": "one"}, [str(config_path)])
+    # The stat tells the file is unchanged
+    assert load() == ({"name": "one"}, [])
+
+    config_path.write_text("name: two\n")
+    os.utime(config_path, ns=(old_mtime_ns, old_mtime_ns))
+    assert load()[0] == {"name": "two"}
+
+    # Modified right before it was read, so it could be modified again
+    # without a new modification time and is hashed each time
+    config_path.write_text("name: six\n")
+    assert load()[0] == {"name": "six"}
+    assert load() == ({"name": "six"}, [str(config_path)])